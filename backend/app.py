@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.routers import (
@@ -5,15 +6,60 @@ from backend.routers import (
     reviewRouter,
     userRouter,
     adminRouter,
-    listsRouter
+    listsRouter,
+    changesRouter
 )
+from backend.middleware.rateLimit import RateLimitMiddleware, rateLimiter
+from backend.users.passwordHasher import passwordHasher, HASH_BUDGET_MS, HASH_ROUNDS, HASH_CALIBRATION_PATH
+from backend.users.user import User
+from backend.repositories.usersRepo import userRepo
+from backend.users.penaltyPoints import PenaltyPoints
+from backend.users.penaltyLedger import penaltyLedger
+from backend.repositories.listsRepo import userMovieLists
+from backend.repositories.movieTombstones import movieReaper
+from backend.repositories.catalogStats import catalogStats
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # pick the bcrypt cost before serving logins: HASH_ROUNDS if set, else one calibration shared by every worker
+    if HASH_ROUNDS:
+        passwordHasher.rounds = HASH_ROUNDS
+    else:
+        passwordHasher.calibrate(HASH_BUDGET_MS, cachePath=HASH_CALIBRATION_PATH)
+    # read userList.json (and any journal left behind) once, then persist changes write-behind
+    User.loadStoredUsers()
+    PenaltyPoints.restoreAll(User.usersDb)
+    # replay the movie lists snapshot + write-ahead log
+    userMovieLists.open(listsRouter.LISTS_PATH)
+    userMovieLists.startWriter()
+    # seed the dashboard's movie counters; they are kept current from then on
+    catalogStats.load(adminRouter.DATA_PATH)
+    userRepo.startWriter()
+    penaltyLedger.startWriter()
+    sessionSweeper = User.startSessionSweeper()
+    # finish removing movies deleted before the last shutdown, then reap new ones as they come
+    movieReaper.start(adminRouter.DATA_PATH)
+    yield
+    sessionSweeper.stop()
+    movieReaper.stop()
+    userRepo.close()
+    penaltyLedger.close()
+    userMovieLists.close()
+    passwordHasher.shutdown()
+
 
 app = FastAPI(
     title="BestBytes Movie Review API",
     description="Backend API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# token buckets + load shedding for the expensive write routes (login, registration, reviews);
+# added before CORS so rejections still carry CORS headers
+app.add_middleware(RateLimitMiddleware, limiter=rateLimiter)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -27,6 +73,7 @@ app.include_router(reviewRouter.router, prefix="/reviews", tags=["Reviews"])
 app.include_router(userRouter.router, prefix="/users", tags=["Users"])
 app.include_router(adminRouter.router, prefix="/admin", tags=["Admin"])
 app.include_router(listsRouter.router, prefix="/lists", tags=["Lists"])
+app.include_router(changesRouter.router, prefix="/changes", tags=["Changes"])
 
 @app.get("/")
 def root():
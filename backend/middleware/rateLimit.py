@@ -0,0 +1,163 @@
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class TokenBucket:
+    """Classic token bucket: holds up to capacity tokens, refilled at ratePerSecond."""
+
+    def __init__(self, capacity: float, ratePerSecond: float, now: float):
+        self.capacity = capacity
+        self.ratePerSecond = ratePerSecond
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Spend one token; returns 0 on success or the seconds until one is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.ratePerSecond)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.ratePerSecond
+
+
+class RouteGroup:
+    """A set of write routes sharing one rate limit, per session and per client IP."""
+
+    def __init__(self, name: str, pattern: str, capacity: float, ratePerSecond: float):
+        self.name = name
+        self.pattern = re.compile(pattern)
+        self.capacity = capacity
+        self.ratePerSecond = ratePerSecond
+
+    def matches(self, method: str, path: str) -> bool:
+        return method in WRITE_METHODS and self.pattern.match(path) is not None
+
+
+# registration/login hash passwords, so /users gets the tightest budget
+DEFAULT_GROUPS = [
+    RouteGroup("users", r"^/users/", capacity=5, ratePerSecond=0.5),
+    RouteGroup("reviews", r"^/reviews/", capacity=20, ratePerSecond=2),
+    RouteGroup("movieReviews", r"^/movies/[^/]+/review/?$", capacity=10, ratePerSecond=1),
+]
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by (group, session token) and (group, client IP), plus
+    a cap on how many limited requests may be in flight at once.
+
+    Buckets are kept in an LRU of at most maxBuckets entries so a flood of new
+    clients cannot grow memory without bound; an evicted bucket simply starts
+    full again the next time that client shows up.
+    """
+
+    def __init__(self, groups: Optional[List[RouteGroup]] = None, maxInFlight: int = 64,
+                 maxBuckets: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.groups = DEFAULT_GROUPS if groups is None else groups
+        self.maxInFlight = maxInFlight
+        self.maxBuckets = maxBuckets
+        self.clock = clock
+        self.inFlight = 0
+        self.buckets: "OrderedDict[Tuple[str, str, str], TokenBucket]" = OrderedDict()
+        self.rejections: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def groupFor(self, method: str, path: str) -> Optional[RouteGroup]:
+        for group in self.groups:
+            if group.matches(method, path):
+                return group
+        return None
+
+    def _bucket(self, group: RouteGroup, kind: str, key: str, now: float) -> TokenBucket:
+        bucketKey = (group.name, kind, key)
+        bucket = self.buckets.get(bucketKey)
+        if bucket is None:
+            bucket = TokenBucket(group.capacity, group.ratePerSecond, now)
+            self.buckets[bucketKey] = bucket
+            if len(self.buckets) > self.maxBuckets:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(bucketKey)
+        return bucket
+
+    def _reject(self, group: RouteGroup, reason: str):
+        counts = self.rejections.setdefault(group.name, {})
+        counts[reason] = counts.get(reason, 0) + 1
+
+    def acquire(self, group: RouteGroup, clientIp: str, sessionToken: Optional[str]) -> Tuple[int, float]:
+        """
+        Admit one request or say why not.
+        Returns (0, 0) when admitted, otherwise (status code, retry-after seconds).
+        """
+        with self._lock:
+            if self.inFlight >= self.maxInFlight:
+                self._reject(group, "shed")
+                return 503, 1.0
+
+            now = self.clock()
+            wait = self._bucket(group, "ip", clientIp, now).take(now)
+            if not wait and sessionToken:
+                wait = self._bucket(group, "session", sessionToken, now).take(now)
+            if wait:
+                self._reject(group, "rateLimited")
+                return 429, wait
+
+            self.inFlight += 1
+            return 0, 0.0
+
+    def release(self):
+        with self._lock:
+            self.inFlight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "inFlight": self.inFlight,
+                "maxInFlight": self.maxInFlight,
+                "trackedBuckets": len(self.buckets),
+                "rejections": {name: dict(counts) for name, counts in self.rejections.items()},
+            }
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Applies a RateLimiter to every request that falls in one of its route groups."""
+
+    def __init__(self, app, limiter: RateLimiter):
+        super().__init__(app)
+        self.limiter = limiter
+
+    async def dispatch(self, request: Request, call_next):
+        group = self.limiter.groupFor(request.method, request.url.path)
+        if group is None:
+            return await call_next(request)
+
+        clientIp = request.client.host if request.client else "unknown"
+        sessionToken = request.query_params.get("sessionToken")
+        status, retryAfter = self.limiter.acquire(group, clientIp, sessionToken)
+        if status:
+            detail = "Too many requests" if status == 429 else "Server busy, try again shortly"
+            return JSONResponse(
+                status_code=status,
+                content={"detail": detail},
+                headers={"Retry-After": str(max(1, math.ceil(retryAfter)))},
+            )
+
+        try:
+            return await call_next(request)
+        finally:
+            self.limiter.release()
+
+
+# process-wide limiter used by the app and reported by /admin/rate-limits
+rateLimiter = RateLimiter()
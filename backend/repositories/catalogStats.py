@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+from collections import Counter
+from typing import Dict, List
+
+from backend.repositories.reviewsRepo import reviewStore
+from backend.services.changeFeed import changeFeed
+
+
+class CatalogStats:
+    """
+    Running movie and review counts for the admin dashboard.
+
+    Movies are counted from the change feed (every movie create, update and
+    delete is recorded there) and reviews from the review store's listener
+    calls, so each change costs O(genres of the movie) and reading the
+    totals never walks the data folder or the stores. load() seeds the
+    movie counts from the data folder once at startup.
+
+    Keys are lowercase titles, the same as the review store's.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.movieGenres: Dict[str, List[str]] = {}
+        self.genreMovies: Counter = Counter()
+        self.genreReviews: Counter = Counter()
+        self.movieReviews: Counter = Counter()
+
+    @staticmethod
+    def _bump(counter: Counter, key: str, delta: int):
+        counter[key] += delta
+        if counter[key] <= 0:
+            del counter[key]
+
+    def setMovie(self, title: str, genres: List[str]):
+        """Add a movie or change its genres, moving its reviews to the new genres."""
+        movieKey = title.lower()
+        with self._lock:
+            reviews = self.movieReviews.get(movieKey, 0)
+            for genre in self.movieGenres.get(movieKey, []):
+                self._bump(self.genreMovies, genre, -1)
+                self._bump(self.genreReviews, genre, -reviews)
+            self.movieGenres[movieKey] = list(dict.fromkeys(genres))
+            for genre in self.movieGenres[movieKey]:
+                self._bump(self.genreMovies, genre, 1)
+                self._bump(self.genreReviews, genre, reviews)
+
+    def removeMovie(self, title: str):
+        movieKey = title.lower()
+        with self._lock:
+            reviews = self.movieReviews.get(movieKey, 0)
+            for genre in self.movieGenres.pop(movieKey, []):
+                self._bump(self.genreMovies, genre, -1)
+                self._bump(self.genreReviews, genre, -reviews)
+
+    def reviewsChanged(self, movieKey: str, delta: int):
+        """Review store listener: delta reviews were added to (or removed from) a movie."""
+        with self._lock:
+            self._bump(self.movieReviews, movieKey, delta)
+            for genre in self.movieGenres.get(movieKey, []):
+                self._bump(self.genreReviews, genre, delta)
+
+    def feedChanged(self, entry: dict):
+        """Change feed listener."""
+        if entry["entity"] != "movie":
+            return
+        if entry["action"] == "delete":
+            self.removeMovie(entry["key"])
+        elif entry["data"] is not None:
+            self.setMovie(entry["key"], entry["data"].get("movieGenres") or [])
+
+    def load(self, dataPath: str) -> int:
+        """Count the movies already in dataPath; returns how many."""
+        with self._lock:
+            self.movieGenres.clear()
+            self.genreMovies.clear()
+            self.genreReviews.clear()  # setMovie adds each movie's reviews back
+        if not os.path.isdir(dataPath):
+            return 0
+        for folderName in os.listdir(dataPath):
+            metadataPath = os.path.join(dataPath, folderName, "metadata.json")
+            if not os.path.isfile(metadataPath):
+                continue
+            try:
+                with open(metadataPath, "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            self.setMovie(folderName, metadata.get("movieGenres") or [])
+        return len(self.movieGenres)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            genres = {genre: {"movies": self.genreMovies.get(genre, 0), "reviews": self.genreReviews.get(genre, 0)}
+                      for genre in sorted(set(self.genreMovies) | set(self.genreReviews))}
+            return {"movies": len(self.movieGenres), "genres": genres}
+
+
+# kept current by the review store and change feed listeners registered below
+catalogStats = CatalogStats()
+reviewStore.listeners.append(catalogStats.reviewsChanged)
+changeFeed.listeners.append(catalogStats.feedChanged)
@@ -0,0 +1,263 @@
+import json
+import os
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+from backend.services.movieListServices import migrateMovieLists, readUserMovieLists, saveUserMovieLists
+
+WAL_NAME = "movieLists.wal"
+SNAPSHOT_WAL_NAME = "movieLists.wal.old"  # the log being folded into the shards by a snapshot
+
+
+class MovieList:
+    """
+    The titles in one list, in the order they were added, without repeats.
+
+    Backed by a dict (title -> None), which keeps insertion order, so
+    membership, append and removal are O(1) however long the list gets.
+    move() rebuilds the order and is O(n); page() costs O(offset + limit).
+    Compares equal to a plain list holding the same titles in the same order.
+    """
+
+    __slots__ = ("_titles",)
+
+    def __init__(self, titles: Iterable[str] = ()):
+        self._titles = dict.fromkeys(titles)
+
+    def __contains__(self, title) -> bool:
+        return title in self._titles
+
+    def __iter__(self):
+        return iter(self._titles)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, MovieList):
+            return list(self._titles) == list(other._titles)
+        if isinstance(other, (list, tuple)):
+            return list(self._titles) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MovieList({list(self._titles)!r})"
+
+    def add(self, title: str):
+        self._titles[title] = None
+
+    def discard(self, title: str):
+        self._titles.pop(title, None)
+
+    def move(self, title: str, position: int):
+        """Put title at position (0 is the front; out-of-range positions clamp to either end)."""
+        if title not in self._titles:
+            return
+        order = [t for t in self._titles if t != title]
+        order.insert(max(0, min(position, len(order))), title)
+        self._titles = dict.fromkeys(order)
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        stop = None if limit is None else offset + limit
+        return list(islice(self._titles, offset, stop))
+
+
+class ListStore(dict):
+    """
+    lowercase username -> {listName: MovieList} for the lists router.
+
+    Every change goes through createList / addMovie / removeMovie /
+    moveMovie / deleteList, which apply it in memory and, once open() has attached a
+    directory, append one line to a write-ahead log there. After
+    snapshotEvery logged changes the writer thread (startWriter) rewrites
+    the shards of the users touched since the last snapshot; nobody else's
+    shard is read or written. The snapshot copies those users' lists and
+    sets the log aside under the lock, then writes the shards without it, so
+    changes keep landing in a fresh log meanwhile.
+
+    Users are loaded lazily: the first lookup of a username reads that
+    user's shard only, so startup cost does not grow with the number of
+    users. open() replays the log on top of the shards it touches. Until
+    open() is called the store is memory-only.
+    """
+
+    def __init__(self, snapshotEvery: int = 1000):
+        super().__init__()
+        self.snapshotEvery = snapshotEvery
+        self.dirPath: Optional[Path] = None
+        self.walLength = 0
+        self._wal = None
+        self._lock = threading.RLock()
+        self._snapshotLock = threading.Lock()  # one snapshot at a time
+        self._checked: Set[str] = set()  # users whose shard has been looked for
+        self._dirty: Set[str] = set()  # users changed since the last snapshot
+        self._due = threading.Event()
+        self._stopped = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+    def open(self, dirPath: Path):
+        """Replay the log from dirPath over the per-user shards and log further changes there."""
+        with self._lock:
+            self.dirPath = Path(dirPath)
+            self.dirPath.mkdir(parents=True, exist_ok=True)
+            super().clear()
+            self._checked.clear()
+            self._dirty.clear()
+            migrateMovieLists(self.dirPath)
+            self.walLength = 0
+            # a log set aside by an unfinished snapshot is older than the current one
+            for walPath in (self.dirPath / SNAPSHOT_WAL_NAME, self.dirPath / WAL_NAME):
+                if walPath.exists():
+                    with open(walPath, "r") as wal:
+                        for line in wal:
+                            if line.strip():
+                                self._apply(json.loads(line))
+                                self.walLength += 1
+            self._wal = open(self.dirPath / WAL_NAME, "a")
+
+    def startWriter(self):
+        """Take snapshots in a background thread whenever snapshotEvery changes have been logged."""
+        def run():
+            while True:
+                self._due.wait()
+                if self._stopped.is_set():
+                    return
+                self._due.clear()
+                self.snapshot()
+
+        self._stopped.clear()
+        self._writer = threading.Thread(target=run, name="lists-writer", daemon=True)
+        self._writer.start()
+
+    def close(self):
+        """Stop the writer, fold the log into a fresh snapshot and stop logging."""
+        self._stopped.set()
+        self._due.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self._due.clear()
+        with self._lock:
+            if self._wal is None:
+                return
+            self.snapshot()
+            self._wal.close()
+            self._wal = None
+
+    def _load(self, user: str):
+        """Pull user's shard into memory the first time they are looked up."""
+        if self.dirPath is None or user in self._checked:
+            return
+        with self._lock:
+            if user in self._checked:
+                return
+            self._checked.add(user)
+            if not dict.__contains__(self, user):
+                lists = readUserMovieLists(self.dirPath, user)
+                if lists:
+                    dict.__setitem__(self, user, {name: MovieList(titles) for name, titles in lists.items()})
+
+    def __contains__(self, user):
+        self._load(user)
+        return dict.__contains__(self, user)
+
+    def __missing__(self, user):
+        self._load(user)
+        if dict.__contains__(self, user):
+            return dict.__getitem__(self, user)
+        raise KeyError(user)
+
+    def get(self, user, default=None):
+        self._load(user)
+        return dict.get(self, user, default)
+
+    def _apply(self, entry: dict):
+        user, listName = entry["user"], entry["list"]
+        op = entry["op"]
+        self._load(user)
+        if self.dirPath is not None:
+            self._dirty.add(user)
+        if op == "create":
+            self.setdefault(user, {}).setdefault(listName, MovieList())
+        elif op == "delete":
+            self.get(user, {}).pop(listName, None)
+        elif op == "add":
+            self.setdefault(user, {}).setdefault(listName, MovieList()).add(entry["title"])
+        elif op == "remove":
+            movies = self.get(user, {}).get(listName)
+            if movies is not None:
+                movies.discard(entry["title"])
+        elif op == "move":
+            movies = self.get(user, {}).get(listName)
+            if movies is not None:
+                movies.move(entry["title"], entry["position"])
+
+    def _log(self, entry: dict):
+        with self._lock:
+            self._apply(entry)
+            if self._wal is None:
+                return
+            self._wal.write(json.dumps(entry) + "\n")
+            self._wal.flush()
+            self.walLength += 1
+            if self.walLength >= self.snapshotEvery:
+                self._due.set()
+
+    def createList(self, user: str, listName: str):
+        self._log({"op": "create", "user": user, "list": listName})
+
+    def deleteList(self, user: str, listName: str):
+        self._log({"op": "delete", "user": user, "list": listName})
+
+    def addMovie(self, user: str, listName: str, title: str):
+        self._log({"op": "add", "user": user, "list": listName, "title": title})
+
+    def removeMovie(self, user: str, listName: str, title: str):
+        self._log({"op": "remove", "user": user, "list": listName, "title": title})
+
+    def moveMovie(self, user: str, listName: str, title: str, position: int):
+        self._log({"op": "move", "user": user, "list": listName, "title": title, "position": position})
+
+    def snapshot(self):
+        """Rewrite the shard of every user changed since the last snapshot, then drop the log they came from."""
+        with self._snapshotLock:
+            with self._lock:
+                if self.dirPath is None:
+                    return
+                changed = {user: {name: list(movies) for name, movies in dict.get(self, user, {}).items()}
+                           for user in sorted(self._dirty)}
+                self._dirty.clear()
+                setAside = self.dirPath / SNAPSHOT_WAL_NAME
+                if self._wal is not None:
+                    self._rotateWal(setAside)
+                self.walLength = 0
+            # each shard is replaced atomically; the set-aside log is only dropped once all of them are down
+            try:
+                for user, lists in changed.items():
+                    saveUserMovieLists(lists, user, self.dirPath)
+            except Exception:
+                with self._lock:
+                    self._dirty.update(changed)  # the next snapshot writes them again
+                raise
+            if setAside.exists():
+                setAside.unlink()
+
+    def _rotateWal(self, setAside: Path):
+        """Move the log's entries to setAside (after any an earlier snapshot left there) and start an empty log."""
+        walPath = self.dirPath / WAL_NAME
+        self._wal.close()
+        if setAside.exists():
+            with open(setAside, "a") as older, open(walPath, "r") as wal:
+                older.write(wal.read())
+                older.flush()
+                os.fsync(older.fileno())
+            os.remove(walPath)
+        else:
+            os.replace(walPath, setAside)
+        self._wal = open(walPath, "a")
+
+
+# the lists router's store; the app opens it on the data directory at startup
+userMovieLists = ListStore()
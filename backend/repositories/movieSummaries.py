@@ -0,0 +1,69 @@
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+# the fields a list view needs; reviews are never loaded
+SUMMARY_FIELDS = ("title", "movieIMDbRating", "metaScore", "movieGenres", "directors", "datePublished", "mainStars")
+
+
+class MovieSummaryCache:
+    """
+    Small per-movie summaries read from each movie's metadata.json.
+
+    A cached summary is keyed by title and remembers the metadata file's
+    mtime, so a lookup costs one stat per title; the file is only re-read
+    and re-parsed when it has changed, and a deleted movie drops out on the
+    next lookup. lookup() resolves a whole batch of titles in one call.
+    """
+
+    def __init__(self, dataPath: str):
+        self.dataPath = dataPath
+        self._cache: Dict[str, Tuple[int, dict]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _read(self, title: str) -> Optional[dict]:
+        if not title or "/" in title or title in (".", ".."):
+            return None  # list entries are free text; never let one point outside the data folder
+        metadataPath = os.path.join(self.dataPath, title, "metadata.json")
+        try:
+            mtime = os.stat(metadataPath).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        cached = self._cache.get(title)
+        if cached is not None and cached[0] == mtime:
+            self.hits += 1
+            return cached[1]
+        try:
+            with open(metadataPath, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        summary = {field: metadata.get(field) for field in SUMMARY_FIELDS}
+        summary["title"] = summary["title"] or title
+        self._cache[title] = (mtime, summary)
+        self.misses += 1
+        return summary
+
+    def lookup(self, titles: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """Summary for each distinct title, or None for titles that are not in the catalog."""
+        with self._lock:
+            found = {}
+            for title in titles:
+                if title in found:
+                    continue
+                summary = self._read(title)
+                if summary is None:
+                    self._cache.pop(title, None)
+                found[title] = summary
+            return found
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# summaries for the movies under backend/data, shared by the list views
+movieSummaries = MovieSummaryCache(os.path.join(os.path.dirname(__file__), "..", "data"))
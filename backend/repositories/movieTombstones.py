@@ -0,0 +1,158 @@
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from backend.repositories.reviewsRepo import reviewStore
+
+TRASH_SUFFIX = ".trash"  # <parent>/.<data folder name>.trash, next to the catalog rather than in it
+HISTORY = 200  # finished tombstones kept for the status endpoint
+
+
+def trashDir(dataPath: str) -> str:
+    """
+    Trash folder for a data folder: a hidden sibling, so it shares the
+    filesystem (tombstoning stays a rename) while no movie or review route,
+    which all resolve titles inside the data folder, can reach it.
+    """
+    parent, name = os.path.split(os.path.abspath(dataPath))
+    return os.path.join(parent, f".{name}{TRASH_SUFFIX}")
+
+
+class MovieReaper:
+    """
+    Deletes movies in two steps.
+
+    tombstone() renames the movie's folder into trashDir(<data>)/<id> and
+    drops its reviews from the review store. A rename is one metadata
+    operation whatever the folder holds, and it makes the movie vanish from
+    every read at once; the title is free to be added again straight away.
+
+    The reaper thread then removes the trashed folders file by file, in
+    the background, recording files and bytes freed so progress shows up in
+    status(). Folders left in the trash by a crash are picked up again by
+    start(). drain() reaps synchronously, for shutdown and tests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.queue: Deque[dict] = deque()
+        self.current: Optional[dict] = None
+        self.finished: Deque[dict] = deque(maxlen=HISTORY)
+        self.reaped = 0
+        self.failed = 0
+
+    def tombstone(self, dataPath: str, title: str) -> dict:
+        """Hide the movie immediately and queue its files for removal; raises OSError if the rename fails."""
+        trash = trashDir(dataPath)
+        os.makedirs(trash, exist_ok=True)
+        tombstoneId = uuid.uuid4().hex[:12]
+        trashPath = os.path.join(trash, tombstoneId)
+        os.rename(os.path.join(dataPath, title), trashPath)
+        reviewStore.removeMovie(title)
+        return self._enqueue(tombstoneId, title, trashPath)
+
+    def _enqueue(self, tombstoneId: str, title: Optional[str], trashPath: str) -> dict:
+        entry = {"id": tombstoneId, "title": title, "path": trashPath, "status": "pending", "files": 0,
+                 "bytes": 0, "tombstonedAt": datetime.now().isoformat(), "reapedAt": None, "error": None}
+        with self._lock:
+            self.queue.append(entry)
+        self._wake.set()
+        return self._public(entry)
+
+    @staticmethod
+    def _public(entry: dict) -> dict:
+        return {key: value for key, value in entry.items() if key != "path"}
+
+    def _reap(self, entry: dict):
+        entry["status"] = "reaping"
+        try:
+            for folder, dirNames, fileNames in os.walk(entry["path"], topdown=False):
+                for fileName in fileNames:
+                    filePath = os.path.join(folder, fileName)
+                    size = os.lstat(filePath).st_size
+                    os.remove(filePath)
+                    entry["files"] += 1
+                    entry["bytes"] += size
+                for dirName in dirNames:
+                    dirPath = os.path.join(folder, dirName)
+                    if os.path.islink(dirPath):
+                        os.remove(dirPath)
+                    else:
+                        os.rmdir(dirPath)
+            os.rmdir(entry["path"])
+            entry["status"] = "reaped"
+        except OSError as e:
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+        entry["reapedAt"] = datetime.now().isoformat()
+
+    def reapNext(self) -> bool:
+        """Reap the oldest queued tombstone, if any; returns whether there was one."""
+        with self._lock:
+            if not self.queue:
+                return False
+            entry = self.current = self.queue.popleft()
+        self._reap(entry)
+        with self._lock:
+            self.current = None
+            self.finished.append(entry)
+            if entry["status"] == "reaped":
+                self.reaped += 1
+            else:
+                self.failed += 1
+        return True
+
+    def drain(self):
+        while self.reapNext():
+            pass
+
+    def recover(self, dataPath: str) -> int:
+        """Queue folders a previous run trashed but never finished reaping."""
+        trash = trashDir(dataPath)
+        if not os.path.isdir(trash):
+            return 0
+        with self._lock:
+            known = {entry["path"] for entry in self.queue}
+        leftovers = [name for name in sorted(os.listdir(trash)) if os.path.join(trash, name) not in known]
+        for name in leftovers:
+            self._enqueue(name, None, os.path.join(trash, name))
+        return len(leftovers)
+
+    def start(self, dataPath: str):
+        """Recover leftovers from dataPath and reap in a background thread until stop()."""
+        self.recover(dataPath)
+
+        def run():
+            while not self._stopped.is_set():
+                self._wake.wait()
+                self._wake.clear()
+                self.drain()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=run, name="movie-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def status(self) -> dict:
+        with self._lock:
+            pending = [self._public(entry) for entry in self.queue]
+            current = self._public(self.current) if self.current else None
+            recent: List[Dict] = [self._public(entry) for entry in reversed(self.finished)]
+        return {"pending": len(pending), "reaped": self.reaped, "failed": self.failed,
+                "current": current, "queue": pending, "recent": recent}
+
+
+# shared by the admin router and moviesService; the app starts its thread
+movieReaper = MovieReaper()
@@ -0,0 +1,213 @@
+import threading
+from collections import Counter
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.schemas.movieReviews import movieReviews
+
+
+@lru_cache(maxsize=4096)
+def reviewDay(dateOfReview: str) -> str:
+    """
+    ISO day (YYYY-MM-DD) of a review date. The data set writes them like
+    "14 March 2021"; ISO dates and timestamps are accepted too. Anything
+    else is counted under "unknown".
+    """
+    text = dateOfReview.strip()
+    for dateFormat in ("%d %B %Y", "%d %b %Y"):
+        try:
+            return datetime.strptime(text, dateFormat).date().isoformat()
+        except ValueError:
+            pass
+    try:
+        return date.fromisoformat(text[:10]).isoformat()
+    except ValueError:
+        return "unknown"
+
+
+class ReviewStore(dict):
+    """
+    In-memory review storage shared by the movie and review routers.
+
+    Maps a lowercase movie title to an insertion-ordered {reviewId: review}
+    dict. Review ids are assigned per movie and never reused, so clients can
+    hold on to them while other reviews are added or deleted. A secondary
+    index from lowercase username to (movie key, review id) references lets
+    a user's reviews be read without walking every movie, and a per-movie
+    count of reviews by each lowercase reviewer name makes the duplicate
+    review check O(1).
+
+    The total and per-day (dateOfReview, as an ISO day) review counts are
+    kept up to date as reviews are indexed and unindexed, and listeners are told
+    (movieKey, +1 / -1) for each review, so stats never need a scan.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.RLock()  # guards the reviews and the user index together
+        self._nextIds: Dict[str, int] = {}
+        self.userIndex: Dict[str, Dict[Tuple[str, int], None]] = {}
+        self.reviewers: Dict[str, Dict[str, int]] = {}  # movie key -> {reviewer: review count}
+        self.total = 0
+        self.byDay: Counter = Counter()
+        self.listeners: List[Callable[[str, int], None]] = []
+
+    # seeding a movie directly (store["joker"] = [...]) numbers the reviews from 0
+    def __setitem__(self, movieKey: str, reviews: Iterable):
+        with self._lock:
+            if movieKey in self:
+                self._unindexMovie(movieKey)
+            seeded: Dict[int, movieReviews] = {}
+            for reviewId, r in enumerate(reviews):
+                review = r if isinstance(r, movieReviews) else movieReviews(**r)
+                review.reviewId = reviewId
+                seeded[reviewId] = review
+            super().__setitem__(movieKey, seeded)
+            self._nextIds[movieKey] = len(seeded)
+            for reviewId, review in seeded.items():
+                self._index(movieKey, reviewId, review)
+
+    def __delitem__(self, movieKey: str):
+        with self._lock:
+            self._unindexMovie(movieKey)
+            super().__delitem__(movieKey)
+
+    def clear(self):
+        with self._lock:
+            for movieKey, reviews in dict.items(self):
+                self._notify(movieKey, -len(reviews))
+            self.total = 0
+            self.byDay.clear()
+            super().clear()
+            self._nextIds.clear()
+            self.userIndex.clear()
+            self.reviewers.clear()
+
+    def _notify(self, movieKey: str, delta: int):
+        for listener in self.listeners:
+            listener(movieKey, delta)
+
+    def _count(self, movieKey: str, review: movieReviews, delta: int):
+        self.total += delta
+        day = reviewDay(review.dateOfReview)
+        self.byDay[day] += delta
+        if not self.byDay[day]:
+            del self.byDay[day]
+        self._notify(movieKey, delta)
+
+    def _index(self, movieKey: str, reviewId: int, review: movieReviews):
+        self._count(movieKey, review, 1)
+        userKey = review.user.lower()
+        self.userIndex.setdefault(userKey, {})[(movieKey, reviewId)] = None
+        counts = self.reviewers.setdefault(movieKey, {})
+        counts[userKey] = counts.get(userKey, 0) + 1
+
+    def _unindex(self, movieKey: str, reviewId: int, review: movieReviews):
+        self._count(movieKey, review, -1)
+        userKey = review.user.lower()
+        refs = self.userIndex.get(userKey, {})
+        refs.pop((movieKey, reviewId), None)
+        if not refs:
+            self.userIndex.pop(userKey, None)
+        counts = self.reviewers.get(movieKey, {})
+        if counts.get(userKey, 0) > 1:
+            counts[userKey] -= 1
+        else:
+            counts.pop(userKey, None)
+            if not counts:
+                self.reviewers.pop(movieKey, None)
+
+    def _unindexMovie(self, movieKey: str):
+        for reviewId, review in dict.get(self, movieKey, {}).items():
+            self._unindex(movieKey, reviewId, review)
+
+    def addReview(self, title: str, review: movieReviews) -> movieReviews:
+        """Store a review under the next free id for the movie and index it."""
+        movieKey = title.lower()
+        with self._lock:
+            reviewId = self._nextIds.get(movieKey, 0)
+            self._nextIds[movieKey] = reviewId + 1
+            review.reviewId = reviewId
+            self.setdefault(movieKey, {})[reviewId] = review
+            self._index(movieKey, reviewId, review)
+        return review
+
+    def addUniqueReview(self, title: str, review: movieReviews, username: str) -> Optional[movieReviews]:
+        """Add a review unless username has already reviewed the movie; returns None if so."""
+        with self._lock:
+            if self.hasReviewed(title, username):
+                return None
+            return self.addReview(title, review)
+
+    def hasReviewed(self, title: str, username: str) -> bool:
+        return username.lower() in self.reviewers.get(title.lower(), {})
+
+    def getReview(self, title: str, reviewId: int) -> Optional[movieReviews]:
+        return dict.get(self, title.lower(), {}).get(reviewId)
+
+    def reviewsForMovie(self, title: str) -> List[movieReviews]:
+        """All reviews of a movie in the order they were added."""
+        with self._lock:
+            return list(dict.get(self, title.lower(), {}).values())
+
+    def replaceReview(self, title: str, reviewId: int, review: movieReviews) -> Optional[movieReviews]:
+        """Swap the review stored under reviewId, or return None if it is gone."""
+        movieKey = title.lower()
+        with self._lock:
+            reviews = dict.get(self, movieKey, {})
+            if reviewId not in reviews:
+                return None
+            previous = reviews[reviewId]
+            review.reviewId = reviewId
+            reviews[reviewId] = review
+            # keep the user's ordering unless the review changed hands
+            if previous.user.lower() != review.user.lower():
+                self._unindex(movieKey, reviewId, previous)
+                self._index(movieKey, reviewId, review)
+            else:
+                self._count(movieKey, previous, -1)  # the review date may have changed
+                self._count(movieKey, review, 1)
+        return review
+
+    def removeReview(self, title: str, reviewId: int) -> Optional[movieReviews]:
+        """Remove the review stored under reviewId, or return None if it is gone."""
+        movieKey = title.lower()
+        with self._lock:
+            removed = dict.get(self, movieKey, {}).pop(reviewId, None)
+            if removed is not None:
+                self._unindex(movieKey, reviewId, removed)
+        return removed
+
+    def removeMovie(self, title: str) -> int:
+        """Drop every review of a deleted movie (and its user index entries); returns how many."""
+        movieKey = title.lower()
+        with self._lock:
+            if not dict.__contains__(self, movieKey):
+                return 0
+            removed = len(dict.__getitem__(self, movieKey))
+            del self[movieKey]
+            self._nextIds.pop(movieKey, None)
+            self.reviewers.pop(movieKey, None)
+        return removed
+
+    def statsSnapshot(self) -> dict:
+        """The review total and per-day counts (oldest day first), copied under the lock."""
+        with self._lock:
+            total, byDay = self.total, dict(self.byDay)
+        return {"total": total, "byDay": dict(sorted(byDay.items()))}
+
+    def countByUser(self, username: str) -> int:
+        with self._lock:
+            return len(self.userIndex.get(username.lower(), {}))
+
+    def reviewsByUser(self, username: str, offset: int = 0, limit: int = 100) -> List[movieReviews]:
+        """Return one page of a user's reviews, oldest first, in O(user's reviews)."""
+        with self._lock:
+            refs = self.userIndex.get(username.lower(), {})
+            return [self[movieKey][reviewId] for movieKey, reviewId in islice(refs, offset, offset + limit)]
+
+
+# the single store both routers read and write
+reviewStore = ReviewStore()
@@ -0,0 +1,300 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.services.userServices import USER_DATA_PATH
+
+try:
+    import fcntl
+except ImportError:  # Windows: the files are only locked within one process
+    fcntl = None
+
+
+def _fileId(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(inode, mtime, size) of path, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class UserRepository:
+    """
+    Stored user records ({"email", "password", "isVerified"} per username, the
+    userList.json format) held in memory with a lowercase email index.
+
+    The snapshot file is read once, then every change is applied in memory
+    and queued; flush() appends the queue to a newline-delimited journal next
+    to the snapshot, so a registration costs one appended line rather than a
+    rewrite of every user. Once the journal reaches compactEvery entries the
+    snapshot is rewritten atomically and the journal truncated. Loading
+    replays the journal on top of the snapshot, so nothing flushed is lost
+    if the process stops before compaction.
+
+    Several uvicorn workers can share the files. Every read and write of
+    them happens under an flock on a lock file beside the snapshot, and each
+    write first replays the journal lines other workers appended since this
+    one last looked (or reloads everything if another worker compacted), so
+    a compaction always includes every flushed line before the journal is
+    removed. refresh() does the same catch-up on demand; listeners are told
+    (username, record or None) for each user another worker changed.
+    """
+
+    def __init__(self, path: Path = USER_DATA_PATH, compactEvery: int = 1000):
+        self.path = Path(path)
+        self.journalPath = self.path.with_suffix(".journal")
+        self.lockPath = self.path.with_suffix(".lock")
+        self.compactEvery = compactEvery
+        self.records: Dict[str, dict] = {}
+        self.emailIndex: Dict[str, str] = {}  # lowercase email -> username
+        self.pending: List[dict] = []
+        self.journalLength = 0
+        self.journalOffset = 0  # bytes of the journal already replayed
+        self.loaded = False
+        self.listeners: List = []
+        self._snapshotId = None
+        self._journalId = None
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+    @contextmanager
+    def _fileLock(self):
+        """Exclusive flock shared with the other workers; the caller holds _lock"""
+        self.lockPath.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lockPath, "a") as lockFile:
+            if fcntl is not None:
+                fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lockFile.fileno(), fcntl.LOCK_UN)
+
+    def _changedOnDisk(self) -> bool:
+        return _fileId(self.path) != self._snapshotId or _fileId(self.journalPath) != self._journalId
+
+    def load(self):
+        """Read the snapshot and replay the journal; later calls are no-ops."""
+        with self._lock:
+            if self.loaded:
+                return
+            if self.path.exists() or self.journalPath.exists():
+                with self._fileLock():
+                    self._readFiles()
+            self.loaded = True
+
+    def _readFiles(self) -> List[str]:
+        """Reload the snapshot and whole journal, keeping queued changes; returns the usernames that changed"""
+        previous = self.records
+        self.records, self.journalLength, self.journalOffset = {}, 0, 0
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as jsonFile:
+                    data = json.load(jsonFile)
+                self.records = data if isinstance(data, dict) else {}
+            except json.JSONDecodeError:
+                self.records = {}
+        self._snapshotId = _fileId(self.path)
+        self.emailIndex = {record["email"].lower(): username for username, record in self.records.items()}
+        self._readJournal()
+        self._reapplyPending()
+        return [username for username in previous.keys() | self.records.keys()
+                if previous.get(username) != self.records.get(username)]
+
+    def _readJournal(self) -> List[str]:
+        """Replay complete journal lines past journalOffset; returns their usernames"""
+        replayed = []
+        if self.journalPath.exists():
+            with open(self.journalPath, "rb") as journal:
+                journal.seek(self.journalOffset)
+                data = journal.read()
+            complete = data[:data.rfind(b"\n") + 1]  # a torn last line is left for later
+            for line in complete.splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    self._replay(entry)
+                    replayed.append(entry["username"])
+                    self.journalLength += 1
+            self.journalOffset += len(complete)
+        self._journalId = _fileId(self.journalPath)
+        return replayed
+
+    def _reapplyPending(self):
+        for entry in self.pending:
+            self._replay(entry)
+
+    def _catchUp(self) -> List[str]:
+        """Bring memory up to date with the files; the caller holds both locks"""
+        if not self._changedOnDisk():
+            return []
+        if _fileId(self.path) != self._snapshotId:
+            return self._readFiles()  # another worker compacted
+        changed = self._readJournal()
+        self._reapplyPending()
+        return changed
+
+    def _notify(self, usernames: Iterable[str]):
+        for username in dict.fromkeys(usernames):
+            for listener in self.listeners:
+                listener(username, self.records.get(username))
+
+    def refresh(self):
+        """Pick up changes other workers have flushed since this one last read the files."""
+        with self._lock:
+            if not self.loaded:
+                self.load()
+                return
+            if not self._changedOnDisk():
+                return
+            with self._fileLock():
+                changed = self._catchUp()
+            self._notify(changed)
+
+    def _replay(self, entry: dict):
+        username = entry["username"]
+        previous = self.records.pop(username, None)
+        if previous is not None and self.emailIndex.get(previous["email"].lower()) == username:
+            del self.emailIndex[previous["email"].lower()]
+        if entry["op"] != "delete":
+            self.records[username] = entry["record"]
+            self.emailIndex[entry["record"]["email"].lower()] = username
+
+    def _put(self, username: str, record: dict):
+        previous = self.records.get(username)
+        if previous is not None:
+            self.emailIndex.pop(previous["email"].lower(), None)
+        self.records[username] = record
+        self.emailIndex[record["email"].lower()] = username
+        self.pending.append({"op": "put", "username": username, "record": record})
+
+    def exists(self, username: str) -> bool:
+        self.load()
+        return username in self.records
+
+    def get(self, username: str) -> Optional[dict]:
+        self.load()
+        return self.records.get(username)
+
+    def allRecords(self) -> Dict[str, dict]:
+        """Copy of every stored record, username -> record"""
+        self.load()
+        with self._lock:
+            return {username: dict(record) for username, record in self.records.items()}
+
+    def usernameForEmail(self, email: str) -> Optional[str]:
+        self.load()
+        return self.emailIndex.get(email.lower())
+
+    @staticmethod
+    def _newRecord(email: str, passwordHash: bytes, verificationToken: Optional[str]) -> dict:
+        record = {"email": email, "password": passwordHash.decode("utf-8"), "isVerified": False}
+        if verificationToken is not None:
+            record["verificationToken"] = verificationToken  # so any worker can check it
+        return record
+
+    def add(self, username: str, email: str, passwordHash: bytes, verificationToken: Optional[str] = None):
+        with self._lock:
+            self.load()
+            self._put(username, self._newRecord(email, passwordHash, verificationToken))
+
+    def addMany(self, users: Iterable[Tuple[str, str, bytes, Optional[str]]]):
+        """Queue (username, email, passwordHash, verificationToken) tuples; the next flush writes them in one append."""
+        with self._lock:
+            self.load()
+            for username, email, passwordHash, verificationToken in users:
+                self._put(username, self._newRecord(email, passwordHash, verificationToken))
+
+    def setVerified(self, username: str, status: bool):
+        with self._lock:
+            self.load()
+            if username in self.records:
+                self._put(username, {**self.records[username], "isVerified": status})
+
+    def setPasswordHash(self, username: str, passwordHash: bytes):
+        with self._lock:
+            self.load()
+            if username in self.records:
+                self._put(username, {**self.records[username], "password": passwordHash.decode("utf-8")})
+
+    def remove(self, username: str):
+        with self._lock:
+            self.load()
+            record = self.records.pop(username, None)
+            if record is not None:
+                self.emailIndex.pop(record["email"].lower(), None)
+                self.pending.append({"op": "delete", "username": username})
+
+    def flush(self):
+        """Append queued changes to the journal, compacting once it has grown long enough."""
+        with self._lock:
+            if not self.loaded:
+                return  # nothing can be queued before the first read
+            if not self.pending and self.journalLength < self.compactEvery and not self._changedOnDisk():
+                return
+            with self._fileLock():
+                changed = self._catchUp()
+                if self.pending:
+                    data = "".join(json.dumps(entry) + "\n" for entry in self.pending).encode("utf-8")
+                    with open(self.journalPath, "ab") as journal:
+                        journal.write(data)
+                        journal.flush()
+                        os.fsync(journal.fileno())
+                    self.journalLength += len(self.pending)
+                    self.journalOffset += len(data)
+                    self._journalId = _fileId(self.journalPath)
+                    self.pending = []
+                if self.journalLength >= self.compactEvery:
+                    self._compact()
+            self._notify(changed)
+
+    def compact(self):
+        """Rewrite the snapshot from memory and start an empty journal."""
+        with self._lock:
+            self.load()
+            with self._fileLock():
+                changed = self._catchUp()
+                self._compact()
+            self._notify(changed)
+
+    def _compact(self):
+        # the caller has caught up under the file lock, so every journal line is in memory
+        tmpPath = self.path.with_suffix(".json.tmp")
+        with open(tmpPath, "w") as jsonFile:
+            json.dump(self.records, jsonFile, indent=2)
+            jsonFile.flush()
+            os.fsync(jsonFile.fileno())
+        os.replace(tmpPath, self.path)
+        # everything queued is now in the snapshot
+        self.pending = []
+        if self.journalPath.exists():
+            self.journalPath.unlink()
+        self.journalLength, self.journalOffset = 0, 0
+        self._snapshotId, self._journalId = _fileId(self.path), None
+
+    def startWriter(self, interval: float = 1.0):
+        """Flush the queue from a background thread every interval seconds."""
+        def run():
+            while not self._stopped.wait(interval):
+                self.flush()
+
+        self._stopped.clear()
+        self._writer = threading.Thread(target=run, name="user-writer", daemon=True)
+        self._writer.start()
+
+    def close(self):
+        """Stop the writer and leave a fully compacted snapshot behind."""
+        self._stopped.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        if self.loaded and (self.pending or self.journalLength):
+            self.compact()
+
+
+# the single repository behind User; the app loads it at startup and closes it on shutdown
+userRepo = UserRepository()
@@ -1,13 +1,30 @@
 import os
+import io
 import json
-from fastapi import APIRouter, HTTPException
+import tempfile
+from datetime import timedelta
+from typing import List
+from fastapi import APIRouter, Body, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from backend.schemas.movie import movieCreate
+from backend.schemas.penalty import penaltyAssign
 from backend.users.user import User
+from backend.users.penaltyPoints import PenaltyPoints
+from backend.users.penaltyLedger import penaltyLedger
+from backend.middleware.rateLimit import rateLimiter
+from backend.services.changeFeed import changeFeed
+from backend.users.passwordHasher import passwordHasher
+from backend.services.userImport import importUsers, IMPORT_FORMATS
+from backend.services.movieImport import importMovies
+from backend.repositories.movieTombstones import movieReaper
+from backend.repositories.catalogStats import catalogStats
+from backend.repositories.reviewsRepo import reviewStore
 
 router = APIRouter()
 
 # load data
 DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data")
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # import bodies larger than this are spooled to a temp file
 
 # add new movie
 
@@ -30,6 +47,7 @@ def addMovie(movieData: movieCreate):
         with open(metadataPath, "w", encoding="utf-8") as f:
             json.dump(movieData.model_dump(), f, indent=4)
 
+        changeFeed.record("movie", "create", movieData.title, movieData.model_dump())
         return {"message": f"Movie '{movieData.title}' added successfully."}
     except PermissionError:
         raise HTTPException(status_code=500, detail="Permission denied: Unable to create movie folder")
@@ -40,25 +58,24 @@ def addMovie(movieData: movieCreate):
     
 # delete movie
 
-# - Deletes the movie folder and its metadata.json file.
+# - Tombstones the movie: its folder is renamed into the trash next to DATA_PATH, which hides it
+#   (and its reviews) from every read at once, whatever the folder holds.
+# - The files are removed afterwards by the background reaper; see /movies/deletions.
 # - Returns 404 if the folder does not exist.
-# - Returns 500 for permission issues or OS errors during deletion.
-# - Be careful: deletes all files inside the folder before removing it.
+# - Returns 500 for permission issues or OS errors while tombstoning.
 # - Swagger: Just input the movie title in the path.
 
 @router.delete("/delete-movie/{title}")
 def deleteMovie(title: str):
-    """Delete a movie folder and its metadata file."""
+    """Tombstone a movie folder and queue its files for removal."""
     folderPath = os.path.join(DATA_PATH, title)
     if not os.path.exists(folderPath):
         raise HTTPException(status_code=404, detail="Movie not found")
 
     try:
-        for fileName in os.listdir(folderPath):
-            os.remove(os.path.join(folderPath, fileName))
-        os.rmdir(folderPath)
-
-        return {"message": f"Movie '{title}' deleted successfully."}
+        tombstone = movieReaper.tombstone(DATA_PATH, title)
+        changeFeed.record("movie", "delete", title)
+        return {"message": f"Movie '{title}' deleted successfully.", "tombstone": tombstone["id"]}
     except PermissionError:
         raise HTTPException(status_code=500, detail="Permission denied: Unable to delete movie")
     except OSError as e:
@@ -66,11 +83,23 @@ def deleteMovie(title: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+# movie deletion progress
+
+# - Tombstones still waiting for the reaper, the one being reaped (files and bytes
+#   removed so far) and the most recently finished ones, newest first.
+
+@router.get("/movies/deletions")
+def movieDeletionStatus():
+    """Return the background reaper's queue and progress."""
+    return movieReaper.status()
+
 # assign penalty to user
 
 # - Assigns penalty points to a user.
 # - Returns 404 if the user does not exist.
 # - Each user has a 'penalties' list; new penalties are appended.
+# - The penalty is also issued through the penalty ledger, so it counts towards
+#   the login check.
 # - Returns 500 if the internal logic fails (e.g., User.usersDb not set properly).
 # - Swagger requires query params:
 #     - username (string)
@@ -91,7 +120,158 @@ def assignPenalty(username: str, points: int, reason: str):
         user.penalties = []
 
     user.penalties.append({"points": points, "reason": reason})
+    PenaltyPoints(points, user, reason)
     return {
         "message": f"Assigned {points} penalty points to {username}",
         "totalPenalties": len(user.penalties),
-    }
\ No newline at end of file
+    }
+
+# assign penalties in bulk
+
+# - Body is a JSON list of {username, points, reason, ttlSeconds} (ttlSeconds optional,
+#   default 7 days), at most 10000 entries, e.g. from a moderation sweep.
+# - All penalties are issued while holding the ledger once and saved in one write.
+# - Unknown usernames are reported per entry; the rest of the batch still applies.
+# - Returns the number applied and, per entry, the ledger sequence id or the error.
+
+@router.post("/penalties/batch")
+def assignPenaltiesBatch(penalties: List[penaltyAssign] = Body(..., max_length=10000)):
+    """Assign many penalties in one request."""
+    results, issued = [], []
+    with penaltyLedger.batch():
+        for index, item in enumerate(penalties):
+            user = User.usersDb.get(item.username)
+            if user is None:
+                results.append({"index": index, "username": item.username, "error": "User not found"})
+                continue
+            ttl = timedelta(seconds=item.ttlSeconds) if item.ttlSeconds else None
+            penalty = PenaltyPoints(item.points, user, item.reason, ttl=ttl, register=False)
+            issued.append(penalty)
+            results.append({"index": index, "username": item.username, "penalty": penalty})
+        penaltyLedger.addMany(issued)
+        penaltyLedger.flush()
+
+    for result in results:
+        penalty = result.pop("penalty", None)
+        if penalty is not None:
+            result["seq"] = penalty.seq
+            result["activePoints"] = penalty.user.activePenaltyPoints
+    return {"applied": len(issued), "failed": len(results) - len(issued), "results": results}
+
+# dashboard stats
+
+# - Movie, review, user and active session totals, movies and reviews per genre and
+#   reviews per day (by dateOfReview, as YYYY-MM-DD).
+# - Read from counters the stores keep up to date on every change; nothing is scanned.
+#   Expired sessions are counted until the next eviction sweep removes them.
+# - activeSessionsScope says what activeSessions counts: "shared" is every worker's
+#   sessions (SESSION_BACKEND set), "worker" only this worker's, and with signed
+#   tokens ("signed") sessions aren't tracked at all, so activeSessions is null.
+
+@router.get("/stats")
+def dashboardStats():
+    """Return catalog, review, user and session counts."""
+    catalog = catalogStats.snapshot()
+    reviews = reviewStore.statsSnapshot()
+    if User.tokenSigner is not None:
+        activeSessions, scope = None, "signed"
+    else:
+        activeSessions = User.activeSessions.countActive()
+        scope = "shared" if User.activeSessions.backend is not None else "worker"
+    return {
+        "movies": catalog["movies"],
+        "reviews": reviews["total"],
+        "users": len(User.usersDb),
+        "activeSessions": activeSessions,
+        "activeSessionsScope": scope,
+        "genres": catalog["genres"],
+        "reviewsPerDay": reviews["byDay"],
+    }
+
+
+# rate limiter status
+
+# - Shows how many limited requests are in flight and how many were rejected,
+#   per route group, split into "rateLimited" (429) and "shed" (503).
+
+@router.get("/rate-limits")
+def rateLimitStats():
+    """Return rate limiter counters."""
+    return rateLimiter.stats()
+
+
+# password hashing service status
+
+# - Pool size, current queue depth and per-operation (hash / verify) latency,
+#   error and rejection counters.
+
+@router.get("/hashing")
+def hashingStats():
+    """Return password hashing service metrics."""
+    return passwordHasher.stats()
+
+
+# user lock stripes
+
+# - Per-stripe acquisitions, contended acquisitions and total / max wait time
+#   for the session table shards and the username / email account stripes.
+
+@router.get("/locks")
+def lockStats():
+    """Return lock wait metrics for the session and account stripes."""
+    return {
+        "sessions": User.activeSessions.locks.stats(),
+        "users": User._userLocks.stats(),
+    }
+
+
+async def _importBody(request: Request, importer, *args):
+    """Spool the request body and run importer(textStream, *args) on it in the threadpool."""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        try:
+            return await run_in_threadpool(importer, stream, *args)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+        finally:
+            stream.detach()
+
+
+# bulk movie import
+
+# - Request body is the raw NDJSON (one movieCreate object per line) or CSV file;
+#   in CSV, list fields (movieGenres, directors, creators, mainStars) are '|'-separated
+#   or JSON arrays.
+# - The body is spooled to disk past 8 MB and read row by row; rows are validated in
+#   batches and each batch's metadata.json files are written in parallel, atomically.
+# - Existing titles and duplicates within the file are rejected per row.
+# - Returns counts, the created titles and per-row errors.
+# - Returns 400 for an unknown format or a body that isn't UTF-8.
+
+@router.post("/movies/import")
+async def importMoviesFile(request: Request, fileFormat: str = Query("ndjson", alias="format")):
+    """Bulk-create movies from an NDJSON or CSV body."""
+    if fileFormat not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(IMPORT_FORMATS)}")
+
+    return await _importBody(request, importMovies, fileFormat, DATA_PATH)
+
+
+# bulk user import
+
+# - Request body is the raw CSV (header: username,email,password) or NDJSON file.
+# - The body is spooled to disk past 8 MB and parsed row by row; passwords are
+#   hashed in batches on the hashing pool and all accounts saved in one write.
+# - Returns counts, the created users with verification tokens and per-row errors.
+# - Returns 400 for an unknown format or a body that isn't UTF-8.
+
+@router.post("/users/import")
+async def importUsersFile(request: Request, fileFormat: str = Query("csv", alias="format")):
+    """Bulk-create user accounts from a CSV or NDJSON body."""
+    if fileFormat not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(IMPORT_FORMATS)}")
+
+    return await _importBody(request, importUsers, fileFormat)
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException
+from backend.services.changeFeed import changeFeed
+
+router = APIRouter()
+
+MAX_WAIT_SECONDS = 30
+
+
+# change feed
+
+# - Returns movie and review changes with a sequence number greater than `since`, oldest first.
+# - Clients store `lastSeq` from the response and pass it back as `since` on the next call.
+# - `wait` (seconds, capped at 30) turns the call into a long-poll: if nothing newer than
+#   `since` exists yet, the request is held until a change arrives or the wait runs out.
+# - If `resync` is true the client fell too far behind (or the server restarted): it should
+#   re-download GET /movies and continue from the returned `lastSeq`.
+
+@router.get("/")
+async def getChanges(since: int = 0, limit: int = 500, wait: float = 0):
+    """Return catalog changes after a sequence number, optionally long-polling."""
+    if limit < 1 or wait < 0:
+        raise HTTPException(status_code=400, detail="limit must be >= 1 and wait must be >= 0")
+
+    if wait:
+        await changeFeed.waitForChanges(since, min(wait, MAX_WAIT_SECONDS))
+    return changeFeed.since(since, limit)
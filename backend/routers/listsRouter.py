@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict, List
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
 from backend.users.user import User
+from backend.repositories.listsRepo import userMovieLists
+from backend.repositories.movieSummaries import movieSummaries
 
 router = APIRouter()
 
-userMovieLists: Dict[str, Dict[str, List[str]]] = {}
+# snapshot + write-ahead log live here once the app opens the store
+LISTS_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "movieLists")
 
 
 # create new list
@@ -15,10 +19,9 @@ def createList(username: str, listName: str, sessionToken: str):
     if not current_user:
         raise HTTPException(status_code=401, detail="Login required to Create Lists")
 
-    userMovieLists.setdefault(username.lower(), {})
-    if listName in userMovieLists[username.lower()]:
+    if listName in userMovieLists.get(username.lower(), {}):
         raise HTTPException(status_code=400, detail="List already exists")
-    userMovieLists[username.lower()][listName] = []
+    userMovieLists.createList(username.lower(), listName)
     return {"message": f"List '{listName}' created for {username}"}
 
 # add movie to list
@@ -37,19 +40,62 @@ def addMovieToList(username: str, listName: str, movieTitle: str, sessionToken:
     if movieTitle in userMovieLists[username.lower()][listName]:
         raise HTTPException(status_code=400, detail="Movie already in list")
 
-    userMovieLists[username.lower()][listName].append(movieTitle)
+    userMovieLists.addMovie(username.lower(), listName, movieTitle)
     return {"message": f"Added '{movieTitle}' to list '{listName}'"}
 
+# move a movie within a list
+# - position is 0-based; positions past either end put the movie first or last.
+@router.post("/move")
+def moveMovieInList(username: str, listName: str, movieTitle: str, position: int, sessionToken: str):
+    """Move a movie to a new position in a user's list."""
+    current_user = User.getCurrentUser(User, sessionToken)
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Login required to Reorder Lists")
+    if username.lower() not in userMovieLists:
+        raise HTTPException(status_code=404, detail="User not found")
+    if listName not in userMovieLists[username.lower()]:
+        raise HTTPException(status_code=404, detail="List not found")
+    if movieTitle not in userMovieLists[username.lower()][listName]:
+        raise HTTPException(status_code=404, detail="Movie not in list")
+
+    userMovieLists.moveMovie(username.lower(), listName, movieTitle, position)
+    return {"message": f"Moved '{movieTitle}' to position {position} in list '{listName}'"}
+
 # view all lists
+# - With ?list=, returns one page of that list plus its total length.
+# - Without it, returns every list; offset/limit then apply to each one.
+# - No limit means the rest of the list.
+# - expand=summary swaps each title for its cached catalog summary (no reviews), all looked up
+#   in one batch; a title with no movie behind it comes back as just {"title": ...}.
 @router.get("/{username}")
-def viewAllLists(username: str, sessionToken: str):
-    """Return all movie lists for a user."""
+def viewAllLists(username: str, sessionToken: str, listName: Optional[str] = Query(None, alias="list"),
+                 offset: int = 0, limit: Optional[int] = None, expand: Optional[str] = None):
+    """Return all movie lists for a user, or one page of a single list."""
     current_user = User.getCurrentUser(User, sessionToken)
     if not current_user:
         raise HTTPException(status_code=401, detail="Login required to View Lists")
+    if offset < 0 or (limit is not None and limit < 1):
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit must be >= 1")
+    if expand not in (None, "summary"):
+        raise HTTPException(status_code=400, detail="expand must be 'summary'")
     if username.lower() not in userMovieLists or not userMovieLists[username.lower()]:
         raise HTTPException(status_code=404, detail="No lists found for this user")
-    return userMovieLists[username.lower()]
+
+    lists = userMovieLists[username.lower()]
+    if listName is None:
+        pages = {name: movies.page(offset, limit) for name, movies in lists.items()}
+    elif listName not in lists:
+        raise HTTPException(status_code=404, detail="List not found")
+    else:
+        pages = {listName: lists[listName].page(offset, limit)}
+
+    if expand == "summary":
+        summaries = movieSummaries.lookup(title for page in pages.values() for title in page)
+        pages = {name: [summaries[title] or {"title": title} for title in page] for name, page in pages.items()}
+
+    if listName is None:
+        return pages
+    return {"list": listName, "total": len(lists[listName]), "offset": offset, "movies": pages[listName]}
 
 # delete movie from list
 @router.delete("/remove")
@@ -65,7 +111,7 @@ def removeMovieFromList(username: str, listName: str, movieTitle: str, sessionTo
     if movieTitle not in userMovieLists[username.lower()][listName]:
         raise HTTPException(status_code=404, detail="Movie not in list")
 
-    userMovieLists[username.lower()][listName].remove(movieTitle)
+    userMovieLists.removeMovie(username.lower(), listName, movieTitle)
     return {"message": f"Removed '{movieTitle}' from list '{listName}'"}
 
 # delete entire list
@@ -84,5 +130,5 @@ def deleteList(username: str, listName: str, sessionToken: str):
     if listName not in userMovieLists[username_key]:
         raise HTTPException(status_code=404, detail="List not found")
 
-    del userMovieLists[username_key][listName]
+    userMovieLists.deleteList(username_key, listName)
     return {"message": f"Deleted list '{listName}' for {username}"}
@@ -5,13 +5,16 @@ from typing import List
 from backend.schemas.movie import movie
 from backend.schemas.movieReviews import movieReviews, movieReviewsCreate
 from backend.users.user import User
+from backend.repositories.reviewsRepo import reviewStore
+from backend.services.changeFeed import changeFeed
 
 router = APIRouter()
 
 # load data
 DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data")
 
-movie_reviews_memory = {}
+# shared with reviewRouter so its per-user index sees every review added here
+movie_reviews_memory = reviewStore
 
 # helper to load movies
 def load_all_movies() -> List[movie]:
@@ -24,7 +27,7 @@ def load_all_movies() -> List[movie]:
             with open(metadata_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
-                reviews = movie_reviews_memory.get(data["title"].lower(), [])
+                reviews = movie_reviews_memory.reviewsForMovie(data["title"])
                 data["reviews"] = reviews
                 movies.append(movie(**data))
     return movies
@@ -61,7 +64,7 @@ def get_movie_by_title(title: str):
 
     with open(metadata_path, "r", encoding="utf-8") as f:
         data = json.load(f)
-        reviews = movie_reviews_memory.get(title.lower(), [])
+        reviews = movie_reviews_memory.reviewsForMovie(title)
         data["reviews"] = reviews
         return movie(**data)
 
@@ -90,16 +93,14 @@ def add_review(title: str, review_data: movieReviewsCreate, sessionToken: str):
     if not review_data.reviewTitle.strip() or not review_data.review.strip():
         raise HTTPException(status_code=400, detail="Review title and text cannot be empty")
 
-    # check: prevent duplicate review by same user for the same movie
-    existing_reviews = movie_reviews_memory.get(title.lower(), [])
-    for r in existing_reviews:
-        if r.user.lower() == current_user.username.lower():
-            raise HTTPException(status_code=400, detail="You have already reviewed this movie")
-
     # ===========================
     # ORIGINAL: use the request body directly
     review = movieReviews(**review_data.dict())
     # ===========================
 
-    movie_reviews_memory.setdefault(title.lower(), []).append(review)
+    # check: prevent duplicate review by same user for the same movie
+    # (O(1) lookup in the store's per-movie reviewer set, done atomically with the insert)
+    if movie_reviews_memory.addUniqueReview(title, review, current_user.username) is None:
+        raise HTTPException(status_code=400, detail="You have already reviewed this movie")
+    changeFeed.record("review", "create", title, review.model_dump(), reviewId=review.reviewId)
     return review
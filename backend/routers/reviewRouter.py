@@ -5,19 +5,22 @@ from typing import List
 from backend.schemas.movie import movie
 from backend.schemas.movieReviews import movieReviews, movieReviewsCreate, movieReviewsUpdate
 from backend.users.user import User
+from backend.repositories.reviewsRepo import reviewStore
+from backend.services.changeFeed import changeFeed
 
 router = APIRouter()
 
 # load data
 DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data")
 
-movieReviews_memory = {}
+# shared with movieRouter so reviews posted there are visible here
+movieReviews_memory = reviewStore
 
 
 # helper to get review
 def getReviewsForMovie(title: str) -> List[movieReviews]:
     """Return reviews for a given movie title."""
-    return movieReviews_memory.get(title.lower(), [])
+    return movieReviews_memory.reviewsForMovie(title)
 
 
 # list all reviews for a movie
@@ -47,38 +50,56 @@ def getAllReviewsForMovie(title: str):
 # - Returns 404 if the user has no reviews.
 # - Works case-insensitively.
 # - Returns reviews across multiple movies.
-# - Unit tests cover all cases: success, case-insensitive, multiple movies, not found.
+# - Served from the store's per-user index, so cost depends only on the user's own reviews.
+# - Paginated with offset/limit (oldest review first); a page past the end is an empty list.
+# - Unit tests cover all cases: success, case-insensitive, multiple movies, not found, paging.
 
 @router.get("/user/{username}", response_model=List[movieReviews])
-def getReviewsByUser(username: str):
-    """Return all reviews written by a specific user across all movies."""
-    userReviews = []
-    for reviews in movieReviews_memory.values():
-        for r in reviews:
-            if r.user.lower() == username.lower():
-                userReviews.append(r)
-
-    if not userReviews:
+def getReviewsByUser(username: str, offset: int = 0, limit: int = 100):
+    """Return a page of reviews written by a specific user across all movies."""
+    if offset < 0 or limit < 1:
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit must be >= 1")
+
+    if not movieReviews_memory.countByUser(username):
         raise HTTPException(status_code=404, detail="No reviews found for this user")
-    return userReviews
+    return movieReviews_memory.reviewsByUser(username, offset, limit)
+
+
+# get a single review
+
+# - Reviews are addressed by the stable id the store assigned when they were added.
+# - Ids are never reused, so deleting one review does not shift any other.
+# - Returns 404 if the movie folder or the review id does not exist.
+
+@router.get("/{title}/review/{reviewId}", response_model=movieReviews)
+def getReview(title: str, reviewId: int):
+    """Return one review of a movie by its id."""
+    movie_folder = os.path.join(DATA_PATH, title)
+    if not os.path.exists(movie_folder):
+        raise HTTPException(status_code=404, detail=f"Movie '{title}' not found")
+
+    review = movieReviews_memory.getReview(title, reviewId)
+    if review is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+    return review
 
 
 # update review
 
 # - Requires:
 #     1. Movie folder exists.
-#     2. Index is valid (within list bounds).
+#     2. Review id exists for that movie (ids of reviews seeded in order match their old index).
 #     3. Logged-in user matches the review owner, or user is an admin.
 # - Unit tests cover:
 #     - Success
 #     - Unauthenticated (401)
-#     - Index not found (404)
+#     - Id not found (404)
 #     - Wrong user (403)
 #     - Movie missing (404)
 
-@router.put("/{title}/review/{index}", response_model=movieReviews)
-def updateReview(title: str, index: int, updated_data: movieReviewsUpdate, sessionToken: str):
-    """Update an existing review by index for a specific movie."""
+@router.put("/{title}/review/{reviewId}", response_model=movieReviews)
+def updateReview(title: str, reviewId: int, updated_data: movieReviewsUpdate, sessionToken: str):
+    """Update an existing review by id for a specific movie."""
     current_user = User.getCurrentUser(User, sessionToken)
     if not current_user:
         raise HTTPException(status_code=401, detail="Login required to Update Reviews")
@@ -87,20 +108,21 @@ def updateReview(title: str, index: int, updated_data: movieReviewsUpdate, sessi
     if not os.path.exists(movie_folder):
         raise HTTPException(status_code=404, detail=f"Movie '{title}' not found")
 
-    reviews = movieReviews_memory.get(title.lower(), [])
-    if not reviews or index >= len(reviews):
+    existing = movieReviews_memory.getReview(title, reviewId)
+    if existing is None:
         raise HTTPException(status_code=404, detail="Review not found")
 
-    if reviews[index].user.lower() != current_user.username.lower():
+    if existing.user.lower() != current_user.username.lower():
         raise HTTPException(status_code=403, detail="You can't update others' reviews")
     
     updatedReview = movieReviews(
-    user=reviews[index].user,
+    user=existing.user,
     **updated_data.dict(exclude={"user"})
     )
-    reviews[index] = updatedReview
-
-    movieReviews_memory[title.lower()] = reviews
+    # the review may have been deleted by another request since the lookup
+    if movieReviews_memory.replaceReview(title, reviewId, updatedReview) is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+    changeFeed.record("review", "update", title, updatedReview.model_dump(), reviewId=reviewId)
     return updatedReview
 
 
@@ -108,19 +130,20 @@ def updateReview(title: str, index: int, updated_data: movieReviewsUpdate, sessi
 
 # - Same rules as Update:
 #     - Movie must exist
-#     - Index valid
+#     - Review id exists
 #     - User must be review owner or admin
+# - Removing by id is O(1) and leaves every other review's id unchanged.
 # - Unit tests cover:
 #     - Success
 #     - Unauthenticated (401)
 #     - Movie missing (404)
-#     - Index out of range (404)
+#     - Id not found (404)
 #     - Wrong user (403)
 #     - Admin override
 
-@router.delete("/{title}/review/{index}")
-def deleteReview(title: str, index: int, sessionToken: str):
-    """Delete a review by index for a specific movie."""
+@router.delete("/{title}/review/{reviewId}")
+def deleteReview(title: str, reviewId: int, sessionToken: str):
+    """Delete a review by id for a specific movie."""
     current_user = User.getCurrentUser(User, sessionToken)
     if not current_user:
         raise HTTPException(status_code=401, detail="Login required to Delete Reviews")
@@ -129,17 +152,17 @@ def deleteReview(title: str, index: int, sessionToken: str):
     if not os.path.exists(movie_folder):
         raise HTTPException(status_code=404, detail=f"Movie '{title}' not found")
     
-    # Get the list of reviews
-    reviews = movieReviews_memory.get(title.lower(), [])
-    if not reviews or index >= len(reviews):
+    review_to_remove = movieReviews_memory.getReview(title, reviewId)
+    if review_to_remove is None:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    review_to_remove = reviews[index]
     # Allow deletion if current_user is the creator or is an admin
     if (current_user.username.lower() != review_to_remove.user.lower() 
             and getattr(current_user, "role", None) != "admin"):
         raise HTTPException(status_code=403, detail="You can't delete others' reviews")
    
-    removed = reviews.pop(index)
-    movieReviews_memory[title.lower()] = reviews
+    removed = movieReviews_memory.removeReview(title, reviewId)
+    if removed is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+    changeFeed.record("review", "delete", title, reviewId=reviewId)
     return {"message": f"Deleted review '{removed.reviewTitle}' by {removed.user}"}
\ No newline at end of file
@@ -1,16 +1,17 @@
 import os
 from fastapi import APIRouter, HTTPException
 from backend.users.user import User
+from backend.users.passwordHasher import HasherBusyError
 
 router = APIRouter()
 
 
-# register user
+# register user (bcrypt runs on the hashing service's process pool and is awaited)
 @router.post("/register")
-def registerUser(username: str, email: str, password: str):
+async def registerUser(username: str, email: str, password: str):
     """Create a new user account."""
     try:
-        newUser = User.createAccount(username=username, email=email, password=password)
+        newUser = await User.createAccountAsync(username=username, email=email, password=password)
         return {
             "message": "Account created successfully!",
             "username": newUser.username,
@@ -19,29 +20,33 @@ def registerUser(username: str, email: str, password: str):
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HasherBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 # verify email
 @router.post("/verify")
 def verifyEmail(username: str, token: str):
     """Verify user's email using the verification token."""
-    if username not in User.usersDb:
+    user = User.resolveUser(username)
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user = User.usersDb[username]
     if user.verifyEmail(token):
         return {"message": "Email verified successfully!"}
     else:
         raise HTTPException(status_code=400, detail="Invalid verification token")
 
-# login user
+# login user (password check is awaited on the hashing service's process pool)
 @router.post("/login")
-def loginUser(username: str, password: str):
+async def loginUser(username: str, password: str):
     """Login a user and return a session token."""
     try:
-        sessionToken = User.login(username=username, password=password)
+        sessionToken = await User.loginAsync(username=username, password=password)
         return {"message": "Login successful!", "sessionToken": sessionToken}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HasherBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 # logout user
 @router.post("/logout")
@@ -9,6 +9,7 @@ class movieReviews(BaseModel):
     userRatingOutOf10: float = Field(..., ge = 0, le =  10)
     reviewTitle: str = Field(..., max_length = 200)
     review: str = Field(..., max_length = 5000)
+    reviewId: Optional[int] = None  # stable per-movie id, assigned by the review store
 
 class movieReviewsCreate(BaseModel):
     dateOfReview: str
@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class penaltyAssign(BaseModel):
+    username: str
+    points: int = Field(..., ge = 0)
+    reason: str = Field(..., max_length = 500)
+    ttlSeconds: Optional[int] = Field(None, gt = 0)  # defaults to the 7 day penalty lifetime
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class ChangeFeed:
+    """
+    Monotonically sequenced log of catalog changes (movie and review creates,
+    updates and deletes) so clients can sync deltas instead of re-reading
+    GET /movies.
+
+    Only the newest maxEntries changes are retained; a client asking for a
+    sequence number older than that is told to resync from scratch.
+    Long-polling waiters are asyncio futures woken from whichever thread
+    records the next change. Listeners are called with each entry, in
+    sequence order, as it is recorded.
+    """
+
+    def __init__(self, maxEntries: int = 10000):
+        self._lock = threading.Lock()
+        self.entries: deque = deque(maxlen=maxEntries)
+        self.seq = 0
+        self._waiters: List[tuple] = []
+        self.listeners: List[Callable[[dict], None]] = []
+
+    def record(self, entity: str, action: str, key: str, data: Optional[Dict[str, Any]] = None,
+               reviewId: Optional[int] = None) -> int:
+        """Append a change and wake any long-polling readers; returns its sequence number."""
+        return self.recordMany(entity, action, [(key, data)], reviewId)
+
+    def recordMany(self, entity: str, action: str, items: List[Tuple[str, Optional[Dict[str, Any]]]],
+                   reviewId: Optional[int] = None) -> int:
+        """Append one change per (key, data) under a single lock and wake readers once; returns the last sequence number."""
+        with self._lock:
+            at = datetime.now().isoformat()
+            for key, data in items:
+                self.seq += 1
+                entry = {
+                    "seq": self.seq,
+                    "entity": entity,
+                    "action": action,
+                    "key": key,
+                    "reviewId": reviewId,
+                    "data": data,
+                    "at": at,
+                }
+                self.entries.append(entry)
+                for listener in self.listeners:
+                    listener(entry)
+            waiters, self._waiters = self._waiters, []
+            seq = self.seq
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+        return seq
+
+    def since(self, seq: int, limit: int = 500) -> Dict[str, Any]:
+        """Changes after seq, oldest first, at most limit of them."""
+        with self._lock:
+            oldest = self.entries[0]["seq"] if self.entries else self.seq + 1
+            # too old to serve from the retained window, or from before a restart
+            if seq < oldest - 1 or seq > self.seq:
+                return {"changes": [], "lastSeq": self.seq, "resync": True}
+
+            # sequence numbers are contiguous, so the first wanted entry is start places in; a deque
+            # can only be walked from an end, so slice from whichever end is nearer
+            start = seq + 1 - oldest
+            remaining = len(self.entries) - start
+            count = min(limit, remaining)
+            if start <= remaining:
+                changes = list(islice(self.entries, start, start + count))
+            else:
+                changes = list(islice(reversed(self.entries), remaining - count, remaining))[::-1]
+            lastSeq = changes[-1]["seq"] if changes else max(seq, 0)
+            return {"changes": changes, "lastSeq": lastSeq, "resync": False}
+
+    async def waitForChanges(self, seq: int, timeout: float):
+        """Return once a change newer than seq exists, or after timeout seconds."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # newer changes exist, or seq is ahead of the feed (a restart) and the reply is a resync
+            if seq != self.seq:
+                return
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.seq = 0
+
+
+# process-wide feed written by moviesService, the admin router and the review routes
+changeFeed = ChangeFeed()
@@ -0,0 +1,272 @@
+import argparse
+import bisect
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import bcrypt
+
+from backend.services.movieListServices import saveUserMovieLists
+
+# the exact header of the scraped movieReviews.csv files
+REVIEW_COLUMNS = ["Date of Review", "User", "Usefulness Vote", "Total Votes", "User's Rating out of 10",
+                  "Review Title", "Review"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October",
+          "November", "December"]
+
+# rough share of titles carrying each genre on IMDb
+GENRE_WEIGHTS = {
+    "Drama": 30, "Comedy": 17, "Action": 12, "Thriller": 10, "Romance": 9, "Crime": 9, "Adventure": 7,
+    "Horror": 6, "Mystery": 5, "Sci-Fi": 5, "Fantasy": 4, "Family": 3, "Biography": 3, "Animation": 3,
+    "History": 2, "War": 1.5, "Music": 1.5, "Sport": 1, "Western": 0.5, "Musical": 0.5,
+}
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+               "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Karen",
+               "Hiro", "Priya", "Omar", "Ana", "Wei", "Fatima", "Ivan", "Chloe", "Mateo", "Aisha", "Lars", "Yuki"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee",
+              "Tanaka", "Patel", "Khan", "Silva", "Chen", "Ali", "Petrov", "Dubois", "Rossi", "Nielsen", "Kim", "Sato"]
+TITLE_WORDS = ["Silent", "Last", "Broken", "Golden", "Hidden", "Midnight", "Crimson", "Lost", "Final", "Wild",
+               "Dark", "Endless", "Frozen", "Burning", "Distant", "Hollow", "Iron", "Secret", "Savage", "Quiet"]
+TITLE_NOUNS = ["Harbor", "Kingdom", "Horizon", "Protocol", "River", "Empire", "Witness", "Garden", "Signal", "Frontier",
+               "Storm", "Legacy", "Shadow", "Promise", "Mirror", "Voyage", "Covenant", "Echo", "Summit", "Verdict"]
+PLOT_WORDS = ["a", "young", "detective", "family", "must", "uncover", "the", "truth", "behind", "mysterious",
+              "disappearance", "while", "former", "soldier", "fights", "to", "protect", "small", "town", "from",
+              "ruthless", "gang", "and", "unlikely", "friendship", "changes", "everything", "in", "city", "of",
+              "secrets", "dreams", "journey", "across", "world", "love", "betrayal", "revenge", "hope"]
+REVIEW_WORDS = ["great", "acting", "story", "plot", "boring", "masterpiece", "overrated", "loved", "ending",
+                "characters", "visuals", "soundtrack", "pacing", "slow", "brilliant", "director", "performance",
+                "script", "twist", "must", "watch", "again", "the", "was", "and", "but", "really", "not", "very",
+                "film", "movie", "scene", "worth", "it", "I", "this", "a", "of", "best", "worst", "year"]
+
+REVIEWS_START = date(1998, 1, 1)  # IMDb user reviews go back to the late nineties
+REVIEWS_END = date(2024, 12, 31)
+
+
+class ZipfPicker:
+    """Pick items with weight 1 / rank ** exponent, so a few are very common and most are rare."""
+
+    def __init__(self, items: Sequence, exponent: float = 1.1):
+        self.items = list(items)
+        self.cumulative = list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, len(self.items) + 1)))
+
+    def pick(self, rng: random.Random):
+        return self.items[bisect.bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+
+    def pickDistinct(self, rng: random.Random, count: int) -> list:
+        count = min(count, len(self.items))
+        if count * 2 >= len(self.items):
+            return rng.sample(self.items, count)  # most of a small pool: rejection would crawl
+        chosen = {}
+        while len(chosen) < count:
+            chosen[self.pick(rng)] = None
+        return list(chosen)
+
+
+def _personNames(rng: random.Random, count: int) -> List[str]:
+    pairs = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+    rng.shuffle(pairs)
+    names = []
+    for suffix in itertools.chain(["", " Jr.", " II", " III"], (f" {n}" for n in itertools.count(4))):
+        names.extend(pair + suffix for pair in pairs)
+        if len(names) >= count:
+            return names[:count]
+
+
+def _countLabel(count: int) -> str:
+    """The totalUserReviews style: 873, 2.9K, 1.2M"""
+    if count >= 1_000_000:
+        return f"{count / 1_000_000:.1f}M"
+    if count >= 1000:
+        return f"{count / 1000:.1f}K"
+    return str(count)
+
+
+def _words(rng: random.Random, vocabulary: Sequence[str], low: int, high: int) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(rng.randint(low, high)))
+
+
+def _reviewDate(rng: random.Random, released: date) -> str:
+    start = max(released, REVIEWS_START)
+    day = start + timedelta(days=rng.randint(0, max(0, (REVIEWS_END - start).days)))
+    return f"{day.day} {MONTHS[day.month - 1]} {day.year}"
+
+
+def _bcryptSalt(rng: random.Random, rounds: int) -> bytes:
+    """A bcrypt salt drawn from rng, so generated hashes are reproducible"""
+    alphabet = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    body = "".join(rng.choice(alphabet) for _ in range(21)) + rng.choice(".Oeu")  # last char holds only 2 bits
+    return f"$2b${rounds:02d}${body}".encode("ascii")
+
+
+class CatalogGenerator:
+    """
+    Writes a synthetic data folder in the same layout the app reads:
+    <out>/<title>/metadata.json, <out>/<title>/movieReviews.csv,
+    <out>/Users/userList.json and per-user list shards under <out>/movieLists.
+
+    Output depends only on the seed and the sizes. Each movie draws from its
+    own generator seeded with (seed, index), so with the other settings
+    unchanged the first 1k titles of a 10k run are the same as a 1k run.
+    """
+
+    def __init__(self, seed: int = 0, reviewsPerMovie: int = 20, userCount: int = 1000, listsPerUser: int = 2,
+                 password: str = "password123", hashRounds: int = 4):
+        self.seed = seed
+        self.reviewsPerMovie = reviewsPerMovie
+        self.userCount = userCount
+        self.listsPerUser = listsPerUser
+        self.password = password
+        self.hashRounds = hashRounds
+        rng = random.Random(seed)
+        self.genres = list(GENRE_WEIGHTS)
+        self.genreWeights = list(GENRE_WEIGHTS.values())
+        # a handful of prolific directors and stars, then a long tail
+        self.directors = ZipfPicker(_personNames(rng, 2000), exponent=1.05)
+        self.stars = ZipfPicker(_personNames(rng, 5000), exponent=1.0)
+        self.writers = ZipfPicker(_personNames(rng, 3000), exponent=0.9)
+        self.usernames = self._usernames(rng, userCount)
+        # reviewers are mostly site users, plus drive-by accounts that never log in here
+        self.reviewers = self.usernames + [f"{name.split()[0].lower()}.{name.split()[1].lower()}{n}"
+                                           for n, name in enumerate(_personNames(rng, max(1000, reviewsPerMovie * 2)))]
+
+    @staticmethod
+    def _usernames(rng: random.Random, count: int) -> List[str]:
+        names = []
+        for n in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            names.append(f"{first.lower()}{last.lower()}{n}"[-20:])  # checkUsername: alphanumeric, at most 20
+        return names
+
+    def titles(self, count: int) -> List[str]:
+        rng = random.Random(f"{self.seed}:titles")
+        titles, seen = [], set()
+        while len(titles) < count:
+            title = f"The {rng.choice(TITLE_WORDS)} {rng.choice(TITLE_NOUNS)}"
+            if title in seen:
+                title = f"{title} {rng.randint(2, 99_999)}"
+            if title not in seen:
+                seen.add(title)
+                titles.append(title)
+        return titles
+
+    def movie(self, index: int, title: str) -> dict:
+        rng = random.Random(f"{self.seed}:movie:{index}")
+        released = date(1950, 1, 1) + timedelta(days=int((1 - rng.random() ** 2) * (REVIEWS_END - date(1950, 1, 1)).days))
+        genreCount = rng.choices([1, 2, 3], weights=[25, 40, 35])[0]
+        genres = list(dict.fromkeys(rng.choices(self.genres, weights=self.genreWeights, k=genreCount)))
+        ratingCount = int(rng.lognormvariate(9.5, 1.8))
+        description = _words(rng, PLOT_WORDS, 12, 40).capitalize() + "."
+        # the same keys, in the same order, as the scraped metadata.json files
+        return {
+            "title": title,
+            "movieIMDbRating": round(min(9.9, max(1.0, rng.gauss(6.6, 1.0))), 1),
+            "totalRatingCount": ratingCount,
+            "totalUserReviews": _countLabel(max(self.reviewsPerMovie, ratingCount // 400)),
+            "totalCriticReviews": str(int(rng.lognormvariate(4.0, 1.0))),
+            "metaScore": str(min(100, max(10, int(rng.gauss(58, 16))))),
+            "movieGenres": genres,
+            "directors": self.directors.pickDistinct(rng, rng.choices([1, 2], weights=[92, 8])[0]),
+            "datePublished": released.isoformat(),
+            "creators": self.writers.pickDistinct(rng, rng.randint(1, 3)),
+            "mainStars": self.stars.pickDistinct(rng, 3),
+            "description": description[:500],
+            "duration": max(70, min(240, int(rng.gauss(112, 20)))),
+        }
+
+    def reviews(self, index: int, metadata: dict) -> List[list]:
+        rng = random.Random(f"{self.seed}:reviews:{index}")
+        released = date.fromisoformat(metadata["datePublished"])
+        rows = []
+        for reviewer in rng.sample(self.reviewers, min(self.reviewsPerMovie, len(self.reviewers))):
+            rating = min(10, max(1, round(rng.gauss(metadata["movieIMDbRating"], 2.0))))
+            totalVotes = int(rng.expovariate(1 / 25))
+            rows.append([
+                _reviewDate(rng, released),
+                reviewer,
+                rng.randint(0, totalVotes),
+                totalVotes,
+                rating,
+                _words(rng, REVIEW_WORDS, 2, 8).capitalize(),
+                _words(rng, REVIEW_WORDS, 20, 300).capitalize() + ".",
+            ])
+        return rows
+
+    def users(self) -> dict:
+        """userList.json records; everyone shares self.password (one hash keeps generation fast)"""
+        rng = random.Random(f"{self.seed}:users")
+        passwordHash = bcrypt.hashpw(self.password.encode("utf-8"), _bcryptSalt(rng, self.hashRounds)).decode("utf-8")
+        return {username: {"email": f"{username}@example.com", "password": passwordHash,
+                           "isVerified": rng.random() < 0.9}
+                for username in self.usernames}
+
+    def lists(self, username: str, titles: ZipfPicker) -> dict:
+        rng = random.Random(f"{self.seed}:lists:{username}")
+        names = ["Watchlist", "Favorites", "Rewatch", "Date Night", "Classics", "Weekend", "Top 10"]
+        return {name: titles.pickDistinct(rng, max(1, int(rng.lognormvariate(2.5, 0.8))))
+                for name in names[:self.listsPerUser]}
+
+    def write(self, outDir: Path, movieCount: int) -> dict:
+        outDir = Path(outDir)
+        outDir.mkdir(parents=True, exist_ok=True)
+        titles = self.titles(movieCount)
+        reviewCount = 0
+        for index, title in enumerate(titles):
+            folder = outDir / title
+            folder.mkdir(exist_ok=True)
+            metadata = self.movie(index, title)
+            with open(folder / "metadata.json", "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False)
+            rows = self.reviews(index, metadata)
+            with open(folder / "movieReviews.csv", "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerow(REVIEW_COLUMNS)
+                writer.writerows(rows)
+            reviewCount += len(rows)
+
+        usersDir = outDir / "Users"
+        usersDir.mkdir(exist_ok=True)
+        with open(usersDir / "userList.json", "w") as f:
+            json.dump(self.users(), f, indent=2)
+
+        listsDir = outDir / "movieLists"
+        popularTitles = ZipfPicker(titles, exponent=0.8) if titles else None
+        listCount = 0
+        for username in self.usernames if popularTitles else []:
+            lists = self.lists(username, popularTitles)
+            saveUserMovieLists(lists, username, listsDir)
+            listCount += len(lists)
+
+        return {"outDir": str(outDir), "seed": self.seed, "movies": len(titles), "reviews": reviewCount,
+                "users": len(self.usernames), "lists": listCount, "password": self.password}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic, seeded movie catalog in the backend/data layout")
+    parser.add_argument("outDir", help="directory to write; point the app's data folder here to use it")
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--reviews-per-movie", type=int, default=20, dest="reviewsPerMovie")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--lists-per-user", type=int, default=2, dest="listsPerUser")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="write into a directory that is not empty")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.outDir) and os.listdir(args.outDir) and not args.force:
+        print(f"{args.outDir} is not empty; pass --force to write into it anyway", file=sys.stderr)
+        return 1
+    generator = CatalogGenerator(args.seed, args.reviewsPerMovie, args.users, args.listsPerUser)
+    json.dump(generator.write(Path(args.outDir), args.movies), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+# python -m backend.services.dataGenerator /tmp/catalog10k --movies 10000 --reviews-per-movie 50 --seed 7
+if __name__ == "__main__":
+    sys.exit(main())
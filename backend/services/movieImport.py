@@ -0,0 +1,146 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, TextIO, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from backend.schemas.movie import movieCreate
+from backend.services.changeFeed import changeFeed
+from backend.services.userImport import readRows
+
+BATCH_SIZE = 500  # rows validated by one TypeAdapter call, then written together
+WRITE_WORKERS = 8
+LIST_FIELDS = ("movieGenres", "directors", "creators", "mainStars")
+RESERVED_TITLES = {"users", "userlist", "movielists"}  # non-movie folders in the data folder, compared case-insensitively
+
+movieBatchAdapter = TypeAdapter(List[movieCreate])
+
+
+def _splitListFields(row: dict) -> dict:
+    """CSV cells can't hold arrays: accept a JSON array or a '|'-separated string for list fields"""
+    for field in LIST_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+            if value.startswith("["):
+                try:
+                    row[field] = json.loads(value)
+                    continue
+                except json.JSONDecodeError:
+                    pass
+            row[field] = [part.strip() for part in value.split("|") if part.strip()]
+    return row
+
+
+def _formatError(errors: List[dict]) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in error['loc'][1:]) or 'row'}: {error['msg']}"
+                     for error in errors)
+
+
+def validateBatch(rows: List[Tuple[int, dict]]) -> Tuple[List[Tuple[int, movieCreate]], List[dict]]:
+    """
+    Validate a batch of rows with one TypeAdapter call. When some rows are
+    invalid the adapter reports all of them at once; those are turned into
+    per-row errors and the rest are validated again, which then succeeds.
+    """
+    if not rows:
+        return [], []
+    try:
+        movies = movieBatchAdapter.validate_python([row for _, row in rows])
+        return [(rowNumber, movie) for (rowNumber, _), movie in zip(rows, movies)], []
+    except ValidationError as e:
+        byIndex = {}
+        for error in e.errors():
+            byIndex.setdefault(error["loc"][0], []).append(error)
+    errors = [{"row": rows[index][0], "title": rows[index][1].get("title"), "error": _formatError(found)}
+              for index, found in byIndex.items()]
+    remaining = [row for index, row in enumerate(rows) if index not in byIndex]
+    valid, _ = validateBatch(remaining)
+    return valid, errors
+
+
+def _writeMovie(dataPath: str, movie: movieCreate):
+    """Create the movie folder (failing if it already exists) and write metadata.json atomically"""
+    folderPath = os.path.join(dataPath, movie.title)
+    os.mkdir(folderPath)
+    metadataPath = os.path.join(folderPath, "metadata.json")
+    tmpPath = metadataPath + ".tmp"
+    with open(tmpPath, "w", encoding="utf-8") as f:
+        json.dump(movie.model_dump(), f, ensure_ascii=False)
+    os.replace(tmpPath, metadataPath)
+
+
+def _checkTitle(title: str, dataPath: str, seenTitles: set):
+    # the title becomes a folder name: no separators, hidden or dot names (".", "..", ".trash"),
+    # the data folder's own folders, NULs or other control characters
+    if not title.strip() or "/" in title or "\\" in title or title.startswith("."):
+        raise ValueError("Invalid title")
+    if title.lower() in RESERVED_TITLES or any(ord(ch) < 32 or ord(ch) == 127 for ch in title):
+        raise ValueError("Invalid title")
+    if title in seenTitles:
+        raise ValueError("Duplicate title in import")
+    if os.path.exists(os.path.join(dataPath, title)):
+        raise ValueError("Movie already exists")
+
+
+def importMovies(stream: TextIO, fileFormat: str, dataPath: str, batchSize: int = BATCH_SIZE,
+                 workers: int = WRITE_WORKERS) -> dict:
+    """
+    Create movies from a CSV or NDJSON stream of movieCreate fields. Rows are
+    read one at a time, validated a batch at a time and each valid batch's
+    metadata files are written in parallel. The change feed gets every new
+    movie in one append at the end. Returns counts, the created titles and an
+    error per rejected row.
+    """
+    report = {"total": 0, "created": 0, "failed": 0, "movies": [], "errors": []}
+    seenTitles = set()
+    created = []
+    batch: List[Tuple[int, dict]] = []
+
+    def writeBatch(pool: ThreadPoolExecutor):
+        valid, errors = validateBatch(batch)
+        report["errors"].extend(errors)
+        accepted = []
+        for rowNumber, movie in valid:
+            try:
+                _checkTitle(movie.title, dataPath, seenTitles)
+            except ValueError as e:
+                report["errors"].append({"row": rowNumber, "title": movie.title, "error": str(e)})
+                continue
+            seenTitles.add(movie.title)
+            accepted.append((rowNumber, movie))
+        futures = [(rowNumber, movie, pool.submit(_writeMovie, dataPath, movie)) for rowNumber, movie in accepted]
+        for rowNumber, movie, future in futures:
+            try:
+                future.result()
+            except FileExistsError:
+                report["errors"].append({"row": rowNumber, "title": movie.title, "error": "Movie already exists"})
+                continue
+            except (OSError, ValueError) as e:
+                report["errors"].append({"row": rowNumber, "title": movie.title, "error": f"IO error: {e}"})
+                continue
+            created.append(movie)
+            report["movies"].append({"row": rowNumber, "title": movie.title})
+        batch.clear()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="movie-import") as pool:
+            for rowNumber, row, error in readRows(stream, fileFormat):
+                report["total"] += 1
+                if error:
+                    report["errors"].append({"row": rowNumber, "title": None, "error": error})
+                    continue
+                batch.append((rowNumber, _splitListFields(row) if fileFormat == "csv" else row))
+                if len(batch) >= batchSize:
+                    writeBatch(pool)
+            if batch:
+                writeBatch(pool)
+    finally:
+        # movies already written are in the catalog even if the rest of the import failed
+        if created:
+            changeFeed.recordMany("movie", "create", [(movie.title, movie.model_dump()) for movie in created])
+    report["errors"].sort(key=lambda e: e["row"])
+    report["created"] = len(created)
+    report["failed"] = len(report["errors"])
+    return report
@@ -3,41 +3,73 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 from typing import List, Dict
 from fastapi import HTTPException
+import hashlib
 import json
+import os
+from urllib.parse import quote, unquote
 
 from schemas.movie import movie
 
+# each user's lists live in their own shard file: <path>/users/<2 hex chars>/<quoted username>.json
+SHARDS_DIR = "users"
+LEGACY_FILE = "movieLists.json"
+
+def shardPath(path: Path, user: str) -> Path:
+    prefix = hashlib.sha1(user.encode("utf-8")).hexdigest()[:2]
+    return path/SHARDS_DIR/prefix/(quote(user, safe="") + ".json")
+
+def readUserMovieLists(path: Path, user: str) -> Dict[str, List[str]]:
+    """Read one user's lists, touching only that user's shard"""
+    shard = shardPath(path, user)
+    if not shard.exists():
+        return {}
+    with open(shard, 'r') as jsonFile:
+        try:
+            return json.load(jsonFile)
+        except json.JSONDecodeError:
+            return {}
+
+def saveUserMovieLists(lists: Dict[str, List[str]], user: str, path: Path):
+    """Replace one user's shard atomically (temp file + rename), leaving every other user alone"""
+    shard = shardPath(path, user)
+    shard.parent.mkdir(parents= True, exist_ok= True)
+    tmpPath = shard.with_suffix(".json.tmp")
+    with open(tmpPath, 'w') as jsonFile:
+        json.dump(lists, jsonFile)
+        jsonFile.flush()
+        os.fsync(jsonFile.fileno())
+    os.replace(tmpPath, shard)
+
 def saveMovieList(list : List[movie], user: str, listName: str, path: Path):
-    data = {}
+    data = readUserMovieLists(path, user)
+    data[listName] = list
+    saveUserMovieLists(data, user, path)
+
+def migrateMovieLists(path: Path):
+    """Split a pre-sharding movieLists.json into per-user shards, then empty it"""
+    legacy = path/LEGACY_FILE
+    if not legacy.exists():
+        return
+    with open(legacy, 'r') as jsonFile:
+        try:
+            data = json.load(jsonFile)
+        except json.JSONDecodeError:
+            data = {}
+    for user, lists in data.items():
+        merged = readUserMovieLists(path, user)
+        merged.update({name: movies for name, movies in lists.items() if name not in merged})
+        saveUserMovieLists(merged, user, path)
+    if data:
+        legacy.write_text("")
+
+def readAllMovieList(path:Path, user: str = None) -> Dict[str, Dict[str, List[str]]]:
+    """All users' lists, or only the given user's (read from that user's shard alone)"""
     path.mkdir(parents= True, exist_ok= True)
-    path = path/"movieLists.json"
-
-    if path.exists():
-        with open(path,'r+') as jsonFile:
-            try:
-                data = json.load(jsonFile)
-            except json.JSONDecodeError:
-                 data = {}
-            jsonFile.close()
-    
-    if user not in data:
-        data[user] = {}
-
-    data[user][listName] = list
-
-    with open(path, 'w') as jsonFile:
-        json.dump(data,jsonFile)
-        jsonFile.close()
-
-def readAllMovieList(path:Path) -> Dict[str, Dict[str, List[str]]]:
+    if user is not None:
+        lists = readUserMovieLists(path, user)
+        return {user: lists} if lists else {}
+
     data = {}
-    path.mkdir(parents= True, exist_ok= True)
-    path = path/"movieLists.json"
-
-    if path.exists():
-        with open(path,'r+') as jsonFile:
-            try:
-                data = json.load(jsonFile)
-            except json.JSONDecodeError:
-                 data = {}
-    return data
\ No newline at end of file
+    for shard in sorted((path/SHARDS_DIR).glob("*/*.json")):
+        data[unquote(shard.stem)] = readUserMovieLists(path, unquote(shard.stem))
+    return data
@@ -9,6 +9,8 @@ from schemas.movie import movie, movieCreate, movieUpdate, movieFilter
 from schemas.movieReviews import movieReviews, movieReviewsCreate
 from repositories.itemsRepo import loadMetadata, loadReviews, saveMetadata, saveReviews
 from users import user
+from backend.services.changeFeed import changeFeed
+from backend.repositories.movieTombstones import movieReaper
 
 baseDir = Path(__file__).resolve().parents[1] / "data" # basDir is now pointing to data folder 
 
@@ -46,6 +48,7 @@ def createMovie(payload: movieCreate) -> movie:
     
     saveMetadata(payload.title, payload.dict()) #creates movie folder if it doesnt exists and metadata.json
     saveReviews(payload.title,[])#creates Moviereviews.csv
+    changeFeed.record("movie", "create", payload.title, payload.dict())
     return movie(**payload.dict(), reviews = [])
 
 def updateMovie(title: str, payload: movieUpdate) -> movie:
@@ -55,19 +58,19 @@ def updateMovie(title: str, payload: movieUpdate) -> movie:
         raise HTTPException(status_code=404, detail=f"Movie '{title}' not found")
 
     saveMetadata(title, payload.dict())
+    changeFeed.record("movie", "update", title, payload.dict())
     reviews = loadReviews(title)
     return movie(**payload.dict(), reviews=reviews)
 
 
 def deleteMovie(title: str) -> None:
-    """Delete a movie folder and all its files."""
+    """Tombstone a movie folder; the reaper removes its files in the background."""
     movieDir = baseDir / title
     if not movieDir.exists():
         raise HTTPException(status_code=404, detail=f"Movie '{title}' not found")
 
-    for file in movieDir.iterdir():
-        file.unlink()
-    movieDir.rmdir()
+    movieReaper.tombstone(str(baseDir), title)
+    changeFeed.record("movie", "delete", title)
 
 
 def addReview(title: str, payload: movieReviewsCreate) -> movieReviews:
@@ -80,6 +83,7 @@ def addReview(title: str, payload: movieReviewsCreate) -> movieReviews:
     newReview = payload.dict()
     reviews.append(newReview)
     saveReviews(title, reviews)
+    changeFeed.record("review", "create", title, newReview)
     return movieReviews(**newReview)
 
 
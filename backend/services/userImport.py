@@ -0,0 +1,149 @@
+import argparse
+import csv
+import json
+import sys
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+from backend.repositories.usersRepo import userRepo
+from backend.users.passwordHasher import passwordHasher
+from backend.users.user import User
+from backend.users.userTable import normalizeEmail
+
+IMPORT_FORMATS = ("csv", "ndjson")
+BATCH_SIZE = 500  # rows validated, then hashed together on the pool
+
+
+def readRows(stream: TextIO, fileFormat: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield (row number, fields, parse error) one row at a time, so a large file
+    is never held in memory. CSV rows are numbered after the header line,
+    NDJSON rows by line.
+    """
+    if fileFormat == "csv":
+        for rowNumber, row in enumerate(csv.DictReader(stream), start=1):
+            yield rowNumber, row, None
+    elif fileFormat == "ndjson":
+        for rowNumber, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield rowNumber, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(row, dict):
+                yield rowNumber, None, "Row must be a JSON object"
+                continue
+            yield rowNumber, row, None
+    else:
+        raise ValueError(f"Unsupported import format: {fileFormat}")
+
+
+def _validateRow(row: dict, seenUsernames: set, seenEmails: set) -> Tuple[str, str, str]:
+    """Apply the same checks as registration, plus duplicates within the file"""
+    username = str(row.get("username") or "").strip()
+    email = str(row.get("email") or "").strip()
+    password = str(row.get("password") or "")
+    if not username or not email or not password:
+        raise ValueError("username, email and password are required")
+    if not User.checkUsername(User, username):
+        raise ValueError("Invalid username: must be 3-20 characters and alphanumeric")
+    if not User.checkEmail(User, email):
+        raise ValueError("Invalid email address")
+    User.checkPasswordLength(User, password)
+    if username in seenUsernames:
+        raise ValueError("Duplicate username in import")
+    if normalizeEmail(email) in seenEmails:
+        raise ValueError("Duplicate email in import")
+    if username in User.usersDb or userRepo.exists(username):
+        raise ValueError("Username already exists")
+    if User._emailOwner(email) is not None:
+        raise ValueError("Email already registered")
+    return username, email, password
+
+
+def _commit(accepted: List[tuple], report: dict):
+    """Claim every hashed user in usersDb, then persist all of them in one journal append"""
+    created = []
+    for rowNumber, username, email, passwordHash in accepted:
+        # re-checked under the same stripes createAccount uses, in case someone registered meanwhile
+        with User._userLocks.hold(username, "email:" + normalizeEmail(email)):
+            if username in User.usersDb or User._emailOwner(email) is not None:
+                report["errors"].append({"row": rowNumber, "username": username,
+                                         "error": "Username or email registered during import"})
+                continue
+            user = User(username, email, "", save=False, passwordHash=passwordHash)
+            User.usersDb[username] = user
+        created.append(user)
+        report["users"].append({"row": rowNumber, "username": username,
+                                "verificationToken": user.verificationToken})
+
+    userRepo.addMany((user.username, user.email, user.passwordHash, user.verificationToken) for user in created)
+    userRepo.flush()
+    report["created"] = len(created)
+
+
+def importUsers(stream: TextIO, fileFormat: str, batchSize: int = BATCH_SIZE) -> dict:
+    """
+    Create accounts from a CSV or NDJSON stream with username, email and
+    password fields. Rows are validated as they are read and their passwords
+    hashed a batch at a time across the hashing pool; the accounts are then
+    saved together. Returns counts, the created users with their verification
+    tokens, and an error per rejected row.
+    """
+    report = {"total": 0, "created": 0, "failed": 0, "users": [], "errors": []}
+    seenUsernames, seenEmails = set(), set()
+    accepted, batch = [], []
+
+    def hashBatch():
+        hashes = passwordHasher.hashMany([password for _, _, _, password in batch])
+        accepted.extend((rowNumber, username, email, passwordHash)
+                        for (rowNumber, username, email, _), passwordHash in zip(batch, hashes))
+        batch.clear()
+
+    for rowNumber, row, error in readRows(stream, fileFormat):
+        report["total"] += 1
+        try:
+            if error:
+                raise ValueError(error)
+            username, email, password = _validateRow(row, seenUsernames, seenEmails)
+        except ValueError as e:
+            report["errors"].append({"row": rowNumber, "username": (row or {}).get("username"), "error": str(e)})
+            continue
+        seenUsernames.add(username)
+        seenEmails.add(normalizeEmail(email))
+        batch.append((rowNumber, username, email, password))
+        if len(batch) >= batchSize:
+            hashBatch()
+    if batch:
+        hashBatch()
+
+    _commit(accepted, report)
+    report["errors"].sort(key=lambda e: e["row"])
+    report["failed"] = len(report["errors"])
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-create user accounts from a CSV or NDJSON file")
+    parser.add_argument("path", help="file with username, email and password columns/fields")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, dest="fileFormat",
+                        help="defaults to ndjson for .ndjson/.jsonl files, csv otherwise")
+    args = parser.parse_args(argv)
+    fileFormat = args.fileFormat or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    User.loadStoredUsers()
+    try:
+        with open(args.path, "r", newline="", encoding="utf-8") as stream:
+            report = importUsers(stream, fileFormat)
+    finally:
+        userRepo.close()
+        passwordHasher.shutdown()
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if report["failed"] else 0
+
+
+# python -m backend.services.userImport partnerUsers.csv
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import bcrypt
+
+try:
+    import fcntl
+except ImportError:  # Windows: calibrations are only serialized within one process
+    fcntl = None
+
+DEFAULT_ROUNDS = 12  # bcrypt.gensalt() default, used until calibrate() runs
+
+
+class HasherBusyError(RuntimeError):
+    """Raised when too many hashing jobs are already queued to accept another."""
+
+
+class PasswordHasher:
+    """
+    Password hashing service that keeps bcrypt off the API workers.
+
+    Jobs run on a process pool (or a thread pool when useProcesses is False),
+    so registration storms burn CPU in separate processes instead of starving
+    request threads. At most maxPending jobs may be queued or running: sync
+    callers wait up to acquireTimeout seconds for a slot, async callers are
+    rejected straight away, and both get HasherBusyError when the queue is
+    full. Per-operation latency (queue wait included) is kept in metrics.
+
+    New hashes use self.rounds as the bcrypt cost. calibrate() picks the
+    largest cost that still fits a latency budget on this machine, and
+    needsRehash() tells login when a stored hash is cheaper than that.
+    """
+
+    def __init__(self, workers: Optional[int] = None, maxPending: Optional[int] = None,
+                 acquireTimeout: float = 5.0, useProcesses: bool = True):
+        self.workers = workers or os.cpu_count() or 1
+        self.maxPending = maxPending or self.workers * 4
+        self.acquireTimeout = acquireTimeout
+        self.useProcesses = useProcesses
+        self.rounds = DEFAULT_ROUNDS
+        self.pending = 0
+        self.metrics: Dict[str, Dict[str, float]] = {
+            op: {"count": 0, "errors": 0, "rejected": 0, "totalSeconds": 0.0, "maxSeconds": 0.0}
+            for op in ("hash", "verify")
+        }
+        self._slots = threading.BoundedSemaphore(self.maxPending)
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        # created on first use so importing the module never spawns processes
+        with self._lock:
+            if self._executor is None:
+                if self.useProcesses:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+            return self._executor
+
+    def _acquire(self, op: str, blocking: bool):
+        acquired = self._slots.acquire(timeout=self.acquireTimeout) if blocking else self._slots.acquire(blocking=False)
+        with self._lock:
+            if not acquired:
+                self.metrics[op]["rejected"] += 1
+                raise HasherBusyError("Password hashing is busy, try again shortly")
+            self.pending += 1
+
+    def _release(self, op: str, started: float, failed: bool):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.pending -= 1
+            stats = self.metrics[op]
+            stats["count"] += 1
+            stats["errors"] += int(failed)
+            stats["totalSeconds"] += elapsed
+            stats["maxSeconds"] = max(stats["maxSeconds"], elapsed)
+        self._slots.release()
+
+    def _run(self, op: str, fn, *args):
+        self._acquire(op, blocking=True)
+        started, failed = time.perf_counter(), True
+        try:
+            result = self.executor.submit(fn, *args).result()
+            failed = False
+            return result
+        finally:
+            self._release(op, started, failed)
+
+    async def _runAsync(self, op: str, fn, *args):
+        self._acquire(op, blocking=False)
+        started, failed = time.perf_counter(), True
+        try:
+            result = await asyncio.wrap_future(self.executor.submit(fn, *args))
+            failed = False
+            return result
+        finally:
+            self._release(op, started, failed)
+
+    def hash(self, password: str) -> bytes:
+        return self._run("hash", _hashPassword, password, self.rounds)
+
+    def verify(self, password: str, passwordHash: bytes) -> bool:
+        return self._run("verify", _checkPassword, password, passwordHash)
+
+    async def hashAsync(self, password: str) -> bytes:
+        return await self._runAsync("hash", _hashPassword, password, self.rounds)
+
+    async def verifyAsync(self, password: str, passwordHash: bytes) -> bool:
+        return await self._runAsync("verify", _checkPassword, password, passwordHash)
+
+    def hashMany(self, passwords: List[str]) -> List[bytes]:
+        """
+        Hash a batch for bulk imports, in order. Each password takes a queue
+        slot like any other hash, but the batch holds at most half of them at
+        once, so logins and signups keep the rest while an import runs. The
+        batch waits for slots rather than failing with HasherBusyError.
+        """
+        limit = max(1, self.maxPending // 2)
+        share = threading.BoundedSemaphore(limit)
+        futures = []
+        for password in passwords:
+            share.acquire()
+            self._slots.acquire()
+            with self._lock:
+                self.pending += 1
+            started = time.perf_counter()
+            try:
+                future = self.executor.submit(_hashPassword, password, self.rounds)
+            except BaseException:
+                self._release("hash", started, True)
+                share.release()
+                raise
+            future.add_done_callback(lambda done, started=started: self._finishBulk(done, started, share))
+            futures.append(future)
+        hashes = [future.result() for future in futures]
+        for _ in range(limit):
+            share.acquire()  # every job's slot has been handed back
+        return hashes
+
+    def _finishBulk(self, future, started: float, share: threading.BoundedSemaphore):
+        self._release("hash", started, future.cancelled() or future.exception() is not None)
+        share.release()
+
+    def calibrate(self, budgetMs: float, minRounds: int = 10, maxRounds: int = 16, probeRounds: int = 6,
+                  cachePath: Optional[Path] = None) -> int:
+        """
+        Pick the highest bcrypt cost whose hash time fits budgetMs on this machine.
+        Each extra round doubles the work, so one cheap probe (timed in a pool
+        worker, best of three) is enough to extrapolate every cost.
+
+        With cachePath, the first worker to calibrate stores its pick there and
+        every other worker (and later restarts) reuses it, so they all hash at
+        the same cost instead of each trusting its own noisy probe. Delete the
+        file to calibrate again.
+        """
+        settings = {"budgetMs": budgetMs, "minRounds": minRounds, "maxRounds": maxRounds}
+        if cachePath is None:
+            self.rounds = self._probeRounds(budgetMs, minRounds, maxRounds, probeRounds)
+            print(f"bcrypt cost calibrated to {self.rounds} for a {budgetMs} ms budget")
+            return self.rounds
+
+        cachePath = Path(cachePath)
+        cachePath.parent.mkdir(parents=True, exist_ok=True)
+        with open(cachePath, "a+") as cacheFile:
+            if fcntl is not None:
+                fcntl.flock(cacheFile.fileno(), fcntl.LOCK_EX)  # the other workers wait for the first probe
+            try:
+                cacheFile.seek(0)
+                try:
+                    cached = json.loads(cacheFile.read() or "{}")
+                except json.JSONDecodeError:
+                    cached = {}
+                if {key: cached.get(key) for key in settings} == settings and isinstance(cached.get("rounds"), int):
+                    self.rounds = cached["rounds"]
+                    return self.rounds
+                self.rounds = self._probeRounds(budgetMs, minRounds, maxRounds, probeRounds)
+                cacheFile.seek(0)
+                cacheFile.truncate()
+                json.dump({**settings, "rounds": self.rounds}, cacheFile)
+                cacheFile.flush()
+                os.fsync(cacheFile.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(cacheFile.fileno(), fcntl.LOCK_UN)
+        print(f"bcrypt cost calibrated to {self.rounds} for a {budgetMs} ms budget")
+        return self.rounds
+
+    def _probeRounds(self, budgetMs: float, minRounds: int, maxRounds: int, probeRounds: int) -> int:
+        probeSeconds = min(self.executor.submit(_timeHash, probeRounds).result() for _ in range(3))
+        rounds = minRounds
+        while rounds < maxRounds and probeSeconds * 2 ** (rounds + 1 - probeRounds) * 1000 <= budgetMs:
+            rounds += 1
+        return rounds
+
+    def needsRehash(self, passwordHash: bytes) -> bool:
+        """
+        True if the stored hash is cheaper than the current target. Hashes at a
+        higher cost are left alone, so a lowered target never rewrites hashes
+        back and forth.
+        """
+        return hashRounds(passwordHash) < self.rounds
+
+    def stats(self) -> dict:
+        with self._lock:
+            operations = {}
+            for op, stats in self.metrics.items():
+                operations[op] = {
+                    **stats,
+                    "avgMs": round(stats["totalSeconds"] / stats["count"] * 1000, 2) if stats["count"] else 0.0,
+                    "maxMs": round(stats["maxSeconds"] * 1000, 2),
+                }
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "useProcesses": self.useProcesses,
+                "pending": self.pending,
+                "maxPending": self.maxPending,
+                "operations": operations,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+def hashRounds(passwordHash: bytes) -> int:
+    """Cost factor of a bcrypt hash ($2b$<cost>$...)"""
+    return int(passwordHash.split(b"$")[2])
+
+
+# module-level functions so they can be pickled into the worker processes
+def _hashPassword(password: str, rounds: int = DEFAULT_ROUNDS) -> bytes:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds))
+
+
+def _timeHash(rounds: int) -> float:
+    started = time.perf_counter()
+    bcrypt.hashpw(b"calibration-probe", bcrypt.gensalt(rounds))
+    return time.perf_counter() - started
+
+
+def _checkPassword(password: str, passwordHash: bytes) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), passwordHash)
+
+
+# latency budget per hash used by the startup calibration
+HASH_BUDGET_MS = float(os.environ.get("HASH_BUDGET_MS", "250"))
+# fixed bcrypt cost for every worker; skips calibration when set
+HASH_ROUNDS = int(os.environ.get("HASH_ROUNDS", "0")) or None
+# where the first worker's calibration is kept for the others
+HASH_CALIBRATION_PATH = Path("backend/data/Users/hashCalibration.json")
+
+# shared by every User; pool size and queue depth can be set per deployment
+passwordHasher = PasswordHasher(
+    workers=int(os.environ.get("HASH_WORKERS", "0")) or None,
+    maxPending=int(os.environ.get("HASH_MAX_PENDING", "0")) or None,
+)
@@ -0,0 +1,199 @@
+import heapq
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PENALTY_DATA_PATH = Path("backend/data/Users/penalties.ndjson")
+
+
+class PenaltyLedger:
+    """
+    Every active penalty, keyed by a monotonically increasing sequence id.
+
+    Each penalised user carries a running activePenaltyPoints total that the
+    ledger adds to when a penalty is issued and subtracts from when it lapses.
+    Lapsing is driven by a min-heap of (expiresAt, seq): expireDue() pops only
+    the entries that are due, so a login-time check is O(1) amortized. A
+    penalty whose expiresAt is changed is pushed again and its old heap entry
+    is skipped when popped.
+
+    Issue times come from issueTime(), which never hands out the same
+    timestamp twice, so callers need not sleep to keep them distinct.
+
+    Changes are persisted write-behind: flush() appends queued records to an
+    NDJSON file and compact() rewrites it with only the active penalties. The
+    writer thread compacts once the file holds more than compactRatio records
+    per active penalty (and at least compactMin), so lapsed and superseded
+    records don't pile up between restarts.
+    """
+
+    def __init__(self, path: Path = PENALTY_DATA_PATH, compactRatio: int = 4, compactMin: int = 1000):
+        self.path = Path(path)
+        self.compactRatio = compactRatio
+        self.compactMin = compactMin
+        self.fileLength = 0  # records in the file, as of the last read, flush or compact
+        self.lastSeq = 0
+        self.lastIssued: Optional[datetime] = None
+        self.active: Dict[int, object] = {}
+        self.pending: List[dict] = []
+        self._heap: List[Tuple[datetime, int]] = []
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+    @contextmanager
+    def batch(self):
+        """Hold the ledger across a group of penalties; the calls inside re-enter the lock."""
+        with self._lock:
+            yield self
+
+    def issueTime(self) -> datetime:
+        """Current time, nudged forward a microsecond if it would repeat the previous issue time."""
+        with self._lock:
+            now = datetime.now()
+            if self.lastIssued is not None and now <= self.lastIssued:
+                now = self.lastIssued + timedelta(microseconds=1)
+            self.lastIssued = now
+            return now
+
+    @staticmethod
+    def _record(penalty) -> dict:
+        return {
+            "seq": penalty.seq,
+            "username": penalty.user.username,
+            "points": penalty.points,
+            "reason": penalty.reason,
+            "dateIssued": penalty.dateIssued.isoformat(),
+            "expiresAt": penalty.expiresAt.isoformat(),
+        }
+
+    def _activate(self, penalty):
+        self.active[penalty.seq] = penalty
+        penalty.user.activePenaltyPoints += penalty.points
+        heapq.heappush(self._heap, (penalty.expiresAt, penalty.seq))
+
+    def addMany(self, penalties: Iterable, persist: bool = True) -> List[int]:
+        """Give each penalty the next sequence id, count it towards its user and queue it for saving."""
+        seqs = []
+        with self._lock:
+            for penalty in penalties:
+                if penalty.seq is None:
+                    self.lastSeq += 1
+                    penalty.seq = self.lastSeq
+                else:
+                    self.lastSeq = max(self.lastSeq, penalty.seq)
+                self._activate(penalty)
+                if persist:
+                    self.pending.append(self._record(penalty))
+                seqs.append(penalty.seq)
+        return seqs
+
+    def add(self, penalty, persist: bool = True) -> int:
+        return self.addMany([penalty], persist)[0]
+
+    def reschedule(self, penalty):
+        """Called when a penalty's expiresAt changes."""
+        with self._lock:
+            if penalty.seq in self.active:
+                heapq.heappush(self._heap, (penalty.expiresAt, penalty.seq))
+            elif penalty.expiresAt >= datetime.now():
+                self._activate(penalty)  # an already lapsed penalty was extended
+            self.pending.append(self._record(penalty))
+
+    def expireDue(self, now: Optional[datetime] = None) -> int:
+        """Subtract every penalty that has lapsed by now from its user's total."""
+        now = now or datetime.now()
+        if not self._heap or self._heap[0][0] >= now:
+            return 0
+        expired = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] < now:
+                expiresAt, seq = heapq.heappop(self._heap)
+                penalty = self.active.get(seq)
+                if penalty is None or penalty.expiresAt != expiresAt:
+                    continue  # stale entry from a rescheduled or already lapsed penalty
+                del self.active[seq]
+                penalty.user.activePenaltyPoints -= penalty.points
+                expired += 1
+        return expired
+
+    def readActive(self) -> List[dict]:
+        """Unexpired records from the file (latest version of each), oldest first."""
+        records: Dict[int, dict] = {}
+        self.fileLength = 0
+        if self.path.exists():
+            with open(self.path, "r") as ledgerFile:
+                for line in ledgerFile:
+                    if not line.strip():
+                        continue
+                    self.fileLength += 1
+                    record = json.loads(line)
+                    if "seq" in record:
+                        records[record["seq"]] = record
+                        self.lastSeq = max(self.lastSeq, record["seq"])
+                    else:
+                        self.lastSeq = max(self.lastSeq, record.get("lastSeq", 0))
+        now = datetime.now()
+        return [records[seq] for seq in sorted(records)
+                if datetime.fromisoformat(records[seq]["expiresAt"]) > now]
+
+    def flush(self):
+        """Append queued records to the ledger file in one write."""
+        with self._lock:
+            if not self.pending:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as ledgerFile:
+                ledgerFile.write("".join(json.dumps(record) + "\n" for record in self.pending))
+                ledgerFile.flush()
+                os.fsync(ledgerFile.fileno())
+            self.fileLength += len(self.pending)
+            self.pending = []
+
+    def compactDue(self) -> bool:
+        with self._lock:
+            return self.fileLength > max(self.compactMin, self.compactRatio * len(self.active))
+
+    def compact(self):
+        """Rewrite the file with just the active penalties and the sequence high-water mark."""
+        with self._lock:
+            self.expireDue()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmpPath = self.path.with_suffix(".tmp")
+            with open(tmpPath, "w") as ledgerFile:
+                ledgerFile.write(json.dumps({"lastSeq": self.lastSeq}) + "\n")
+                for seq in sorted(self.active):
+                    ledgerFile.write(json.dumps(self._record(self.active[seq])) + "\n")
+                ledgerFile.flush()
+                os.fsync(ledgerFile.fileno())
+            os.replace(tmpPath, self.path)
+            self.fileLength = 1 + len(self.active)
+            self.pending = []
+
+    def startWriter(self, interval: float = 1.0):
+        """Flush queued penalties from a background thread every interval seconds, compacting when due."""
+        def run():
+            while not self._stopped.wait(interval):
+                self.flush()
+                if self.compactDue():
+                    self.compact()
+
+        self._stopped.clear()
+        self._writer = threading.Thread(target=run, name="penalty-writer", daemon=True)
+        self._writer.start()
+
+    def close(self):
+        self._stopped.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self.flush()
+        self.compact()
+
+
+# shared by PenaltyPoints and the login check
+penaltyLedger = PenaltyLedger()
@@ -1,26 +1,59 @@
 import datetime
-import time
+from typing import Optional
 from backend.users.user import User
+from backend.users.penaltyLedger import penaltyLedger
+
+DEFAULT_TTL = datetime.timedelta(days=7)  # penalties last 7 days unless told otherwise
 
 class PenaltyPoints:
-    #class variables: 
-    # points (int), user (user), reason (string), dateIssued (date)    
-    def __init__(self, points: int, user: User, reason: str):
+    #class variables:
+    # points (int), user (user), reason (string), dateIssued (date), seq (ledger sequence id)
+    def __init__(self, points: int, user: User, reason: str, ttl: Optional[datetime.timedelta] = None,
+                 register: bool = True):
         self.points = points
         self.user = user
         self.reason = reason
-        self.dateIssued = datetime.datetime.now()
-        time.sleep(0.001)  # 1 millisecond delay to prevent identical timestamps
-        
-        # adding a timeout to the penalties (lasts 7 days default)
-        self.expiresAt = self.dateIssued + datetime.timedelta(days=7)
-        
+        self.seq = None
+        # the ledger never hands out the same issue time twice
+        self.dateIssued = penaltyLedger.issueTime()
+
+        # adding a timeout to the penalties
+        self._expiresAt = self.dateIssued + (ttl or DEFAULT_TTL)
+
         # Automatically add this penalty to the user's list
         user.penaltyPointsList.append(self)
+        if register:
+            penaltyLedger.add(self)
+
+    @property
+    def expiresAt(self) -> datetime.datetime:
+        return self._expiresAt
+
+    @expiresAt.setter
+    def expiresAt(self, value: datetime.datetime):
+        self._expiresAt = value
+        if self.seq is not None:
+            penaltyLedger.reschedule(self)
 
     def isExpired(self) -> bool:
         return datetime.datetime.now() > self.expiresAt
 
+    @classmethod
+    def restoreAll(cls, usersDb: dict) -> int:
+        """Re-attach the persisted, still active penalties to their users at startup"""
+        restored = []
+        for record in penaltyLedger.readActive():
+            user = usersDb.get(record["username"])
+            if user is None:
+                continue
+            penalty = cls(record["points"], user, record["reason"], register=False)
+            penalty.seq = record["seq"]
+            penalty.dateIssued = datetime.datetime.fromisoformat(record["dateIssued"])
+            penalty._expiresAt = datetime.datetime.fromisoformat(record["expiresAt"])
+            restored.append(penalty)
+        penaltyLedger.addMany(restored, persist=False)
+        return len(restored)
+
     def __repr__(self):
         return (
             f"<PenaltyPoints user={self.user.username}, "
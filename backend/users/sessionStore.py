@@ -0,0 +1,457 @@
+import hashlib
+import heapq
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.users.stripedLock import StripedLock
+
+try:
+    import fcntl
+except ImportError:  # Windows: the shared file is only locked within one process
+    fcntl = None
+
+
+class SqliteSessionBackend:
+    """
+    Sessions kept in a SQLite database in WAL mode, so every uvicorn worker
+    pointed at the same file sees the same logins and they survive restarts.
+    Triggers keep the number of stored sessions in a one-row table, so
+    count() is a single-row read.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA recursive_triggers=ON")  # INSERT OR REPLACE fires the delete trigger too
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "token TEXT PRIMARY KEY, username TEXT NOT NULL, loginTime REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessionsByLoginTime ON sessions(loginTime)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sessionCount (n INTEGER NOT NULL)")
+        self._conn.execute("INSERT INTO sessionCount SELECT COUNT(*) FROM sessions "
+                           "WHERE NOT EXISTS (SELECT 1 FROM sessionCount)")
+        self._conn.execute("CREATE TRIGGER IF NOT EXISTS sessionAdded AFTER INSERT ON sessions "
+                           "BEGIN UPDATE sessionCount SET n = n + 1; END")
+        self._conn.execute("CREATE TRIGGER IF NOT EXISTS sessionRemoved AFTER DELETE ON sessions "
+                           "BEGIN UPDATE sessionCount SET n = n - 1; END")
+        self._conn.execute("COMMIT")
+
+    def get(self, token: str) -> Optional[Tuple[str, datetime]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT username, loginTime FROM sessions WHERE token = ?", (token,)).fetchone()
+        return (row[0], datetime.fromtimestamp(row[1])) if row else None
+
+    def put(self, token: str, username: str, loginTime: datetime):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                               (token, username, loginTime.timestamp()))
+
+    def delete(self, token: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def evictExpired(self, cutoff: datetime) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE loginTime < ?", (cutoff.timestamp(),)).rowcount
+
+    def count(self) -> int:
+        """Stored sessions across every worker; expired ones drop out at the next sweep."""
+        with self._lock:
+            return self._conn.execute("SELECT n FROM sessionCount").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SharedFileSessionBackend:
+    """
+    Fixed-size open-addressing hash table in a memory-mapped file shared by
+    every worker on the host.
+
+    Each slot holds a state byte, a 16-byte BLAKE2 digest of the token, the
+    username and the login time. Slots are probed linearly from the digest
+    and an flock on the file serializes writers across processes.
+
+    A header in front of the slots holds a format marker and the number of
+    used slots, kept by put(), delete() and evictExpired(), so count() reads
+    one field instead of walking the table.
+
+    Removal uses backward-shift deletion: later entries of the same probe run
+    that could have lived in the freed slot are moved back into it, so no
+    tombstones build up and a miss stops at the first empty slot however
+    much login/logout churn the table has seen. (DELETED slots left by older
+    versions are skipped by lookups and reused by inserts.)
+    """
+
+    HEADER = struct.Struct("<8sq")  # format marker, used slot count
+    MAGIC = b"SESSHM02"
+    SLOT = struct.Struct("<B16s32sd")
+    EMPTY, USED, DELETED = 0, 1, 2
+
+    def __init__(self, path, capacity: int = 65536):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity
+        size = self.HEADER.size + capacity * self.SLOT.size
+        self._file = open(self.path, "a+b")
+        self._lock = threading.Lock()
+        with self._locked(exclusive=True):
+            if os.path.getsize(self.path) < size:
+                self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), size)
+            if self._map[:len(self.MAGIC)] != self.MAGIC:
+                # new file, or one laid out by an older version: start empty
+                self._map[:] = bytes(size)
+                self.HEADER.pack_into(self._map, 0, self.MAGIC, 0)
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+    def _offset(self, index: int) -> int:
+        return self.HEADER.size + index * self.SLOT.size
+
+    def _slot(self, index: int):
+        return self.SLOT.unpack_from(self._map, self._offset(index))
+
+    def _write(self, index: int, state: int, key: bytes = b"", username: str = "", loginTime: float = 0.0):
+        self.SLOT.pack_into(self._map, self._offset(index), state, key, username.encode("utf-8"), loginTime)
+
+    def _used(self) -> int:
+        return self.HEADER.unpack_from(self._map, 0)[1]
+
+    def _addUsed(self, delta: int):
+        self.HEADER.pack_into(self._map, 0, self.MAGIC, self._used() + delta)
+
+    def _home(self, key: bytes) -> int:
+        return int.from_bytes(key[:8], "little") % self.capacity
+
+    def _probe(self, key: bytes):
+        """Yield slot indexes in probe order for key."""
+        start = self._home(key)
+        for i in range(self.capacity):
+            yield (start + i) % self.capacity
+
+    def _remove(self, index: int):
+        """Empty a slot, shifting back later entries of its probe run; the caller holds the exclusive lock."""
+        hole = index
+        following = (index + 1) % self.capacity
+        while following != index:
+            state, key, username, loginTime = self._slot(following)
+            if state == self.EMPTY:
+                break
+            if state == self.USED:
+                home = self._home(key)
+                # the entry may move into the hole unless its home lies cyclically in (hole, following]
+                if (following - home) % self.capacity >= (following - hole) % self.capacity:
+                    self.SLOT.pack_into(self._map, self._offset(hole), state, key, username, loginTime)
+                    hole = following
+            following = (following + 1) % self.capacity
+        self._write(hole, self.EMPTY)
+        self._addUsed(-1)
+
+    def _find(self, key: bytes) -> Optional[int]:
+        for index in self._probe(key):
+            state, slotKey, _, _ = self._slot(index)
+            if state == self.EMPTY:
+                return None
+            if state == self.USED and slotKey == key:
+                return index
+        return None
+
+    def get(self, token: str) -> Optional[Tuple[str, datetime]]:
+        key = self._key(token)
+        with self._locked(exclusive=False):
+            index = self._find(key)
+            if index is None:
+                return None
+            _, _, username, loginTime = self._slot(index)
+        return username.rstrip(b"\0").decode("utf-8"), datetime.fromtimestamp(loginTime)
+
+    def put(self, token: str, username: str, loginTime: datetime):
+        key = self._key(token)
+        with self._locked(exclusive=True):
+            target = self._find(key)
+            if target is None:
+                for index in self._probe(key):
+                    if self._slot(index)[0] != self.USED:
+                        target = index
+                        break
+                else:
+                    raise RuntimeError("Shared session table is full")
+                self._addUsed(1)
+            self._write(target, self.USED, key, username, loginTime.timestamp())
+
+    def delete(self, token: str):
+        key = self._key(token)
+        with self._locked(exclusive=True):
+            index = self._find(key)
+            if index is not None:
+                self._remove(index)
+
+    def evictExpired(self, cutoff: datetime) -> int:
+        """Full pass over the table; meant for the background sweeper only."""
+        evicted = 0
+        with self._locked(exclusive=True):
+            index = 0
+            while index < self.capacity:
+                state, _, _, loginTime = self._slot(index)
+                if state == self.USED and loginTime < cutoff.timestamp():
+                    self._remove(index)
+                    evicted += 1
+                    continue  # an entry may have shifted into this slot
+                index += 1
+        return evicted
+
+    def count(self) -> int:
+        """Stored sessions across every worker; expired ones drop out at the next sweep."""
+        with self._locked(exclusive=False):
+            return self._used()
+
+    def clear(self):
+        with self._locked(exclusive=True):
+            self._map[:] = bytes(len(self._map))
+            self.HEADER.pack_into(self._map, 0, self.MAGIC, 0)
+
+    def close(self):
+        with self._lock:
+            self._map.close()
+            self._file.close()
+
+
+def sessionBackendFromEnv():
+    """
+    SESSION_BACKEND=sqlite|shm shares sessions between workers (SESSION_DB /
+    SESSION_SHM pick the file); the default keeps them in this process only.
+    """
+    kind = os.environ.get("SESSION_BACKEND", "memory")
+    if kind == "sqlite":
+        return SqliteSessionBackend(os.environ.get("SESSION_DB", "backend/data/sessions.db"))
+    if kind == "shm":
+        return SharedFileSessionBackend(os.environ.get("SESSION_SHM", "backend/data/sessions.shm"))
+    return None
+
+
+class SessionTable(OrderedDict):
+    """
+    token -> (user, loginTime) table used as User.activeSessions.
+
+    A min-heap of (loginTime, token) lets evictExpired() pop only the sessions
+    that are actually due instead of scanning the whole table. A token is
+    pushed when it is cached or its login time changes, and heap entries are
+    not removed on logout or eviction; a popped entry is ignored if the token
+    is gone or now carries a different login time. Once such stale entries
+    outnumber the live sessions two to one the heap is rebuilt from the table.
+
+    With maxSessions set, the table also behaves as an LRU: touch() marks a
+    session as used, and adding one past the cap evicts the least recently
+    used session.
+
+    Given a shared backend, the table becomes this worker's read-through cache
+    of it: writes and deletes go through to the backend, lookup() loads tokens
+    issued by other workers, and cached entries are re-checked after
+    cacheSeconds so a logout elsewhere is noticed. LRU eviction then only
+    drops the cached copy.
+    """
+
+    def __init__(self, maxSessions: Optional[int] = None, backend=None, cacheSeconds: float = 5.0):
+        super().__init__()
+        self.maxSessions = maxSessions
+        self.backend = backend
+        self.cacheSeconds = cacheSeconds
+        self._heap: List[Tuple[datetime, str]] = []
+        self._fetched: Dict[str, float] = {}
+
+    def _cache(self, token: str, session: tuple):
+        previous = self.get(token)
+        super().__setitem__(token, session)
+        self.move_to_end(token)
+        if previous is None or previous[1] != session[1]:
+            heapq.heappush(self._heap, (session[1], token))
+        self._fetched[token] = time.monotonic()
+        if self.maxSessions is not None and len(self) > self.maxSessions:
+            self._uncache(next(iter(self)))
+        self._compactHeap()
+
+    def _uncache(self, token: str):
+        super().__delitem__(token)
+        self._fetched.pop(token, None)
+        self._compactHeap()
+
+    def _compactHeap(self):
+        """Rebuild the heap from the live sessions once stale entries exceed twice their number."""
+        if len(self._heap) - len(self) > 2 * len(self):
+            self._heap = [(session[1], token) for token, session in self.items()]
+            heapq.heapify(self._heap)
+
+    def __setitem__(self, token: str, session: tuple):
+        self._cache(token, session)
+        if self.backend is not None:
+            self.backend.put(token, session[0].username, session[1])
+
+    def __delitem__(self, token: str):
+        self._uncache(token)
+        if self.backend is not None:
+            self.backend.delete(token)
+
+    def clear(self):
+        super().clear()
+        self._heap.clear()
+        self._fetched.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def touch(self, token: str):
+        """Mark a session as most recently used."""
+        self.move_to_end(token)
+
+    def lookup(self, token: str, resolveUser: Callable[[str], object]) -> Optional[tuple]:
+        """(user, loginTime) for token, asking the backend on a cache miss or stale entry."""
+        session = self.get(token)
+        if self.backend is None:
+            return session
+        if session is not None and time.monotonic() - self._fetched.get(token, 0.0) < self.cacheSeconds:
+            return session
+
+        stored = self.backend.get(token)
+        user = resolveUser(stored[0]) if stored else None
+        if user is None:
+            if session is not None:
+                self._uncache(token)
+            return None
+        self._cache(token, (user, stored[1]))
+        return user, stored[1]
+
+    def evictExpired(self, now: datetime, timeout: timedelta) -> int:
+        """Drop sessions older than timeout; cost is O(log n) per due heap entry."""
+        evicted = 0
+        while self._heap and now - self._heap[0][0] > timeout:
+            loginTime, token = heapq.heappop(self._heap)
+            session = self.get(token)
+            if session is not None and session[1] == loginTime:
+                del self[token]
+                evicted += 1
+        return evicted
+
+    def purgeStored(self, cutoff: datetime) -> int:
+        """Expire sessions in the shared backend, including ones this worker never cached."""
+        return self.backend.evictExpired(cutoff) if self.backend is not None else 0
+
+
+class StripedSessionTable(MutableMapping):
+    """
+    SessionTable split into N shards by token hash, each guarded by its own
+    stripe of a StripedLock, so logins, logouts and lookups for different
+    tokens do not queue behind one another. Callers hold locked(token) around
+    compound operations; evictExpired() takes each stripe in turn.
+
+    maxSessions is divided evenly between the shards, so LRU eviction is
+    per shard rather than exact across the whole table.
+    """
+
+    def __init__(self, stripes: int = 16, maxSessions: Optional[int] = None, backend=None,
+                 cacheSeconds: float = 5.0):
+        perShard = -(-maxSessions // stripes) if maxSessions else None
+        self.backend = backend
+        self.locks = StripedLock(stripes)
+        self.shards = [SessionTable(perShard, backend, cacheSeconds) for _ in range(stripes)]
+
+    def shardFor(self, token: str) -> SessionTable:
+        return self.shards[self.locks.stripeOf(token)]
+
+    def locked(self, token: str):
+        return self.locks.hold(token)
+
+    def __getitem__(self, token: str) -> tuple:
+        return self.shardFor(token)[token]
+
+    def __setitem__(self, token: str, session: tuple):
+        self.shardFor(token)[token] = session
+
+    def __delitem__(self, token: str):
+        del self.shardFor(token)[token]
+
+    def __contains__(self, token) -> bool:
+        return token in self.shardFor(token)
+
+    def __iter__(self):
+        for shard in self.shards:
+            yield from list(shard)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    def clear(self):
+        for shard in self.shards:
+            shard.clear()
+
+    def touch(self, token: str):
+        self.shardFor(token).touch(token)
+
+    def lookup(self, token: str, resolveUser: Callable[[str], object]) -> Optional[tuple]:
+        return self.shardFor(token).lookup(token, resolveUser)
+
+    def evictExpired(self, now: datetime, timeout: timedelta) -> int:
+        evicted = 0
+        for stripe, shard in enumerate(self.shards):
+            with self.locks.holdStripes([stripe]):
+                evicted += shard.evictExpired(now, timeout)
+        return evicted
+
+    def purgeStored(self, cutoff: datetime) -> int:
+        return self.backend.evictExpired(cutoff) if self.backend is not None else 0
+
+    def countActive(self) -> int:
+        """Stored sessions: the shared backend's counter, or the size of this worker's table without one."""
+        if self.backend is not None:
+            return self.backend.count()
+        return len(self)
+
+
+class SessionSweeper(threading.Thread):
+    """Background thread that calls sweep() every interval seconds until stopped."""
+
+    def __init__(self, sweep: Callable[[], None], interval: float = 60.0):
+        super().__init__(name="session-sweeper", daemon=True)
+        self.sweep = sweep
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.sweep()
+
+    def stop(self):
+        self._stopped.set()
@@ -0,0 +1,104 @@
+import base64
+import hashlib
+import hmac
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+class TokenSigner:
+    """
+    Issues and checks stateless session tokens of the form
+
+        <keyId>.<username>.<issuedAt>.<expiresAt>.<signature>
+
+    where the signature is an HMAC-SHA256 over everything before it, keyed by
+    the secret registered under keyId. Validation is pure computation on the
+    token plus a membership test in the revocation map, so it needs no lock.
+
+    rotate() makes a new key the signing key while older keys keep verifying
+    until retire() drops them. Revoked tokens are remembered by a 16-byte
+    signature prefix until they would have expired anyway.
+    """
+
+    def __init__(self, keys: Dict[str, bytes], activeKeyId: str):
+        if activeKeyId not in keys:
+            raise ValueError(f"Unknown signing key id: {activeKeyId}")
+        self.keys = dict(keys)
+        self.activeKeyId = activeKeyId
+        self.revoked: Dict[bytes, float] = {}  # signature prefix -> expiresAt
+
+    def _sign(self, keyId: str, payload: str) -> str:
+        return _b64(hmac.new(self.keys[keyId], payload.encode("utf-8"), hashlib.sha256).digest())
+
+    @staticmethod
+    def looksSigned(token: str) -> bool:
+        """Signed tokens have five dot-separated parts; uuid session tokens have none."""
+        return token.count(".") == 4
+
+    def issue(self, username: str, issuedAt: float, expiresAt: float) -> str:
+        payload = f"{self.activeKeyId}.{username}.{int(issuedAt)}.{int(expiresAt)}"
+        return f"{payload}.{self._sign(self.activeKeyId, payload)}"
+
+    def verify(self, token: str, now: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """(username, issuedAt) if the token is authentic, unexpired and not revoked, else None."""
+        try:
+            payload, signature = token.rsplit(".", 1)
+            keyId, username, issuedAt, expiresAt = payload.split(".")
+            issuedAt, expiresAt = float(issuedAt), float(expiresAt)
+            signature = signature.encode("ascii")  # a non-ASCII signature raises UnicodeEncodeError, a ValueError
+        except ValueError:
+            return None
+        if keyId not in self.keys or not hmac.compare_digest(signature, self._sign(keyId, payload).encode("ascii")):
+            return None
+        if (time.time() if now is None else now) >= expiresAt:
+            return None
+        if signature[:16] in self.revoked:
+            return None
+        return username, issuedAt
+
+    def revoke(self, token: str) -> bool:
+        """Reject token from now on; returns False if it was not valid to begin with."""
+        if self.verify(token) is None:
+            return False
+        signature = token.rsplit(".", 1)[1]
+        self.revoked[signature.encode("ascii")[:16]] = float(token.split(".")[3])
+        return True
+
+    def pruneRevocations(self, now: Optional[float] = None) -> int:
+        """Forget revocations of tokens that have expired on their own."""
+        now = time.time() if now is None else now
+        kept = {prefix: expiresAt for prefix, expiresAt in self.revoked.items() if expiresAt > now}
+        pruned = len(self.revoked) - len(kept)
+        self.revoked = kept  # swapped in whole so concurrent verify() calls never see a half-pruned map
+        return pruned
+
+    def rotate(self, keyId: str, secret: bytes):
+        """Start signing with a new key; tokens signed with older keys stay valid."""
+        self.keys = {**self.keys, keyId: secret}
+        self.activeKeyId = keyId
+
+    def retire(self, keyId: str):
+        """Stop accepting tokens signed with keyId."""
+        if keyId == self.activeKeyId:
+            raise ValueError("Cannot retire the active signing key")
+        self.keys = {k: v for k, v in self.keys.items() if k != keyId}
+
+
+def tokenSignerFromEnv() -> Optional[TokenSigner]:
+    """
+    SESSION_SIGNING_KEYS="kid1:secret1,kid2:secret2" turns on signed tokens;
+    the first key signs unless SESSION_SIGNING_KEY_ID names another one.
+    """
+    spec = os.environ.get("SESSION_SIGNING_KEYS", "")
+    if not spec:
+        return None
+    keys = {}
+    for entry in spec.split(","):
+        keyId, secret = entry.split(":", 1)
+        keys[keyId.strip()] = secret.strip().encode("utf-8")
+    return TokenSigner(keys, os.environ.get("SESSION_SIGNING_KEY_ID", next(iter(keys))))
@@ -0,0 +1,71 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
+
+
+class StripedLock:
+    """
+    N independent locks; a key always maps to the same stripe, so operations
+    on different keys rarely contend. hold() takes the stripes for several
+    keys in ascending order, which keeps multi-key callers deadlock free.
+
+    Time spent waiting for each stripe is recorded so contention shows up
+    in stats().
+    """
+
+    def __init__(self, stripes: int = 16):
+        self.stripes = stripes
+        self.locks = [threading.Lock() for _ in range(stripes)]
+        self.metrics: List[Dict[str, float]] = [
+            {"acquisitions": 0, "contended": 0, "waitSeconds": 0.0, "maxWaitSeconds": 0.0}
+            for _ in range(stripes)
+        ]
+
+    def stripeOf(self, key) -> int:
+        return hash(key) % self.stripes
+
+    def _acquire(self, stripe: int):
+        lock = self.locks[stripe]
+        if lock.acquire(blocking=False):
+            waited = 0.0
+        else:
+            started = time.perf_counter()
+            lock.acquire()
+            waited = time.perf_counter() - started
+        # updated while holding the stripe, so the counters need no lock of their own
+        stats = self.metrics[stripe]
+        stats["acquisitions"] += 1
+        if waited:
+            stats["contended"] += 1
+            stats["waitSeconds"] += waited
+            stats["maxWaitSeconds"] = max(stats["maxWaitSeconds"], waited)
+
+    @contextmanager
+    def holdStripes(self, stripes: Iterable[int]):
+        ordered = sorted(set(stripes))
+        acquired = []
+        try:
+            for stripe in ordered:
+                self._acquire(stripe)
+                acquired.append(stripe)
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                self.locks[stripe].release()
+
+    def hold(self, *keys):
+        """Hold the stripes guarding every key for the duration of a with block."""
+        return self.holdStripes(self.stripeOf(key) for key in keys)
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "stripe": stripe,
+                "acquisitions": stats["acquisitions"],
+                "contended": stats["contended"],
+                "waitMs": round(stats["waitSeconds"] * 1000, 3),
+                "maxWaitMs": round(stats["maxWaitSeconds"] * 1000, 3),
+            }
+            for stripe, stats in enumerate(self.metrics)
+        ]
@@ -1,7 +1,6 @@
-import bcrypt
 import uuid
 import re
-import json
+import os
 
 
 from pathlib import Path
@@ -9,40 +8,42 @@ from typing import Optional
 from datetime import datetime, timedelta
 import threading
 
-from backend.services.userServices import saveUserToDB, changeUserStatus
+from fastapi.concurrency import run_in_threadpool
+
+from backend.repositories.usersRepo import userRepo
+from backend.users.passwordHasher import passwordHasher, HasherBusyError
+from backend.users.sessionStore import StripedSessionTable, SessionSweeper, sessionBackendFromEnv
+from backend.users.stripedLock import StripedLock
+from backend.users.sessionTokens import tokenSignerFromEnv
+from backend.users.userTable import UserTable, normalizeEmail
+from backend.users.penaltyLedger import penaltyLedger
 
 
 
 #pylint: disable = C0303
 class User:
-    usersDb = {}
-    activeSessions = {}  # Store active user sessions with expiry
-    _lock = threading.Lock()  # Thread lock for concurrent access
+    usersDb = UserTable()  # username -> User, indexed by normalized email
+    # Store active user sessions with expiry; MAX_SESSIONS caps the table, evicting least recently used.
+    # With SESSION_BACKEND set this is a per-worker cache over a store shared by every worker.
+    # Sharded by token hash, each shard behind its own lock stripe.
+    activeSessions = StripedSessionTable(stripes=int(os.environ.get("USER_LOCK_STRIPES", "16")),
+                                         maxSessions=int(os.environ.get("MAX_SESSIONS", "0")) or None,
+                                         backend=sessionBackendFromEnv())
+    tokenSigner = tokenSignerFromEnv()  # set -> login issues stateless HMAC-signed tokens instead
+    _lock = threading.Lock()  # whole-table operations only (startup load)
+    _userLocks = StripedLock(int(os.environ.get("USER_LOCK_STRIPES", "16")))  # per username / email stripes
     sessionTimeout = timedelta(hours=24)  # Sessions expire after 24 hours
     path = Path(r"backend\data\Users\userList.json")
     
-    def __init__(self, username: str, email: str, password: str, save:bool = True):
-        """Initialize a new user with validation"""
+    def __init__(self, username: str, email: str, password: str, save:bool = True, passwordHash: Optional[bytes] = None):
+        """Initialize a new user with validation (passwordHash skips hashing when it was done already)"""
         self.id = str(uuid.uuid4())
-
-        
-        path = Path(r"backend\data\Users\userList.json")    
-        self.path = path
-
-        data = {}
-        if path.exists():
-            with open(path, 'r') as jsonFile:
-                try:
-                    data = json.load(jsonFile)
-                except json.JSONDecodeError:
-                    data = {}
-        
         self.penaltyPointsList = []  # store PenaltyPoints objects
+        self.activePenaltyPoints = 0  # running total of unexpired points, kept by the penalty ledger
 
-      
-        # Validate and set username
+        # Validate and set username (stored users are checked through the repository's in-memory index)
         if self.checkUsername(username):
-            if username in data:
+            if save and userRepo.exists(username):
                 raise ValueError("Username already exists")
             else:
                 self.username =username
@@ -56,14 +57,14 @@ class User:
             raise ValueError("Invalid email address")
         
         # Encrypt and set password
-        self.passwordHash = self.encryptPassword(password)
+        self.passwordHash = passwordHash if passwordHash is not None else self.encryptPassword(password)
         self.isVerified = False  # Email verification status
         self.verificationToken = str(uuid.uuid4())
         self.createdAt = datetime.now()
         self.lastLogin = None
 
         if save:
-            saveUserToDB(username=self.username, email=self.email, passwordHash=self.passwordHash, path=path)
+            userRepo.add(self.username, self.email, self.passwordHash, self.verificationToken)
 
 
         
@@ -89,56 +90,141 @@ class User:
     
 
     
-    def encryptPassword(self, password: str) -> bytes:
-        """Encrypt password using bcrypt"""
+    def checkPasswordLength(self, password: str) -> None:
+        """Reject passwords shorter than 8 characters"""
         if len(password) < 8:
             raise ValueError("Password must be at least 8 characters long")
+
+    def encryptPassword(self, password: str) -> bytes:
+        """Encrypt password using bcrypt"""
+        self.checkPasswordLength(password)
         
-        # Generate salt and hash password
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        
-        return hashed
+        # Generate salt and hash password on the shared hashing pool
+        return passwordHasher.hash(password)
     
     def verifyPassword(self, password: str) -> bool:
         """Verify a password against the stored hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.passwordHash)
+        return passwordHasher.verify(password, self.passwordHash)
     
     def verifyEmail(self, token: str) -> bool:
         """Verify user's email with verification token"""
         if token == self.verificationToken:
             self.isVerified = True
-            path = Path(r"backend\data\Users\userList.json")
-            changeUserStatus(self.username,True, path)
+            userRepo.setVerified(self.username, True)
             return True
         return False
     
     @classmethod
     def _cleanExpiredSessions(cls):
-        """Remove expired sessions"""
-        currentTime = datetime.now()
-        expiredTokens = [
-            token for token, (user, loginTime) in cls.activeSessions.items()
-            if currentTime - loginTime > cls.sessionTimeout
-        ]
-        for token in expiredTokens:
-            del cls.activeSessions[token]
+        """Remove expired sessions (only the due ones are touched, via the expiry heap)"""
+        cls.activeSessions.evictExpired(datetime.now(), cls.sessionTimeout)
+
+    @classmethod
+    def _cleanExpiredShard(cls, sessionToken: str):
+        """Expire due sessions in the token's shard only; the caller holds that shard's stripe"""
+        cls.activeSessions.shardFor(sessionToken).evictExpired(datetime.now(), cls.sessionTimeout)
+
+    @classmethod
+    def sweepSessions(cls):
+        """Called periodically by the session sweeper thread"""
+        cls._cleanExpiredSessions()
+        cls.activeSessions.purgeStored(datetime.now() - cls.sessionTimeout)
+        if cls.tokenSigner is not None:
+            cls.tokenSigner.pruneRevocations()
+
+    @classmethod
+    def startSessionSweeper(cls, interval: float = 60.0) -> SessionSweeper:
+        """Expire idle sessions in the background so memory is reclaimed without traffic"""
+        sweeper = SessionSweeper(cls.sweepSessions, interval)
+        sweeper.start()
+        return sweeper
     
     @classmethod
-    def createAccount(cls, username: str, email: str, password: str) -> 'User':
+    def _fromRecord(cls, username: str, record: dict) -> 'User':
+        """Rebuild a stored user, reusing its hash (and verification token, when one was stored)"""
+        user = cls(username, record["email"], "", save=False, passwordHash=record["password"].encode("utf-8"))
+        user.isVerified = record["isVerified"]
+        user.verificationToken = record.get("verificationToken", user.verificationToken)
+        return user
+
+    @classmethod
+    def loadStoredUsers(cls) -> int:
+        """Build usersDb from the repository once at startup, reusing the stored hashes"""
+        userRepo.load()
+        with cls._lock:
+            for username, record in list(userRepo.records.items()):
+                if username not in cls.usersDb:
+                    cls.usersDb[username] = cls._fromRecord(username, record)
+            return len(cls.usersDb)
+
+    @classmethod
+    def _storedUserChanged(cls, username: str, record: Optional[dict]):
+        """userRepo listener: another worker registered, verified, rehashed or deleted a user"""
+        user = cls.usersDb.get(username)
+        if record is None:
+            cls.usersDb.pop(username, None)
+        elif user is None:
+            cls.usersDb[username] = cls._fromRecord(username, record)
+        else:
+            user.passwordHash = record["password"].encode("utf-8")
+            user.isVerified = record["isVerified"]
+
+    @classmethod
+    def resolveUser(cls, username: str) -> Optional['User']:
+        """
+        The User for username. usersDb is this worker's copy, so a name it
+        doesn't know is looked up again after catching up with what other
+        workers have written to the user journal.
+        """
+        user = cls.usersDb.get(username)
+        if user is None:
+            userRepo.refresh()
+            user = cls.usersDb.get(username)
+        if user is None:
+            record = userRepo.get(username)
+            if record is not None:
+                user = cls.usersDb.setdefault(username, cls._fromRecord(username, record))
+        return user
+
+    @classmethod
+    def _emailOwner(cls, email: str) -> Optional[str]:
+        """Username registered with email (case-insensitive), from the usersDb index or the stored users"""
+        owner = cls.usersDb.usernameForEmail(email)
+        return owner or userRepo.usernameForEmail(normalizeEmail(email))
+
+    @classmethod
+    def _precheckAccount(cls, username: str, email: str, password: str):
+        """Cheap checks run before paying for a hash; createAccount repeats the uniqueness ones under the lock"""
+        if username in cls.usersDb:
+            raise ValueError("Username already exists")
+        if not cls.checkUsername(cls, username):
+            raise ValueError("Invalid username: must be 3-20 characters and alphanumeric")
+        if not cls.checkEmail(cls, email):
+            raise ValueError("Invalid email address")
+        if cls._emailOwner(email) is not None:
+            raise ValueError("Email already registered")
+        cls.checkPasswordLength(cls, password)
+
+    @classmethod
+    def createAccount(cls, username: str, email: str, password: str, passwordHash: Optional[bytes] = None) -> 'User':
         """Create a new user account"""
-        with cls._lock:  # Thread-safe operation
+        if passwordHash is None:
+            # hash before taking the lock so one registration doesn't stall every other account operation
+            cls._precheckAccount(username, email, password)
+            passwordHash = passwordHasher.hash(password)
+
+        # the username's stripe and the email's stripe, so neither can be claimed twice
+        with cls._userLocks.hold(username, "email:" + normalizeEmail(email)):
             # Check if username already exists
             if username in cls.usersDb:
                 raise ValueError("Username already exists")
             
             # Check if email already exists
-            for user in cls.usersDb.values():
-                if user.email == email:
-                    raise ValueError("Email already registered")
+            if cls._emailOwner(email) is not None:
+                raise ValueError("Email already registered")
             
             # Create new user
-            newUser = cls(username, email, password)
+            newUser = cls(username, email, password, passwordHash=passwordHash)
             cls.usersDb[username] = newUser
             
             print(f"Account created! Verification token: {newUser.verificationToken}")
@@ -146,61 +232,137 @@ class User:
             
             return newUser
     
+    @classmethod
+    def deleteAccount(cls, username: str) -> bool:
+        """Remove an account, freeing its username and email, and end its sessions"""
+        user = cls.usersDb.get(username)
+        if user is None:
+            return False
+        with cls._userLocks.hold(username, "email:" + normalizeEmail(user.email)):
+            if cls.usersDb.pop(username, None) is None:
+                return False
+            userRepo.remove(username)
+        for token in list(cls.activeSessions):
+            with cls.activeSessions.locked(token):
+                session = cls.activeSessions.shardFor(token).get(token)
+                if session is not None and session[0] is user:
+                    del cls.activeSessions[token]
+        return True
+
+    @classmethod
+    async def createAccountAsync(cls, username: str, email: str, password: str) -> 'User':
+        """Create a new user account, awaiting the hashing service instead of blocking on it"""
+        # the pre-checks may load users from disk under the repository locks, and the
+        # locks and repository write in createAccount block too, so both run off the event loop
+        await run_in_threadpool(cls._precheckAccount, username, email, password)
+        passwordHash = await passwordHasher.hashAsync(password)
+        return await run_in_threadpool(cls.createAccount, username, email, password, passwordHash=passwordHash)
+
+    @classmethod
+    def _beginLogin(cls, username: str) -> 'User':
+        # Check if user exists
+        user = cls.resolveUser(username)
+        if user is None:
+            raise ValueError("Invalid username or password")
+        
+        # check if the user has 3 or more penalty points (if so they can't log in)
+        if user.totalPenaltyPoints() >= 3:
+            raise ValueError("You cannot login currently due to too many penalty points")
+        return user
+
     @classmethod
     def login(cls, username: str, password: str) -> Optional[str]:
         """Login user and return session token"""
-        with cls._lock:  # Thread-safe operation
-            # Clean expired sessions first
-            cls._cleanExpiredSessions()
-            
-            # Check if user exists
-            if username not in cls.usersDb:
-                raise ValueError("Invalid username or password")
-            
-            user = cls.usersDb[username]
-            
-            # check if the user has 3 or more penalty points (if so they can't log in)
-            if user.totalPenaltyPoints() >= 3:
-                raise ValueError("You cannot login currently due to too many penalty points")
-            
-            # Verify password
-            if not user.verifyPassword(password):
-                raise ValueError("Invalid username or password")
-            
-            # Check if email is verified
-            if not user.isVerified:
-                raise ValueError("Please verify your email before logging in")
-            
-            # Create session token
-            sessionToken = str(uuid.uuid4())
+        user = cls._beginLogin(username)
+        # Verify password outside the lock so concurrent logins hash in parallel
+        sessionToken = cls._finishLogin(user, user.verifyPassword(password))
+        if passwordHasher.needsRehash(user.passwordHash):
+            try:
+                user._storeRehash(passwordHasher.hash(password))
+            except HasherBusyError:
+                pass  # try again on a later login
+        return sessionToken
+
+    @classmethod
+    async def loginAsync(cls, username: str, password: str) -> Optional[str]:
+        """Login user and return session token, awaiting the hashing service"""
+        # resolving the user can read the user files under their locks, so it runs off the event loop
+        user = await run_in_threadpool(cls._beginLogin, username)
+        passwordOk = await passwordHasher.verifyAsync(password, user.passwordHash)
+        # session writes (shard lock, shared backend) block, so they run off the event loop too
+        sessionToken = await run_in_threadpool(cls._finishLogin, user, passwordOk)
+        if passwordHasher.needsRehash(user.passwordHash):
+            try:
+                newHash = await passwordHasher.hashAsync(password)
+                await run_in_threadpool(user._storeRehash, newHash)
+            except HasherBusyError:
+                pass  # try again on a later login
+        return sessionToken
+
+    def _storeRehash(self, passwordHash: bytes):
+        """Swap in a hash made at the current bcrypt cost and persist it"""
+        self.passwordHash = passwordHash
+        userRepo.setPasswordHash(self.username, passwordHash)
+
+    @classmethod
+    def _finishLogin(cls, user: 'User', passwordOk: bool) -> str:
+        if not passwordOk:
+            raise ValueError("Invalid username or password")
+        
+        # Check if email is verified (possibly on another worker)
+        if not user.isVerified:
+            userRepo.refresh()
+        if not user.isVerified:
+            raise ValueError("Please verify your email before logging in")
+        
+        user.lastLogin = datetime.now()
+        if cls.tokenSigner is not None:
+            # signed tokens carry their own expiry, nothing to store
+            issuedAt = user.lastLogin.timestamp()
+            print(f"Login successful! Welcome, {user.username}")
+            return cls.tokenSigner.issue(user.username, issuedAt, issuedAt + cls.sessionTimeout.total_seconds())
+
+        # Create session token; only the token's session shard is locked
+        sessionToken = str(uuid.uuid4())
+        with cls.activeSessions.locked(sessionToken):  # Thread-safe operation
+            cls._cleanExpiredShard(sessionToken)
             cls.activeSessions[sessionToken] = (user, datetime.now())
-            user.lastLogin = datetime.now()
-            
-            print(f"Login successful! Welcome, {username}")
-            print(f"Active sessions: {len(cls.activeSessions)}")
-            return sessionToken
+        activeCount = len(cls.activeSessions)
+        
+        print(f"Login successful! Welcome, {user.username}")
+        print(f"Active sessions: {activeCount}")
+        return sessionToken
     
     def logout(cls, sessionToken: str) -> bool:
         """Logout user by removing session token"""
-        with cls._lock:  # Thread-safe operation
-            if sessionToken in cls.activeSessions:
-                user, _ = cls.activeSessions[sessionToken]
+        if cls.tokenSigner is not None and cls.tokenSigner.looksSigned(sessionToken):
+            return cls.tokenSigner.revoke(sessionToken)
+        with cls.activeSessions.locked(sessionToken):  # Thread-safe operation
+            session = cls.activeSessions.lookup(sessionToken, cls.resolveUser)
+            if session is not None:
                 del cls.activeSessions[sessionToken]
-                print(f"Logout successful! Goodbye, {user.username}")
-                print(f"Active sessions: {len(cls.activeSessions)}")
-                return True
+        if session is None:
             return False
+        print(f"Logout successful! Goodbye, {session[0].username}")
+        print(f"Active sessions: {len(cls.activeSessions)}")
+        return True
     
 
     def getCurrentUser(cls, sessionToken: str) -> Optional['User']:
         """Get currently logged-in user from session token"""
-        with cls._lock:  # Thread-safe operation
-            cls._cleanExpiredSessions()
+        if cls.tokenSigner is not None and cls.tokenSigner.looksSigned(sessionToken):
+            # lock-free: an HMAC check and a revocation lookup
+            claims = cls.tokenSigner.verify(sessionToken)
+            return cls.resolveUser(claims[0]) if claims else None
+        with cls.activeSessions.locked(sessionToken):  # Thread-safe operation
+            cls._cleanExpiredShard(sessionToken)
             
-            if sessionToken in cls.activeSessions:
-                user, loginTime = cls.activeSessions[sessionToken]
+            session = cls.activeSessions.lookup(sessionToken, cls.resolveUser)
+            if session is not None:
+                user, loginTime = session
                 # Check if session is still valid
                 if datetime.now() - loginTime <= cls.sessionTimeout:
+                    cls.activeSessions.touch(sessionToken)
                     return user
                 else:
                     # Session expired, remove it
@@ -208,9 +370,10 @@ class User:
             return None
     
     def totalPenaltyPoints(self) -> int:
-    # Filter out expired penalties
-        active = [pp for pp in self.penaltyPointsList if not pp.isExpired()]
-        return sum(pp.points for pp in active)
+        # lapse anything due first; the running total is then exact
+        penaltyLedger.expireDue()
+        return self.activePenaltyPoints
 
-    
-               
\ No newline at end of file
+
+# keep this worker's usersDb in step with users other workers write to the journal
+userRepo.listeners.append(User._storedUserChanged)
@@ -0,0 +1,61 @@
+from typing import Dict, Optional
+
+
+def normalizeEmail(email: str) -> str:
+    return email.strip().lower()
+
+
+class UserTable(dict):
+    """
+    username -> User map used as User.usersDb, with a case-normalized
+    email -> username index kept in step with every insert and removal so
+    duplicate email checks are a single lookup.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.emailIndex: Dict[str, str] = {}
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, username: str, user):
+        previous = self.get(username)
+        if previous is not None:
+            self._unindex(username, previous)
+        super().__setitem__(username, user)
+        self.emailIndex[normalizeEmail(user.email)] = username
+
+    def __delitem__(self, username: str):
+        self._unindex(username, self[username])
+        super().__delitem__(username)
+
+    def _unindex(self, username: str, user):
+        if self.emailIndex.get(normalizeEmail(user.email)) == username:
+            del self.emailIndex[normalizeEmail(user.email)]
+
+    def pop(self, username: str, *default):
+        if username in self:
+            user = self[username]
+            del self[username]
+            return user
+        if default:
+            return default[0]
+        raise KeyError(username)
+
+    def update(self, *args, **kwargs):
+        for username, user in dict(*args, **kwargs).items():
+            self[username] = user
+
+    def setdefault(self, username: str, user=None):
+        if username not in self:
+            self[username] = user
+        return self[username]
+
+    def clear(self):
+        super().clear()
+        self.emailIndex.clear()
+
+    def copy(self) -> "UserTable":
+        return UserTable(self)
+
+    def usernameForEmail(self, email: str) -> Optional[str]:
+        return self.emailIndex.get(normalizeEmail(email))
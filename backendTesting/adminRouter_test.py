@@ -1,11 +1,14 @@
 import os
 import json
 import shutil
+from datetime import timedelta
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 from unittest.mock import patch, MagicMock, mock_open
 from backend.schemas.movie import movieCreate
 from backend.users.user import User
+from backend.users.userTable import UserTable
+from backend.repositories.movieTombstones import trashDir
 import pytest
 
 
@@ -49,12 +52,29 @@ def tempDataPath(tmp_path):
 @pytest.fixture
 def mockUserDb():
     """Mock user database"""
-    originalDb = User.usersDb.copy() if hasattr(User, 'usersDb') else {}
-    User.usersDb = {}
+    originalDb = User.usersDb
+    User.usersDb = UserTable()
     yield User.usersDb
     User.usersDb = originalDb
 
 
+@pytest.fixture
+def ledger(monkeypatch, tmp_path):
+    """Penalty ledger writing under tmp_path instead of the data folder"""
+    from backend.users.penaltyLedger import PenaltyLedger
+    ledger = PenaltyLedger(tmp_path / "penalties.ndjson")
+    for target in ("backend.routers.adminRouter.penaltyLedger",
+                   "backend.users.penaltyPoints.penaltyLedger",
+                   "backend.users.user.penaltyLedger"):
+        monkeypatch.setattr(target, ledger)
+    return ledger
+
+
+def makeUser(username):
+    """A registered-looking user that is never saved"""
+    return User(username, f"{username}@test.com", "", save=False, passwordHash=b"x")
+
+
 @pytest.fixture(autouse=True)
 def resetDataPath():
     """Reset DATA_PATH after each test"""
@@ -272,25 +292,36 @@ class TestDeleteMovie:
         assert not os.path.exists(movieFolder)
     
     def testDeleteMovieWithSubdirectories(self, tempDataPath, monkeypatch):
-        """Handles deletion of movies with subdirectories"""
+        """Subdirectories go to the trash with the folder and the reaper removes them"""
         from backend.routers import adminRouter
+        from backend.repositories.movieTombstones import MovieReaper
+        reaper = MovieReaper()
         monkeypatch.setattr(adminRouter, "DATA_PATH", tempDataPath)
+        monkeypatch.setattr(adminRouter, "movieReaper", reaper)
         
         movieFolder = os.path.join(tempDataPath, "Movie With Subdir")
         os.makedirs(movieFolder)
         
-        # Add a subdirectory (this will cause rmdir to fail)
+        # Add a subdirectory with a file in it
         subDir = os.path.join(movieFolder, "extras")
         os.makedirs(subDir)
+        with open(os.path.join(subDir, "trailer.txt"), 'w') as f:
+            f.write("trailer")
         
-        # With error handling, this should return 500 error instead of raising
         response = client.delete("/delete-movie/Movie With Subdir")
         
-        # Should return 500 error because rmdir can't remove non-empty directories
-        assert response.status_code == 500
-        # Check for either "error" or "permission" in the error message
-        detail = response.json()["detail"].lower()
-        assert "error" in detail or "permission" in detail or "unable" in detail
+        # hidden straight away, files still waiting for the reaper
+        assert response.status_code == 200
+        assert not os.path.exists(movieFolder)
+        status = client.get("/movies/deletions").json()
+        assert status["pending"] == 1
+        assert status["queue"][0]["title"] == "Movie With Subdir"
+        
+        reaper.drain()
+        status = client.get("/movies/deletions").json()
+        assert status["pending"] == 0 and status["reaped"] == 1
+        assert status["recent"][0]["files"] == 1 and status["recent"][0]["bytes"] == 7
+        assert os.listdir(trashDir(tempDataPath)) == []
     
     def testDeleteMoviePermissionError(self, tempDataPath, monkeypatch):
         """Handles permission errors when deleting"""
@@ -305,12 +336,13 @@ class TestDeleteMovie:
         with open(testFile, 'w') as f:
             f.write("test")
         
-        # Patch at the module level where it's used
-        with patch("backend.routers.adminRouter.os.remove", side_effect=PermissionError("Permission denied")):
+        # tombstoning is a rename of the folder into the trash
+        with patch("backend.repositories.movieTombstones.os.rename", side_effect=PermissionError("Permission denied")):
             response = client.delete("/delete-movie/Protected Movie")
             # Should return 500 error with proper error handling
             assert response.status_code == 500
             assert "Permission denied" in response.json()["detail"]
+        assert os.path.exists(movieFolder)
     
     def testDeleteMovieUrlEncoding(self, tempDataPath, monkeypatch):
         """Handles URL-encoded movie titles"""
@@ -331,11 +363,9 @@ class TestDeleteMovie:
 class TestAssignPenalty:
     """Tests for POST /penalty endpoint"""
     
-    def testAssignPenaltySuccess(self, mockUserDb):
+    def testAssignPenaltySuccess(self, mockUserDb, ledger):
         """Successfully assign penalty to existing user"""
-        # Create a mock user
-        mockUser = MagicMock()
-        mockUser.penalties = []
+        mockUser = makeUser("testuser")
         User.usersDb["testuser"] = mockUser
         
         response = client.post(
@@ -357,7 +387,7 @@ class TestAssignPenalty:
         assert mockUser.penalties[0]["points"] == 10
         assert mockUser.penalties[0]["reason"] == "Late return"
     
-    def testAssignPenaltyUserNotFound(self, mockUserDb):
+    def testAssignPenaltyUserNotFound(self, mockUserDb, ledger):
         """Returns 404 when user doesn't exist"""
         response = client.post(
             "/penalty",
@@ -371,9 +401,9 @@ class TestAssignPenalty:
         assert response.status_code == 404
         assert response.json()["detail"] == "User not found"
     
-    def testAssignPenaltyFirstPenalty(self, mockUserDb):
+    def testAssignPenaltyFirstPenalty(self, mockUserDb, ledger):
         """Initializes penalties list if user doesn't have one"""
-        mockUser = MagicMock(spec=[])  # User without penalties attribute
+        mockUser = makeUser("newuser")  # no penalties attribute yet
         User.usersDb["newuser"] = mockUser
         
         response = client.post(
@@ -389,17 +419,16 @@ class TestAssignPenalty:
         assert hasattr(mockUser, "penalties")
         assert len(mockUser.penalties) == 1
     
-    def testAssignPenaltyMultiplePenalties(self, mockUserDb):
+    def testAssignPenaltyMultiplePenalties(self, mockUserDb, ledger):
         """Add multiple penalties to same user"""
-        mockUser = MagicMock()
-        mockUser.penalties = []
-        User.usersDb["repeat_offender"] = mockUser
+        mockUser = makeUser("repeatOffender")
+        User.usersDb["repeatOffender"] = mockUser
         
         # First penalty
         response1 = client.post(
             "/penalty",
             params={
-                "username": "repeat_offender",
+                "username": "repeatOffender",
                 "points": 5,
                 "reason": "Late return"
             }
@@ -410,7 +439,7 @@ class TestAssignPenalty:
         response2 = client.post(
             "/penalty",
             params={
-                "username": "repeat_offender",
+                "username": "repeatOffender",
                 "points": 10,
                 "reason": "Damaged item"
             }
@@ -421,16 +450,15 @@ class TestAssignPenalty:
         assert data["totalPenalties"] == 2
         assert len(mockUser.penalties) == 2
     
-    def testAssignPenaltyZeroPoints(self, mockUserDb):
+    def testAssignPenaltyZeroPoints(self, mockUserDb, ledger):
         """Allows zero penalty points (warning)"""
-        mockUser = MagicMock()
-        mockUser.penalties = []
-        User.usersDb["warned_user"] = mockUser
+        mockUser = makeUser("warnedUser")
+        User.usersDb["warnedUser"] = mockUser
         
         response = client.post(
             "/penalty",
             params={
-                "username": "warned_user",
+                "username": "warnedUser",
                 "points": 0,
                 "reason": "Verbal warning"
             }
@@ -439,10 +467,9 @@ class TestAssignPenalty:
         assert response.status_code == 200
         assert mockUser.penalties[0]["points"] == 0
     
-    def testAssignPenaltyNegativePoints(self, mockUserDb):
+    def testAssignPenaltyNegativePoints(self, mockUserDb, ledger):
         """Handles negative penalty points"""
-        mockUser = MagicMock()
-        mockUser.penalties = []
+        mockUser = makeUser("testuser")
         User.usersDb["testuser"] = mockUser
         
         response = client.post(
@@ -457,10 +484,9 @@ class TestAssignPenalty:
         # This depends on your validation - might accept or reject
         assert response.status_code in [200, 422]
     
-    def testAssignPenaltyLongReason(self, mockUserDb):
+    def testAssignPenaltyLongReason(self, mockUserDb, ledger):
         """Handles long penalty reasons"""
-        mockUser = MagicMock()
-        mockUser.penalties = []
+        mockUser = makeUser("testuser")
         User.usersDb["testuser"] = mockUser
         
         longReason = "A" * 1000
@@ -477,10 +503,9 @@ class TestAssignPenalty:
         assert response.status_code == 200
         assert mockUser.penalties[0]["reason"] == longReason
     
-    def testAssignPenaltyEmptyReason(self, mockUserDb):
+    def testAssignPenaltyEmptyReason(self, mockUserDb, ledger):
         """Handles empty penalty reason"""
-        mockUser = MagicMock()
-        mockUser.penalties = []
+        mockUser = makeUser("testuser")
         User.usersDb["testuser"] = mockUser
         
         response = client.post(
@@ -495,10 +520,10 @@ class TestAssignPenalty:
         assert response.status_code == 200
         assert mockUser.penalties[0]["reason"] == ""
     
-    def testAssignPenaltySpecialCharactersUsername(self, mockUserDb):
+    def testAssignPenaltySpecialCharactersUsername(self, mockUserDb, ledger):
         """Handles usernames with special characters"""
-        mockUser = MagicMock()
-        mockUser.penalties = []
+        mockUser = makeUser("specialuser")
+        mockUser.username = "user@email.com"  # only the usersDb key matters to the route
         User.usersDb["user@email.com"] = mockUser
         
         response = client.post(
@@ -550,12 +575,10 @@ class TestIntegration:
         
         assert response.status_code == 404
     
-    def testMultipleUsersPenalties(self, mockUserDb):
+    def testMultipleUsersPenalties(self, mockUserDb, ledger):
         """Assign penalties to multiple users"""
-        user1 = MagicMock()
-        user1.penalties = []
-        user2 = MagicMock()
-        user2.penalties = []
+        user1 = makeUser("user1")
+        user2 = makeUser("user2")
         
         User.usersDb["user1"] = user1
         User.usersDb["user2"] = user2
@@ -578,4 +601,50 @@ class TestIntegration:
         assert len(user1.penalties) == 1
         assert len(user2.penalties) == 1
         assert user1.penalties[0]["points"] == 5
-        assert user2.penalties[0]["points"] == 10
\ No newline at end of file
+        assert user2.penalties[0]["points"] == 10
+
+def testLockStats():
+    response = client.get("/locks")
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["sessions"]) == len(User.activeSessions.shards)
+    assert {"stripe", "acquisitions", "contended", "waitMs", "maxWaitMs"} <= set(body["users"][0])
+
+
+class TestAssignPenaltiesBatch:
+    """Tests for POST /penalties/batch"""
+
+    def testBatchAppliesAndPersistsOnce(self, mockUserDb, ledger):
+        alice = User("alice", "alice@test.com", "", save=False, passwordHash=b"x")
+        bob = User("bob", "bob@test.com", "", save=False, passwordHash=b"x")
+        User.usersDb.update({"alice": alice, "bob": bob})
+
+        response = client.post("/penalties/batch", json=[
+            {"username": "alice", "points": 2, "reason": "spam"},
+            {"username": "ghost", "points": 1, "reason": "spam"},
+            {"username": "bob", "points": 1, "reason": "spoilers", "ttlSeconds": 60},
+            {"username": "alice", "points": 1, "reason": "spam again"},
+        ])
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["applied"] == 3
+        assert data["failed"] == 1
+        assert data["results"][1] == {"index": 1, "username": "ghost", "error": "User not found"}
+        assert [r["seq"] for r in data["results"] if "seq" in r] == [1, 2, 3]
+        assert data["results"][3]["activePoints"] == 3
+        # the same totals drive the login check
+        assert alice.totalPenaltyPoints() == 3
+        assert len(ledger.path.read_text().splitlines()) == 3
+        assert bob.penaltyPointsList[0].expiresAt - bob.penaltyPointsList[0].dateIssued == timedelta(seconds=60)
+
+    def testBatchRejectsNegativePoints(self, mockUserDb, ledger):
+        response = client.post("/penalties/batch", json=[{"username": "alice", "points": -1, "reason": "x"}])
+        assert response.status_code == 422
+
+    def testSinglePenaltyCountsTowardsLogin(self, mockUserDb, ledger):
+        carol = User("carol", "carol@test.com", "", save=False, passwordHash=b"x")
+        User.usersDb["carol"] = carol
+        response = client.post("/penalty", params={"username": "carol", "points": 3, "reason": "abuse"})
+        assert response.status_code == 200
+        assert carol.totalPenaltyPoints() == 3
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.repositories.catalogStats import CatalogStats
+from backend.repositories.reviewsRepo import ReviewStore
+from backend.routers.adminRouter import router
+from backend.schemas.movieReviews import movieReviews
+from backend.services.changeFeed import ChangeFeed
+from backend.users.user import User
+from backend.users.userTable import UserTable
+
+app = FastAPI()
+app.include_router(router, prefix="/admin")
+client = TestClient(app)
+
+
+def review(user, day):
+    return movieReviews(dateOfReview=day, user=user, usefulnessVote=0, totalVotes=0,
+                        userRatingOutOf10=8, reviewTitle="t", review="r")
+
+
+@pytest.fixture
+def wired():
+    stats, store, feed = CatalogStats(), ReviewStore(), ChangeFeed()
+    store.listeners.append(stats.reviewsChanged)
+    feed.listeners.append(stats.feedChanged)
+    return stats, store, feed
+
+
+def testCountersFollowMoviesAndReviews(wired):
+    stats, store, feed = wired
+    feed.record("movie", "create", "Joker", {"movieGenres": ["Crime", "Drama"]})
+    feed.record("movie", "create", "Thor", {"movieGenres": ["Action"]})
+    store.addReview("Joker", review("khushi", "2024-05-01"))
+    store.addReview("joker", review("omkar", "1 May 2024"))  # the data set's own date format
+    removed = store.addReview("Thor", review("omkar", "2 May 2024"))
+
+    assert stats.snapshot() == {"movies": 2, "genres": {
+        "Action": {"movies": 1, "reviews": 1},
+        "Crime": {"movies": 1, "reviews": 2},
+        "Drama": {"movies": 1, "reviews": 2},
+    }}
+    assert (store.total, dict(store.byDay)) == (3, {"2024-05-01": 2, "2024-05-02": 1})
+
+    # a genre change moves the movie's reviews with it
+    feed.record("movie", "update", "Joker", {"movieGenres": ["Thriller"]})
+    store.removeReview("Thor", removed.reviewId)
+    feed.record("movie", "delete", "Thor")
+    assert stats.snapshot() == {"movies": 1, "genres": {"Thriller": {"movies": 1, "reviews": 2}}}
+    assert (store.total, dict(store.byDay)) == (2, {"2024-05-01": 2})
+
+    store.clear()
+    assert stats.snapshot()["genres"] == {"Thriller": {"movies": 1, "reviews": 0}}
+
+
+def testLoadSeedsMoviesFromDataFolder(wired, tmp_path):
+    stats, store, _ = wired
+    for title, genres in [("Joker", ["Drama"]), ("Heat", ["Crime", "Drama"])]:
+        (tmp_path / title).mkdir()
+        (tmp_path / title / "metadata.json").write_text(json.dumps({"title": title, "movieGenres": genres}))
+    (tmp_path / "Users").mkdir()
+    store.addReview("Heat", review("khushi", "2024-05-01"))
+
+    assert stats.load(str(tmp_path)) == 2
+    assert stats.snapshot()["genres"]["Drama"] == {"movies": 2, "reviews": 1}
+
+
+def testStatsEndpoint(wired, monkeypatch):
+    stats, store, feed = wired
+    monkeypatch.setattr("backend.routers.adminRouter.catalogStats", stats)
+    monkeypatch.setattr("backend.routers.adminRouter.reviewStore", store)
+    users = UserTable({name: User(name, f"{name}@test.com", "", save=False, passwordHash=b"x")
+                       for name in ("khushi", "omkar")})
+    monkeypatch.setattr("backend.routers.adminRouter.User.usersDb", users)
+    feed.record("movie", "create", "Joker", {"movieGenres": ["Drama"]})
+    store.addReview("Joker", review("khushi", "2024-05-01"))
+
+    response = client.get("/admin/stats")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["movies"], body["reviews"], body["users"]) == (1, 1, 2)
+    assert body["genres"] == {"Drama": {"movies": 1, "reviews": 1}}
+    assert body["reviewsPerDay"] == {"2024-05-01": 1}
+    assert isinstance(body["activeSessions"], int)
+    assert body["activeSessionsScope"] == "worker"
+
+
+def testStatsEndpointWithSignedTokens(wired, monkeypatch):
+    from backend.users.sessionTokens import TokenSigner
+    monkeypatch.setattr("backend.routers.adminRouter.User.tokenSigner", TokenSigner({"k1": b"secret"}, "k1"))
+    body = client.get("/admin/stats").json()
+    assert (body["activeSessions"], body["activeSessionsScope"]) == (None, "signed")
@@ -0,0 +1,106 @@
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from fastapi import FastAPI
+
+from backend.routers.changesRouter import router
+from backend.services.changeFeed import ChangeFeed, changeFeed
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_feed():
+    """Reset the shared change feed before each test."""
+    changeFeed.clear()
+
+
+class TestGetChanges:
+    """Tests for GET /"""
+
+    def test_changes_since_zero(self):
+        changeFeed.record("movie", "create", "Joker", {"title": "Joker"})
+        changeFeed.record("review", "delete", "Joker", reviewId=0)
+
+        response = client.get("/?since=0")
+        assert response.status_code == 200
+        body = response.json()
+        assert [c["seq"] for c in body["changes"]] == [1, 2]
+        assert body["changes"][1]["reviewId"] == 0
+        assert body["lastSeq"] == 2
+        assert body["resync"] is False
+
+    def test_changes_only_deltas(self):
+        for title in ["A", "B", "C"]:
+            changeFeed.record("movie", "create", title)
+
+        body = client.get("/?since=2").json()
+        assert [c["key"] for c in body["changes"]] == ["C"]
+
+    def test_changes_limit(self):
+        for title in ["A", "B", "C"]:
+            changeFeed.record("movie", "create", title)
+
+        body = client.get("/?since=0&limit=2").json()
+        assert body["lastSeq"] == 2
+        assert len(body["changes"]) == 2
+
+    def test_changes_nothing_new(self):
+        changeFeed.record("movie", "create", "A")
+        body = client.get("/?since=1").json()
+        assert body == {"changes": [], "lastSeq": 1, "resync": False}
+
+    def test_changes_ahead_of_server_resyncs(self):
+        body = client.get("/?since=50").json()
+        assert body["resync"] is True
+
+    def test_long_poll_ahead_of_server_resyncs_at_once(self):
+        started = time.monotonic()
+        body = client.get("/?since=50&wait=10").json()
+
+        assert time.monotonic() - started < 5
+        assert body["resync"] is True
+
+    def test_changes_bad_params(self):
+        assert client.get("/?limit=0").status_code == 400
+
+    def test_long_poll_wakes_on_change(self):
+        def later():
+            time.sleep(0.2)
+            changeFeed.record("movie", "update", "Joker")
+
+        threading.Thread(target=later).start()
+        started = time.monotonic()
+        body = client.get("/?since=0&wait=10").json()
+
+        assert time.monotonic() - started < 5
+        assert body["changes"][0]["key"] == "Joker"
+
+    def test_long_poll_times_out_empty(self):
+        body = client.get("/?since=0&wait=0.1").json()
+        assert body["changes"] == []
+
+
+class TestChangeFeed:
+    """Tests for ChangeFeed retention"""
+
+    def test_old_sequence_needs_resync(self):
+        feed = ChangeFeed(maxEntries=2)
+        for title in ["A", "B", "C"]:
+            feed.record("movie", "create", title)
+
+        assert feed.since(0)["resync"] is True
+        assert [c["key"] for c in feed.since(1)["changes"]] == ["B", "C"]
+
+    def test_since_slices_from_either_end(self):
+        feed = ChangeFeed(maxEntries=10)
+        for i in range(15):
+            feed.record("movie", "create", str(i))
+
+        for since in range(5, 16):
+            for limit in (1, 3, 20):
+                expected = list(range(since + 1, min(since + limit, 15) + 1))
+                assert [c["seq"] for c in feed.since(since, limit)["changes"]] == expected
@@ -0,0 +1,85 @@
+import csv
+import json
+import os
+
+import bcrypt
+import pytest
+
+from backend.repositories.usersRepo import UserRepository
+from backend.schemas.movie import movieCreate
+from backend.services.dataGenerator import CatalogGenerator, REVIEW_COLUMNS, main
+from backend.services.movieListServices import readAllMovieList
+from backend.users.user import User
+
+REAL_REVIEWS = os.path.join(os.path.dirname(__file__), "..", "backend", "data", "Forrest Gump", "movieReviews.csv")
+REAL_METADATA = os.path.join(os.path.dirname(__file__), "..", "backend", "data", "Forrest Gump", "metadata.json")
+
+
+@pytest.fixture
+def generated(tmp_path):
+    generator = CatalogGenerator(seed=7, reviewsPerMovie=5, userCount=20, listsPerUser=2)
+    summary = generator.write(tmp_path / "data", 15)
+    return tmp_path / "data", summary
+
+
+def testSameSeedSameBytes(generated, tmp_path):
+    dataDir, _ = generated
+    CatalogGenerator(seed=7, reviewsPerMovie=5, userCount=20, listsPerUser=2).write(tmp_path / "again", 15)
+    for folder, _, files in os.walk(dataDir):
+        for name in files:
+            other = tmp_path / "again" / os.path.relpath(os.path.join(folder, name), dataDir)
+            assert other.read_bytes() == open(os.path.join(folder, name), "rb").read()
+
+
+def testSmallerRunIsAPrefix(generated, tmp_path):
+    dataDir, _ = generated
+    CatalogGenerator(seed=7, reviewsPerMovie=5, userCount=20).write(tmp_path / "small", 5)
+    for title in CatalogGenerator(seed=7).titles(5):
+        assert (tmp_path / "small" / title / "metadata.json").read_bytes() == \
+            (dataDir / title / "metadata.json").read_bytes()
+
+
+def testFilesMatchTheScrapedFormats(generated):
+    dataDir, summary = generated
+    assert summary["movies"] == 15 and summary["reviews"] == 75
+
+    with open(REAL_METADATA, encoding="utf-8") as f:
+        realKeys = list(json.load(f))
+    with open(REAL_REVIEWS, encoding="utf-8") as f:
+        realHeader = next(csv.reader(f))
+    assert realHeader == REVIEW_COLUMNS
+
+    movieFolders = [p for p in dataDir.iterdir() if (p / "metadata.json").exists()]
+    assert len(movieFolders) == 15
+    for folder in movieFolders:
+        metadata = json.loads((folder / "metadata.json").read_text())
+        assert list(metadata) == realKeys
+        movieCreate(**metadata)
+        with open(folder / "movieReviews.csv", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 5
+        assert len({row["User"] for row in rows}) == 5  # nobody reviews a movie twice
+        for row in rows:
+            assert 1 <= int(row["User's Rating out of 10"]) <= 10
+            assert int(row["Usefulness Vote"]) <= int(row["Total Votes"])
+
+
+def testUsersAndListsLoad(generated):
+    dataDir, summary = generated
+    repo = UserRepository(dataDir / "Users" / "userList.json")
+    repo.load()
+    assert len(repo.records) == 20
+    username, record = next(iter(repo.records.items()))
+    assert User.checkUsername(User, username)
+    assert bcrypt.checkpw(summary["password"].encode(), record["password"].encode())
+
+    lists = readAllMovieList(dataDir / "movieLists", username)[username]
+    assert len(lists) == 2
+    assert all((dataDir / title).is_dir() for titles in lists.values() for title in titles)
+
+
+def testCliRefusesNonEmptyDirectory(tmp_path, capsys):
+    (tmp_path / "existing.txt").write_text("keep me")
+    assert main([str(tmp_path), "--movies", "1", "--users", "1"]) == 1
+    assert main([str(tmp_path), "--movies", "1", "--users", "1", "--force"]) == 0
+    assert json.loads(capsys.readouterr().out)["movies"] == 1
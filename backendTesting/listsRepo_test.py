@@ -0,0 +1,161 @@
+import json
+import threading
+import time
+
+import pytest
+
+from backend.repositories.listsRepo import ListStore, MovieList, WAL_NAME, SNAPSHOT_WAL_NAME
+from backend.services.movieListServices import readUserMovieLists, saveUserMovieLists, shardPath
+
+
+def testMemoryOnlyUntilOpened(tmp_path):
+    store = ListStore()
+    store.createList("khushi", "Favorites")
+    store.addMovie("khushi", "Favorites", "Joker")
+    assert store == {"khushi": {"Favorites": ["Joker"]}}
+    assert not list(tmp_path.iterdir())
+
+
+def testReplaysWalAfterRestart(tmp_path):
+    store = ListStore()
+    store.open(tmp_path)
+    store.createList("khushi", "Favorites")
+    store.addMovie("khushi", "Favorites", "Joker")
+    store.addMovie("khushi", "Favorites", "Morbius")
+    store.removeMovie("khushi", "Favorites", "Joker")
+    store.createList("khushi", "Old")
+    store.deleteList("khushi", "Old")
+    assert len((tmp_path / WAL_NAME).read_text().splitlines()) == 6
+
+    restarted = ListStore()
+    restarted.open(tmp_path)
+    assert restarted == {"khushi": {"Favorites": ["Morbius"]}}
+
+
+def testWriterSnapshotsAndTruncatesWal(tmp_path):
+    store = ListStore(snapshotEvery=3)
+    store.open(tmp_path)
+    store.createList("omkar", "Watch")
+    store.addMovie("omkar", "Watch", "Joker")
+    store.addMovie("omkar", "Watch", "Thor Ragnarok")
+    # the change that reaches snapshotEvery only wakes the writer
+    assert len((tmp_path / WAL_NAME).read_text().splitlines()) == 3
+
+    store.startWriter()
+    deadline = time.monotonic() + 5
+    while ((tmp_path / WAL_NAME).read_text() or (tmp_path / SNAPSHOT_WAL_NAME).exists()) \
+            and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert (tmp_path / WAL_NAME).read_text() == ""
+    assert not (tmp_path / SNAPSHOT_WAL_NAME).exists()
+    assert readUserMovieLists(tmp_path, "omkar") == {"Watch": ["Joker", "Thor Ragnarok"]}
+
+    store.addMovie("omkar", "Watch", "Morbius")
+    restarted = ListStore()
+    restarted.open(tmp_path)
+    assert restarted["omkar"]["Watch"] == ["Joker", "Thor Ragnarok", "Morbius"]
+    store.close()
+
+
+def testChangesLandWhileShardsAreWritten(tmp_path, monkeypatch):
+    store = ListStore()
+    store.open(tmp_path)
+    store.createList("omkar", "Watch")
+    writing, release = threading.Event(), threading.Event()
+
+    def slowSave(lists, user, dirPath):
+        writing.set()
+        release.wait(5)
+        saveUserMovieLists(lists, user, dirPath)
+
+    monkeypatch.setattr("backend.repositories.listsRepo.saveUserMovieLists", slowSave)
+    snapshotter = threading.Thread(target=store.snapshot)
+    snapshotter.start()
+    assert writing.wait(5)
+    store.addMovie("khushi", "Favorites", "Joker")  # doesn't wait for the shard write
+    release.set()
+    snapshotter.join(5)
+
+    assert readUserMovieLists(tmp_path, "omkar") == {"Watch": []}
+    restarted = ListStore()
+    restarted.open(tmp_path)
+    assert restarted["omkar"] == {"Watch": []}
+    assert restarted["khushi"] == {"Favorites": ["Joker"]}
+
+
+def testUnfinishedSnapshotReplayedOnOpen(tmp_path, monkeypatch):
+    store = ListStore()
+    store.open(tmp_path)
+    store.createList("omkar", "Watch")
+
+    def failingSave(lists, user, dirPath):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("backend.repositories.listsRepo.saveUserMovieLists", failingSave)
+    with pytest.raises(OSError):
+        store.snapshot()
+    store.addMovie("omkar", "Watch", "Joker")
+
+    restarted = ListStore()
+    restarted.open(tmp_path)
+    assert restarted == {"omkar": {"Watch": ["Joker"]}}
+
+
+def testCloseFoldsWalIntoSnapshot(tmp_path):
+    store = ListStore()
+    store.open(tmp_path)
+    store.createList("omkar", "Watch")
+    store.close()
+    assert json.loads(shardPath(tmp_path, "omkar").read_text()) == {"Watch": []}
+    assert (tmp_path / WAL_NAME).read_text() == ""
+
+
+def testLoadsOnlyTheShardsItIsAskedFor(tmp_path):
+    saveUserMovieLists({"Favorites": ["Joker"]}, "khushi", tmp_path)
+    saveUserMovieLists({"Watch": ["Morbius"]}, "omkar", tmp_path)
+    store = ListStore()
+    store.open(tmp_path)
+    assert dict(store) == {}
+
+    assert store["khushi"] == {"Favorites": ["Joker"]}
+    assert "nobody" not in store
+    assert dict(store) == {"khushi": {"Favorites": ["Joker"]}}
+
+
+def testSnapshotRewritesOnlyChangedShards(tmp_path):
+    saveUserMovieLists({"Watch": ["Morbius"]}, "omkar", tmp_path)
+    untouched = shardPath(tmp_path, "omkar").stat().st_mtime_ns
+    store = ListStore()
+    store.open(tmp_path)
+    store.createList("khushi", "Favorites")
+    store.snapshot()
+
+    assert readUserMovieLists(tmp_path, "khushi") == {"Favorites": []}
+    assert shardPath(tmp_path, "omkar").stat().st_mtime_ns == untouched
+
+
+def testMovieListKeepsOrderWithoutRepeats():
+    movies = MovieList(["Joker", "Morbius"])
+    movies.add("Joker")
+    movies.add("Thor")
+    movies.discard("Morbius")
+    assert movies == ["Joker", "Thor"]
+    movies.move("Thor", 0)
+    movies.move("Joker", 99)
+    assert movies == ["Thor", "Joker"]
+    assert movies.page(1, 5) == ["Joker"]
+    assert movies.page(5) == []
+
+
+def testReorderSurvivesRestart(tmp_path):
+    store = ListStore()
+    store.open(tmp_path)
+    for title in ["Joker", "Morbius", "Thor"]:
+        store.addMovie("khushi", "Favorites", title)
+    store.moveMovie("khushi", "Favorites", "Thor", 1)
+    store.close()
+
+    restarted = ListStore()
+    restarted.open(tmp_path)
+    assert restarted["khushi"]["Favorites"] == ["Joker", "Thor", "Morbius"]
+    assert isinstance(restarted["khushi"]["Favorites"], MovieList)
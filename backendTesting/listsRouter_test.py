@@ -551,3 +551,80 @@ class TestDeleteList:
         from backend.routers.listsRouter import userMovieLists
         assert "Watch" not in userMovieLists["khushi"]
 
+
+
+class TestPagedAndReorderedLists:
+    """Tests for ?list=&offset=&limit= on GET /{username} and POST /move"""
+
+    @pytest.fixture(autouse=True)
+    def setup_lists(self, mock_valid_user):
+        client.post("/create", params={"username": "khushi", "listName": "Watch", "sessionToken": "abc"})
+        for title in ["Joker", "Morbius", "Thor", "Inception"]:
+            client.post(
+                "/add",
+                params={"username": "khushi", "listName": "Watch", "movieTitle": title, "sessionToken": "abc"}
+            )
+
+    def test_view_one_page_of_a_list(self, mock_valid_user):
+        response = client.get(
+            "/khushi",
+            params={"sessionToken": "abc", "list": "Watch", "offset": 1, "limit": 2}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"list": "Watch", "total": 4, "offset": 1, "movies": ["Morbius", "Thor"]}
+
+    def test_view_page_of_missing_list(self, mock_valid_user):
+        response = client.get("/khushi", params={"sessionToken": "abc", "list": "Nope"})
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "List not found"
+
+    def test_view_bad_page_bounds(self, mock_valid_user):
+        response = client.get("/khushi", params={"sessionToken": "abc", "offset": -1})
+
+        assert response.status_code == 400
+
+    def test_move_movie_to_front(self, mock_valid_user):
+        response = client.post(
+            "/move",
+            params={"username": "khushi", "listName": "Watch", "movieTitle": "Thor", "position": 0,
+                    "sessionToken": "abc"}
+        )
+
+        assert response.status_code == 200
+        from backend.routers.listsRouter import userMovieLists
+        assert userMovieLists["khushi"]["Watch"] == ["Thor", "Joker", "Morbius", "Inception"]
+
+    def test_move_movie_not_in_list(self, mock_valid_user):
+        response = client.post(
+            "/move",
+            params={"username": "khushi", "listName": "Watch", "movieTitle": "Dune", "position": 0,
+                    "sessionToken": "abc"}
+        )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Movie not in list"
+
+    def test_view_list_expanded_with_summaries(self, mock_valid_user, tmp_path, monkeypatch):
+        import json
+        from backend.routers import listsRouter
+        from backend.repositories.movieSummaries import MovieSummaryCache
+        (tmp_path / "Joker").mkdir()
+        (tmp_path / "Joker" / "metadata.json").write_text(json.dumps({"title": "Joker", "movieIMDbRating": 8.4}))
+        monkeypatch.setattr(listsRouter, "movieSummaries", MovieSummaryCache(str(tmp_path)))
+
+        response = client.get(
+            "/khushi",
+            params={"sessionToken": "abc", "list": "Watch", "limit": 2, "expand": "summary"}
+        )
+
+        assert response.status_code == 200
+        movies = response.json()["movies"]
+        assert movies[0]["title"] == "Joker" and movies[0]["movieIMDbRating"] == 8.4
+        assert movies[1] == {"title": "Morbius"}
+
+    def test_view_lists_bad_expand(self, mock_valid_user):
+        response = client.get("/khushi", params={"sessionToken": "abc", "expand": "reviews"})
+
+        assert response.status_code == 400
@@ -0,0 +1,121 @@
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers.adminRouter import router
+from backend.services.changeFeed import changeFeed
+from backend.services.movieImport import importMovies
+
+app = FastAPI()
+app.include_router(router, prefix="/admin")
+client = TestClient(app)
+
+
+def movieRow(title, **overrides):
+    row = {
+        "title": title, "movieIMDbRating": 7.5, "totalRatingCount": 1000, "totalUserReviews": "1K",
+        "totalCriticReviews": "100", "metaScore": "70", "movieGenres": ["Drama"], "directors": ["Someone"],
+        "datePublished": "2020-01-01", "creators": ["Someone"], "mainStars": ["A", "B"], "description": "A movie.",
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def dataPath(tmp_path):
+    (tmp_path / "Joker").mkdir()
+    changeFeed.clear()
+    yield tmp_path
+    changeFeed.clear()
+
+
+def testNdjsonImportReportsEachBadRow(dataPath):
+    lines = [
+        json.dumps(movieRow("Dune")),
+        json.dumps(movieRow("Bad Rating", movieIMDbRating="high")),
+        "{not json",
+        json.dumps(movieRow("Joker")),
+        json.dumps(movieRow("Dune")),
+        json.dumps(movieRow("Heat")),
+    ]
+    report = importMovies(io.StringIO("\n".join(lines)), "ndjson", str(dataPath), batchSize=2)
+
+    assert report["total"] == 6
+    assert [m["title"] for m in report["movies"]] == ["Dune", "Heat"]
+    assert [(e["row"], e["error"].split(":")[0]) for e in report["errors"]] == [
+        (2, "movieIMDbRating"),
+        (3, "Invalid JSON"),
+        (4, "Movie already exists"),
+        (5, "Duplicate title in import"),
+    ]
+    metadata = json.loads((dataPath / "Heat" / "metadata.json").read_text())
+    assert metadata == movieRow("Heat")
+    assert not list(dataPath.glob("*/*.tmp"))
+    # every new movie lands in the change feed in one append
+    assert [c["key"] for c in changeFeed.since(0)["changes"]] == ["Dune", "Heat"]
+
+
+def testCsvListFields(dataPath):
+    csvText = (
+        "title,movieIMDbRating,totalRatingCount,totalUserReviews,totalCriticReviews,metaScore,"
+        "movieGenres,directors,datePublished,creators,mainStars,description\n"
+        'Heat,8.3,700000,1.2K,200,76,Crime|Drama,Michael Mann,1995-12-15,"[""Michael Mann""]",Al Pacino|Robert De Niro,Heist.\n'
+    )
+    report = importMovies(io.StringIO(csvText), "csv", str(dataPath))
+
+    assert report["created"] == 1
+    metadata = json.loads((dataPath / "Heat" / "metadata.json").read_text())
+    assert metadata["movieGenres"] == ["Crime", "Drama"]
+    assert metadata["creators"] == ["Michael Mann"]
+    assert metadata["movieIMDbRating"] == 8.3
+
+
+def testImportEndpoint(dataPath, monkeypatch):
+    monkeypatch.setattr("backend.routers.adminRouter.DATA_PATH", str(dataPath))
+    response = client.post("/admin/movies/import?format=ndjson", content=json.dumps(movieRow("Dune")) + "\n")
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 1
+    assert (dataPath / "Dune" / "metadata.json").exists()
+
+
+def testImportEndpointRejectsUnknownFormat():
+    response = client.post("/admin/movies/import?format=xml", content="<movies/>")
+    assert response.status_code == 400
+
+
+def testControlCharacterTitlesRejected(dataPath):
+    lines = [json.dumps(movieRow("Nul\x00Title")), json.dumps(movieRow("Tab\tTitle")), json.dumps(movieRow("Heat"))]
+    report = importMovies(io.StringIO("\n".join(lines)), "ndjson", str(dataPath))
+
+    assert [m["title"] for m in report["movies"]] == ["Heat"]
+    assert [(e["row"], e["error"]) for e in report["errors"]] == [(1, "Invalid title"), (2, "Invalid title")]
+
+
+def testReservedAndPathTitlesRejected(dataPath):
+    titles = [".trash", ".hidden", "..", "Users", "movielists", "a/b", "a\\b", "Heat"]
+    report = importMovies(io.StringIO("\n".join(json.dumps(movieRow(title)) for title in titles)), "ndjson", str(dataPath))
+
+    assert [m["title"] for m in report["movies"]] == ["Heat"]
+    assert {e["error"] for e in report["errors"]} == {"Invalid title"}
+    assert sorted(path.name for path in dataPath.iterdir()) == ["Heat", "Joker"]
+
+
+def testCreatedMoviesRecordedWhenImportFails(dataPath, monkeypatch):
+    from backend.services import movieImport
+    writeMovie = movieImport._writeMovie
+
+    def failOnBoom(path, movie):
+        if movie.title == "Boom":
+            raise RuntimeError("disk on fire")
+        writeMovie(path, movie)
+
+    monkeypatch.setattr(movieImport, "_writeMovie", failOnBoom)
+    lines = [json.dumps(movieRow("Dune")), json.dumps(movieRow("Boom"))]
+    with pytest.raises(RuntimeError):
+        importMovies(io.StringIO("\n".join(lines)), "ndjson", str(dataPath), batchSize=1)
+
+    assert [c["key"] for c in changeFeed.since(0)["changes"]] == ["Dune"]
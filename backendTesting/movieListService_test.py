@@ -4,7 +4,7 @@ from fastapi import HTTPException
 from unittest.mock import Mock, patch, MagicMock, mock_open
 import sys
 import json
-from backend.services.movieListServices import saveMovieList,readAllMovieList
+from backend.services.movieListServices import saveMovieList,readAllMovieList,shardPath,migrateMovieLists
 from unittest import TestCase
 
 @pytest.fixture
@@ -26,9 +26,9 @@ TEST_DATA = {
 class TestSaveMovieList:
     def testCreateMovieListForNewUser(self, mockBaseDir):
         
-        #Create a mock test file to store the user's movie lists
-        movieLists = Path(mockBaseDir/"movieLists.json")
+        #Each user's lists are stored in their own shard file
         name = "test"
+        movieLists = shardPath(mockBaseDir, name)
         listName = "favourites"
         fakeMovieList =TEST_DATA[name][listName]
         data = {}
@@ -41,14 +41,12 @@ class TestSaveMovieList:
                 data = json.load(jsonFile)
             except json.JSONDecodeError:
                 data = {}
-        print(data[name][listName])
-        assert name in data
-        assert listName in data[name]
+        assert listName in data
+        assert data[listName] == fakeMovieList
 
     def testCreateMovieListWithExistingUsers(self, mockBaseDir):
         
         #Create a mock test file to store the user's movie lists
-        movieLists = Path(mockBaseDir/"movieLists.json")
         name = "test"
         listName = "favourites"
         fakeMovieList =TEST_DATA[name][listName]
@@ -57,12 +55,7 @@ class TestSaveMovieList:
 
         saveMovieList( ["Morbius", "Joker"], "Not Test", "Cool", mockBaseDir)
         saveMovieList(["Morbius", "Joker"], name, "Cool", mockBaseDir)
-        with open(movieLists, 'r') as jsonFile:
-            try:
-                data = json.load(jsonFile)
-            except json.JSONDecodeError:
-                data = {}
-            jsonFile.close()
+        data = readAllMovieList(mockBaseDir)
         
         assert name in data
         assert listName in data[name]
@@ -74,20 +67,13 @@ class TestSaveMovieList:
 
     def testOverwrittingWithSaveMovieList(self, mockBaseDir):   
         fakeMovieList =["Inception", "Spider-Man", "The Shining"]
-        #Create a mock test file to store the user's movie lists
-        movieLists = Path(mockBaseDir/"movieLists.json")
         name = "test"
         listName = "favourites"
         data = {}
         saveMovieList(fakeMovieList, name, listName, mockBaseDir)
         saveMovieList(["Morbius","Joker"],name, listName, mockBaseDir)
 
-        with open(movieLists, 'r') as jsonFile:
-            try:
-                data = json.load(jsonFile)
-            except json.JSONDecodeError:
-                data = {}
-            jsonFile.close()
+        data = readAllMovieList(mockBaseDir, name)
         
         for movie in data[name][listName]:
             assert movie in ["Morbius", "Joker"]
@@ -113,5 +99,19 @@ class TestReadAllMovieLists:
         data = readAllMovieList(mockBaseDir)
         assert data == {}
 
+    def testReadOnlyRequestedUsersShard(self, mockBaseDir):
+        saveMovieList(["Joker"], "test", "cool", mockBaseDir)
+        saveMovieList(["Morbius"], "omkar", "not cool", mockBaseDir)
+        shardPath(mockBaseDir, "omkar").write_text("not json")
+
+        assert readAllMovieList(mockBaseDir, "test") == {"test": {"cool": ["Joker"]}}
+        assert readAllMovieList(mockBaseDir, "nobody") == {}
+
+    def testMigrateSingleFileIntoShards(self, mockBaseDir):
+        mockBaseDir.mkdir(parents=True)
+        (mockBaseDir/"movieLists.json").write_text(json.dumps(TEST_DATA))
+
+        migrateMovieLists(mockBaseDir)
 
-            
\ No newline at end of file
+        assert readAllMovieList(mockBaseDir) == TEST_DATA
+        assert (mockBaseDir/"movieLists.json").read_text() == ""
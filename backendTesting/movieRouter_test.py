@@ -210,7 +210,7 @@ class TestAddReview:
             "review": "Amazing movie!"
         }
 
-        with patch("backend.routers.movieRouter.User.getCurrentUser", return_value={"username": "Khushi"}):
+        with patch("backend.routers.movieRouter.User.getCurrentUser", return_value=type("U", (), {"username": "Khushi"})):
             response = client.post("/Joker/review?sessionToken=abc", json=review_payload)
 
         assert response.status_code == 200
@@ -256,7 +256,7 @@ class TestAddReview:
             "review": "Good"
         }
 
-        with patch("backend.routers.movieRouter.User.getCurrentUser", return_value={"username": "Khushi"}):
+        with patch("backend.routers.movieRouter.User.getCurrentUser", return_value=type("U", (), {"username": "Khushi"})):
             response = client.post("/UnknownMovie/review?sessionToken=abc", json=payload)
 
         assert response.status_code == 404
@@ -284,9 +284,32 @@ class TestAddReview:
             "review": "Good film"
         }
 
-        with patch("backend.routers.movieRouter.User.getCurrentUser", return_value={"username": "Khushi"}):
+        with patch("backend.routers.movieRouter.User.getCurrentUser", return_value=type("U", (), {"username": "Khushi"})):
             response = client.post("/Joker/review?sessionToken=abc", json=review_payload)
 
         assert response.status_code == 200
         assert len(movieRouter.movie_reviews_memory["joker"]) == 1
         assert movieRouter.movie_reviews_memory["joker"][0].review == "Good film"
+
+    def test_add_review_duplicate_rejected(self, tmp_path, monkeypatch):
+        """Same user reviewing the same movie twice -> 400"""
+
+        from backend.routers import movieRouter
+        movieRouter.movie_reviews_memory.clear()
+
+        movie_dir = tmp_path / "Joker"
+        movie_dir.mkdir()
+        (movie_dir / "metadata.json").write_text(json.dumps(JOKER_METADATA), encoding="utf-8")
+
+        monkeypatch.setattr("backend.routers.movieRouter.DATA_PATH", str(tmp_path))
+
+        review_payload = {**DUMMY_REVIEW, "user": "Khushi"}
+
+        with patch("backend.routers.movieRouter.User.getCurrentUser", return_value=type("U", (), {"username": "KHUSHI"})):
+            first = client.post("/Joker/review?sessionToken=abc", json=review_payload)
+            second = client.post("/Joker/review?sessionToken=abc", json=review_payload)
+
+        assert first.status_code == 200
+        assert second.status_code == 400
+        assert second.json()["detail"] == "You have already reviewed this movie"
+        assert len(movieRouter.movie_reviews_memory["joker"]) == 1
@@ -0,0 +1,47 @@
+import json
+import os
+
+import pytest
+
+from backend.repositories.movieSummaries import MovieSummaryCache
+
+
+def writeMovie(dataPath, title, rating):
+    folder = dataPath / title
+    folder.mkdir(exist_ok=True)
+    metadata = {"title": title, "movieIMDbRating": rating, "movieGenres": ["Drama"], "description": "long text"}
+    (folder / "metadata.json").write_text(json.dumps(metadata))
+    (folder / "movieReviews.csv").write_text("should,never,be,read\n")
+    return folder / "metadata.json"
+
+
+@pytest.fixture
+def summaries(tmp_path):
+    return MovieSummaryCache(str(tmp_path))
+
+
+def testBatchLookupReturnsSummariesOnly(summaries, tmp_path):
+    writeMovie(tmp_path, "Joker", 8.4)
+    writeMovie(tmp_path, "Thor", 7.9)
+
+    found = summaries.lookup(["Joker", "Thor", "Joker", "Dune", "../etc"])
+
+    assert found["Joker"]["movieIMDbRating"] == 8.4
+    assert "description" not in found["Joker"] and "reviews" not in found["Joker"]
+    assert found["Dune"] is None and found["../etc"] is None
+    assert summaries.misses == 2
+
+
+def testCachedUntilMetadataChanges(summaries, tmp_path):
+    metadataPath = writeMovie(tmp_path, "Joker", 8.4)
+    summaries.lookup(["Joker"])
+    summaries.lookup(["Joker"])
+    assert (summaries.hits, summaries.misses) == (1, 1)
+
+    writeMovie(tmp_path, "Joker", 9.0)
+    stat = os.stat(metadataPath)
+    os.utime(metadataPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert summaries.lookup(["Joker"])["Joker"]["movieIMDbRating"] == 9.0
+
+    metadataPath.unlink()
+    assert summaries.lookup(["Joker"])["Joker"] is None
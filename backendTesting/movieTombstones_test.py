@@ -0,0 +1,75 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.repositories.movieTombstones import MovieReaper, trashDir
+from backend.repositories.reviewsRepo import reviewStore
+from backend.schemas.movieReviews import movieReviews
+
+
+@pytest.fixture
+def dataPath(tmp_path):
+    folder = tmp_path / "data" / "Joker"
+    folder.mkdir(parents=True)
+    (folder / "metadata.json").write_text('{"title": "Joker"}')
+    (folder / "movieReviews.csv").write_text("x" * 1000)
+    return tmp_path / "data"
+
+
+def testTombstoneHidesMovieAndItsReviews(dataPath):
+    reaper = MovieReaper()
+    reviewStore.clear()
+    reviewStore.addReview("Joker", movieReviews(dateOfReview="2020-01-01", user="khushi", usefulnessVote=0,
+                                                totalVotes=0, userRatingOutOf10=9, reviewTitle="Good",
+                                                review="Good"))
+
+    entry = reaper.tombstone(str(dataPath), "Joker")
+
+    assert not (dataPath / "Joker").exists()
+    assert entry["status"] == "pending"
+    assert reviewStore.reviewsForMovie("Joker") == []
+    assert reviewStore.countByUser("khushi") == 0
+    # the title can be reused before the old files are gone
+    (dataPath / "Joker").mkdir()
+    reaper.drain()
+    assert (dataPath / "Joker").exists()
+    assert reaper.status()["recent"][0]["bytes"] == 1000 + len('{"title": "Joker"}')
+
+
+def testRecoverPicksUpLeftoverTrash(dataPath):
+    MovieReaper().tombstone(str(dataPath), "Joker")  # this reaper "crashes" before reaping
+
+    restarted = MovieReaper()
+    assert restarted.recover(str(dataPath)) == 1
+    restarted.drain()
+    assert os.listdir(trashDir(str(dataPath))) == []
+    assert restarted.reaped == 1
+
+
+def testBackgroundThreadReaps(dataPath):
+    reaper = MovieReaper()
+    reaper.start(str(dataPath))
+    reaper.tombstone(str(dataPath), "Joker")
+    reaper.stop()
+    assert reaper.status()["pending"] == 0
+    assert os.listdir(trashDir(str(dataPath))) == []
+
+
+def testTrashIsOutsideTheCatalog(dataPath, monkeypatch):
+    from backend.routers import movieRouter
+    MovieReaper().tombstone(str(dataPath), "Joker")
+    assert os.path.commonpath([trashDir(str(dataPath)), str(dataPath)]) != str(dataPath)
+    assert os.listdir(dataPath) == []
+
+    # the trash can't be reviewed as if it were a movie
+    monkeypatch.setattr(movieRouter, "DATA_PATH", str(dataPath))
+    app = FastAPI()
+    app.include_router(movieRouter.router, prefix="/movies")
+    review = {"dateOfReview": "2024-01-01", "user": "khushi", "usefulnessVote": 0, "totalVotes": 0,
+              "userRatingOutOf10": 9, "reviewTitle": "Trash", "review": "Trash"}
+    with patch("backend.routers.movieRouter.User.getCurrentUser", return_value=type("U", (), {"username": "khushi"})):
+        response = TestClient(app).post("/movies/.trash/review?sessionToken=abc", json=review)
+    assert response.status_code == 404
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+import pytest
+from backend.users.passwordHasher import PasswordHasher, HasherBusyError, hashRounds
+
+
+class TestPasswordHasher:
+    def testHashAndVerify(self):
+        hasher = PasswordHasher(workers=2)
+        hashed = hasher.hash("password")
+        assert isinstance(hashed, bytes)
+        assert hasher.verify("password", hashed) is True
+        assert hasher.verify("wrong", hashed) is False
+
+    def testErrorsPropagate(self):
+        hasher = PasswordHasher(workers=1, useProcesses=False)
+        with pytest.raises(ValueError, match="72 bytes"):
+            hasher.hash("a" * 100)
+
+    def testBusyWhenQueueFull(self):
+        hasher = PasswordHasher(workers=1, maxPending=1, acquireTimeout=0.05, useProcesses=False)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=hasher._run, args=("hash", slow))
+        worker.start()
+        started.wait(5)
+        try:
+            with pytest.raises(HasherBusyError):
+                hasher._run("hash", lambda: None)
+            with pytest.raises(HasherBusyError):
+                asyncio.run(hasher.hashAsync("password"))
+        finally:
+            release.set()
+            worker.join()
+
+        # the slot is handed back once the job finishes
+        assert hasher._run("hash", lambda: 42) == 42
+        assert hasher.stats()["operations"]["hash"]["rejected"] == 2
+
+    def testAsyncApiAndMetrics(self):
+        hasher = PasswordHasher(workers=1, useProcesses=False)
+        hashed = asyncio.run(hasher.hashAsync("password"))
+        assert asyncio.run(hasher.verifyAsync("password", hashed)) is True
+
+        stats = hasher.stats()
+        assert stats["pending"] == 0
+        assert stats["operations"]["hash"]["count"] == 1
+        assert stats["operations"]["verify"]["count"] == 1
+        assert stats["operations"]["verify"]["avgMs"] > 0
+
+    def testBulkHashingLeavesSlotsForInteractiveCallers(self, monkeypatch):
+        release = threading.Event()
+
+        def fakeHash(password, rounds):
+            if password.startswith("bulk"):
+                release.wait(5)
+            return password.encode()
+
+        monkeypatch.setattr("backend.users.passwordHasher._hashPassword", fakeHash)
+        hasher = PasswordHasher(workers=4, maxPending=4, acquireTimeout=0.5, useProcesses=False)
+        hashes = []
+        importer = threading.Thread(target=lambda: hashes.extend(hasher.hashMany([f"bulk{i}" for i in range(10)])))
+        importer.start()
+        try:
+            deadline = time.monotonic() + 5
+            while hasher.pending < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # the batch shows up in the queue depth but only holds half of it
+            assert hasher.stats()["pending"] == 2
+            assert hasher.hash("interactive") == b"interactive"
+        finally:
+            release.set()
+            importer.join(5)
+        assert hashes == [f"bulk{i}".encode() for i in range(10)]
+        stats = hasher.stats()
+        assert stats["pending"] == 0
+        assert stats["operations"]["hash"]["count"] == 11
+        hasher.shutdown()
+
+
+class TestCalibration:
+    def testTinyBudgetUsesMinimumCost(self):
+        hasher = PasswordHasher(workers=1, useProcesses=False)
+        assert hasher.calibrate(budgetMs=0.001, minRounds=4) == 4
+        assert hashRounds(hasher.hash("password")) == 4
+
+    def testHugeBudgetCappedAtMaximumCost(self):
+        hasher = PasswordHasher(workers=1, useProcesses=False)
+        assert hasher.calibrate(budgetMs=10 ** 9, minRounds=4, maxRounds=9) == 9
+
+    def testNeedsRehash(self):
+        hasher = PasswordHasher(workers=1, useProcesses=False)
+        hasher.rounds = 4
+        hashed = hasher.hash("password")
+        assert hasher.needsRehash(hashed) is False
+        hasher.rounds = 5
+        assert hasher.needsRehash(hashed) is True
+        # a hash stronger than the target is kept, not rewritten at the lower cost
+        hasher.rounds = 3
+        assert hasher.needsRehash(hashed) is False
+
+    def testCalibrationSharedThroughCache(self, tmp_path, monkeypatch):
+        cachePath = tmp_path / "hashCalibration.json"
+        first = PasswordHasher(workers=1, useProcesses=False)
+        picked = first.calibrate(budgetMs=10 ** 9, minRounds=4, maxRounds=9, cachePath=cachePath)
+
+        # a second worker reuses the stored pick instead of probing again
+        monkeypatch.setattr("backend.users.passwordHasher._timeHash", lambda rounds: pytest.fail("probed twice"))
+        second = PasswordHasher(workers=1, useProcesses=False)
+        assert second.calibrate(budgetMs=10 ** 9, minRounds=4, maxRounds=9, cachePath=cachePath) == picked == 9
+        # other settings mean a fresh calibration
+        monkeypatch.setattr("backend.users.passwordHasher._timeHash", lambda rounds: 1.0)
+        assert second.calibrate(budgetMs=1, minRounds=4, maxRounds=9, cachePath=cachePath) == 4
@@ -0,0 +1,96 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.users.penaltyLedger import PenaltyLedger
+from backend.users.penaltyPoints import PenaltyPoints
+from backend.users.user import User
+
+
+@pytest.fixture
+def ledger(monkeypatch, tmp_path):
+    ledger = PenaltyLedger(tmp_path / "penalties.ndjson")
+    monkeypatch.setattr("backend.users.penaltyPoints.penaltyLedger", ledger)
+    monkeypatch.setattr("backend.users.user.penaltyLedger", ledger)
+    return ledger
+
+
+@pytest.fixture
+def user():
+    return User("ledgeruser", "ledger@test.com", "", save=False, passwordHash=b"x")
+
+
+def testSequenceIdsIncrease(ledger, user):
+    penalties = [PenaltyPoints(1, user, f"r{i}") for i in range(3)]
+    assert [p.seq for p in penalties] == [1, 2, 3]
+    assert len({p.dateIssued for p in penalties}) == 3
+
+
+def testRunningTotalFollowsExpiry(ledger, user):
+    PenaltyPoints(2, user, "long")
+    short = PenaltyPoints(1, user, "short", ttl=timedelta(minutes=5))
+    assert user.totalPenaltyPoints() == 3
+    assert ledger.expireDue(short.expiresAt + timedelta(seconds=1)) == 1
+    assert user.activePenaltyPoints == 2
+
+
+def testExtendingExpiryKeepsPenaltyActive(ledger, user):
+    penalty = PenaltyPoints(2, user, "extended", ttl=timedelta(minutes=5))
+    oldExpiry = penalty.expiresAt
+    penalty.expiresAt = oldExpiry + timedelta(days=1)
+    assert ledger.expireDue(oldExpiry + timedelta(seconds=1)) == 0
+    assert user.activePenaltyPoints == 2
+
+
+def testLapsedPenaltyCanBeReinstated(ledger, user):
+    penalty = PenaltyPoints(2, user, "back again")
+    penalty.expiresAt = datetime.now() - timedelta(seconds=1)
+    assert user.totalPenaltyPoints() == 0
+    penalty.expiresAt = datetime.now() + timedelta(days=1)
+    assert user.totalPenaltyPoints() == 2
+
+
+def testWritesAreDeferredUntilFlush(ledger, user):
+    PenaltyPoints(1, user, "queued")
+    assert not ledger.path.exists()
+    ledger.flush()
+    lines = ledger.path.read_text().splitlines()
+    assert json.loads(lines[0])["username"] == "ledgeruser"
+
+
+def testWriterCompactsOnceFileOutgrowsActivePenalties(ledger, user):
+    ledger.compactRatio, ledger.compactMin = 2, 4
+    lapsed = [PenaltyPoints(1, user, f"lapsed{i}") for i in range(6)]
+    PenaltyPoints(1, user, "kept")
+    for penalty in lapsed:
+        penalty.expiresAt = datetime.now() - timedelta(seconds=1)
+    ledger.expireDue()
+    ledger.startWriter(interval=0.01)
+    try:
+        deadline = datetime.now() + timedelta(seconds=5)
+        while ledger.fileLength != 2 and datetime.now() < deadline:
+            ledger._stopped.wait(0.01)
+        # rewritten by the writer thread, without waiting for close()
+        lines = [json.loads(line) for line in ledger.path.read_text().splitlines()]
+        assert lines == [{"lastSeq": 7}, {**lines[1], "reason": "kept"}]
+    finally:
+        ledger.close()
+
+
+def testRestoreAfterRestart(ledger, user, tmp_path, monkeypatch):
+    PenaltyPoints(2, user, "kept")
+    expired = PenaltyPoints(1, user, "lapsed")
+    expired.expiresAt = datetime.now() - timedelta(seconds=1)
+    ledger.close()
+
+    restarted = PenaltyLedger(ledger.path)
+    monkeypatch.setattr("backend.users.penaltyPoints.penaltyLedger", restarted)
+    monkeypatch.setattr("backend.users.user.penaltyLedger", restarted)
+    fresh = User("ledgeruser", "ledger@test.com", "", save=False, passwordHash=b"x")
+
+    assert PenaltyPoints.restoreAll({"ledgeruser": fresh}) == 1
+    assert fresh.totalPenaltyPoints() == 2
+    assert fresh.penaltyPointsList[0].reason == "kept"
+    # sequence ids keep counting up from before the restart
+    assert PenaltyPoints(1, fresh, "new").seq == 3
@@ -0,0 +1,110 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middleware.rateLimit import RateLimiter, RateLimitMiddleware, RouteGroup, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    groups = [RouteGroup("users", r"^/users/", capacity=2, ratePerSecond=1)]
+    return RateLimiter(groups, maxInFlight=4, clock=clock)
+
+
+@pytest.fixture
+def client(limiter):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+    @app.post("/users/login")
+    def login():
+        return {"ok": True}
+
+    @app.get("/users/me")
+    def me():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestTokenBucket:
+    def testBurstThenWait(self):
+        bucket = TokenBucket(capacity=2, ratePerSecond=0.5, now=0)
+        assert bucket.take(0) == 0
+        assert bucket.take(0) == 0
+        assert bucket.take(0) == pytest.approx(2.0)
+
+    def testRefillCappedAtCapacity(self):
+        bucket = TokenBucket(capacity=1, ratePerSecond=1, now=0)
+        bucket.take(0)
+        assert bucket.take(100) == 0
+        assert bucket.take(100) > 0
+
+
+class TestMiddleware:
+    def testRateLimitedWith429(self, client, clock, limiter):
+        assert client.post("/users/login").status_code == 200
+        assert client.post("/users/login").status_code == 200
+
+        response = client.post("/users/login")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        assert limiter.stats()["rejections"] == {"users": {"rateLimited": 1}}
+
+        clock.now += 1
+        assert client.post("/users/login").status_code == 200
+
+    def testReadsAreNotLimited(self, client):
+        for _ in range(5):
+            assert client.get("/users/me").status_code == 200
+
+    def testShedsWhenTooMuchInFlight(self, client, limiter):
+        limiter.inFlight = limiter.maxInFlight
+
+        response = client.post("/users/login")
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+        assert limiter.stats()["rejections"]["users"]["shed"] == 1
+
+    def testInFlightReleased(self, client, limiter):
+        client.post("/users/login")
+        assert limiter.inFlight == 0
+
+
+class TestLimiter:
+    def testSessionLimitedAcrossIps(self, limiter):
+        group = limiter.groups[0]
+        assert limiter.acquire(group, "1.1.1.1", "tok") == (0, 0.0)
+        assert limiter.acquire(group, "2.2.2.2", "tok") == (0, 0.0)
+        status, _ = limiter.acquire(group, "3.3.3.3", "tok")
+        assert status == 429
+
+    def testIpLimitedAcrossSessions(self, limiter):
+        group = limiter.groups[0]
+        limiter.acquire(group, "1.1.1.1", "a")
+        limiter.acquire(group, "1.1.1.1", "b")
+        status, _ = limiter.acquire(group, "1.1.1.1", "c")
+        assert status == 429
+
+
+class TestBucketEviction:
+    def testLeastRecentlyUsedBucketEvicted(self, clock):
+        limiter = RateLimiter([RouteGroup("g", r"^/", 1, 1)], maxBuckets=2, clock=clock)
+        group = limiter.groups[0]
+        for ip in ("a", "b", "c"):
+            limiter.acquire(group, ip, None)
+            limiter.release()
+        assert [key[2] for key in limiter.buckets] == ["b", "c"]
@@ -108,8 +108,101 @@ class TestGetReviewsByUser:
         assert response.status_code == 404
         assert response.json()["detail"] == "No reviews found for this user"
 
+    def test_get_user_reviews_paginated(self):
+        movieReviews_memory["joker"] = [
+            movieReviews(**{**DUMMY_REVIEW, "reviewTitle": f"Review {i}"}) for i in range(5)
+        ]
+
+        response = client.get("/user/Khushi?offset=1&limit=2")
+        assert response.status_code == 200
+        assert [r["reviewTitle"] for r in response.json()] == ["Review 1", "Review 2"]
+
+        response = client.get("/user/Khushi?offset=10")
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_get_user_reviews_bad_paging(self):
+        movieReviews_memory["joker"] = [movieReviews(**DUMMY_REVIEW)]
+
+        response = client.get("/user/Khushi?limit=0")
+        assert response.status_code == 400
+
+    def test_get_user_reviews_after_delete(self, tmp_path, monkeypatch):
+        movie_dir = tmp_path / "Joker"
+        movie_dir.mkdir()
+        monkeypatch.setattr("backend.routers.reviewRouter.DATA_PATH", str(tmp_path))
+        monkeypatch.setattr(
+            "backend.users.user.User.getCurrentUser",
+            lambda *a, **k: type("U", (), {"username": "Khushi"})
+        )
+        movieReviews_memory["joker"] = [movieReviews(**DUMMY_REVIEW)]
+
+        client.delete("/Joker/review/0?sessionToken=abc")
+
+        response = client.get("/user/Khushi")
+        assert response.status_code == 404
+
+class TestReviewIds:
+    """Tests for stable review ids on GET/PUT/DELETE /{title}/review/{reviewId}"""
+
+    @pytest.fixture(autouse=True)
+    def setup_movie(self, tmp_path, monkeypatch):
+        movie_dir = tmp_path / "Joker"
+        movie_dir.mkdir()
+        monkeypatch.setattr("backend.routers.reviewRouter.DATA_PATH", str(tmp_path))
+        monkeypatch.setattr(
+            "backend.users.user.User.getCurrentUser",
+            lambda *a, **k: type("U", (), {"username": "Khushi"})
+        )
+        movieReviews_memory["joker"] = [
+            movieReviews(**{**DUMMY_REVIEW, "reviewTitle": f"Review {i}"}) for i in range(3)
+        ]
+
+    def test_get_review_by_id(self):
+        response = client.get("/Joker/review/1")
+        assert response.status_code == 200
+        assert response.json()["reviewTitle"] == "Review 1"
+        assert response.json()["reviewId"] == 1
+
+    def test_get_review_unknown_id(self):
+        response = client.get("/Joker/review/99")
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Review not found"
+
+    def test_ids_survive_delete(self):
+        assert client.delete("/Joker/review/0?sessionToken=abc").status_code == 200
+
+        # later reviews keep their ids instead of shifting down
+        response = client.get("/Joker/review/2")
+        assert response.json()["reviewTitle"] == "Review 2"
+        assert client.get("/Joker/review/0").status_code == 404
+
+        response = client.put("/Joker/review/1?sessionToken=abc",
+                              json={**DUMMY_REVIEW, "reviewTitle": "Edited"})
+        assert response.status_code == 200
+        assert response.json()["reviewId"] == 1
+        assert movieReviews_memory["joker"][1].reviewTitle == "Edited"
+
+    def test_changes_recorded_in_feed(self):
+        from backend.services.changeFeed import changeFeed
+        changeFeed.clear()
+
+        client.put("/Joker/review/1?sessionToken=abc", json=DUMMY_REVIEW)
+        client.delete("/Joker/review/1?sessionToken=abc")
+
+        changes = changeFeed.since(0)["changes"]
+        assert [(c["entity"], c["action"], c["reviewId"]) for c in changes] == [
+            ("review", "update", 1), ("review", "delete", 1)
+        ]
+
+    def test_deleted_id_not_reused(self):
+        client.delete("/Joker/review/2?sessionToken=abc")
+        added = movieReviews_memory.addReview("Joker", movieReviews(**DUMMY_REVIEW))
+        assert added.reviewId == 3
+
+
 class TestUpdateReview:
-    """Tests for PUT /{title}/review/{index}"""
+    """Tests for PUT /{title}/review/{reviewId}"""
 
     def test_update_review_success(self, tmp_path, monkeypatch):
         """User updates their own review successfully"""
@@ -225,7 +318,7 @@ class TestUpdateReview:
         assert "Movie 'Joker' not found" in response.json()["detail"]
 
 class TestDeleteReview:
-    """Tests for DELETE /{title}/review/{index}"""
+    """Tests for DELETE /{title}/review/{reviewId}"""
 
     def test_delete_review_success(self, tmp_path, monkeypatch):
         """User deletes their own review -> success"""
@@ -249,7 +342,7 @@ class TestDeleteReview:
 
         assert response.status_code == 200
         assert "Deleted review" in response.json()["message"]
-        assert movieReviews_memory["joker"] == []
+        assert movieReviews_memory["joker"] == {}
 
 
     def test_delete_review_unauthenticated(self, tmp_path, monkeypatch):
@@ -360,7 +453,7 @@ class TestDeleteReview:
 
         assert response.status_code == 200
         assert "Deleted review" in response.json()["message"]
-        assert movieReviews_memory["joker"] == []
+        assert movieReviews_memory["joker"] == {}
 
 
     def test_delete_review_user_not_admin_forbidden(self, tmp_path, monkeypatch):
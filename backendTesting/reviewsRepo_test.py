@@ -0,0 +1,137 @@
+import pytest
+from backend.repositories.reviewsRepo import ReviewStore, reviewDay
+from backend.schemas.movieReviews import movieReviews
+
+REVIEW = {
+    "dateOfReview": "2024-01-01",
+    "user": "Khushi",
+    "usefulnessVote": 5,
+    "totalVotes": 7,
+    "userRatingOutOf10": 9,
+    "reviewTitle": "Amazing!",
+    "review": "Great movie!"
+}
+
+
+@pytest.fixture
+def store():
+    return ReviewStore()
+
+
+class TestReviewIds:
+    """Tests for stable per-movie review ids"""
+
+    def testIdsAreSequentialPerMovie(self, store):
+        first = store.addReview("Joker", movieReviews(**REVIEW))
+        second = store.addReview("Joker", movieReviews(**REVIEW))
+        other = store.addReview("Batman", movieReviews(**REVIEW))
+        assert (first.reviewId, second.reviewId, other.reviewId) == (0, 1, 0)
+
+    def testRemoveKeepsOtherIds(self, store):
+        store["joker"] = [REVIEW, REVIEW, REVIEW]
+        store.removeReview("Joker", 1)
+        assert list(store["joker"]) == [0, 2]
+        assert store.getReview("Joker", 2).reviewId == 2
+        assert store.addReview("Joker", movieReviews(**REVIEW)).reviewId == 3
+
+    def testMissingIdReturnsNone(self, store):
+        assert store.getReview("Joker", 0) is None
+        assert store.removeReview("Joker", 0) is None
+        assert store.replaceReview("Joker", 0, movieReviews(**REVIEW)) is None
+
+    def testReviewsForMovieInInsertionOrder(self, store):
+        store["joker"] = [{**REVIEW, "reviewTitle": "a"}, {**REVIEW, "reviewTitle": "b"}]
+        assert [r.reviewTitle for r in store.reviewsForMovie("JOKER")] == ["a", "b"]
+
+
+class TestUserIndex:
+    """Tests for the per-user review index"""
+
+    def testAddReviewIsIndexed(self, store):
+        store.addReview("Joker", movieReviews(**REVIEW))
+        store.addReview("Batman", movieReviews(**REVIEW))
+        assert store.countByUser("KHUSHI") == 2
+        assert len(store["joker"]) == 1
+
+    def testSeededListIsIndexed(self, store):
+        store["joker"] = [REVIEW, {**REVIEW, "user": "Omkar"}]
+        assert store.countByUser("khushi") == 1
+        assert store.countByUser("omkar") == 1
+        assert isinstance(store["joker"][0], movieReviews)
+
+    def testReseedReplacesIndexEntries(self, store):
+        store["joker"] = [REVIEW]
+        store["joker"] = [{**REVIEW, "user": "Omkar"}]
+        assert store.countByUser("khushi") == 0
+        assert store.countByUser("omkar") == 1
+
+    def testReplaceReviewMovesIndexEntry(self, store):
+        store.addReview("Joker", movieReviews(**REVIEW))
+        store.replaceReview("Joker", 0, movieReviews(**{**REVIEW, "reviewTitle": "Changed"}))
+        assert store.countByUser("khushi") == 1
+        assert store.reviewsByUser("khushi")[0].reviewTitle == "Changed"
+
+    def testRemoveReviewDropsIndexEntry(self, store):
+        store.addReview("Joker", movieReviews(**REVIEW))
+        removed = store.removeReview("Joker", 0)
+        assert removed.user == "Khushi"
+        assert store["joker"] == {}
+        assert store.countByUser("khushi") == 0
+        assert "khushi" not in store.userIndex
+
+    def testReviewsByUserPaging(self, store):
+        for i in range(5):
+            store.addReview(f"Movie{i}", movieReviews(**{**REVIEW, "reviewTitle": str(i)}))
+        page = store.reviewsByUser("khushi", offset=3, limit=10)
+        assert [r.reviewTitle for r in page] == ["3", "4"]
+
+    def testClearAndDeleteResetIndex(self, store):
+        store["joker"] = [REVIEW]
+        store["batman"] = [REVIEW]
+        del store["joker"]
+        assert store.countByUser("khushi") == 1
+        store.clear()
+        assert store.userIndex == {}
+
+
+class TestDuplicateCheck:
+    """Tests for the per-movie reviewer set"""
+
+    def testHasReviewedIsCaseInsensitive(self, store):
+        store.addReview("Joker", movieReviews(**REVIEW))
+        assert store.hasReviewed("JOKER", "khushi")
+        assert not store.hasReviewed("Batman", "khushi")
+
+    def testAddUniqueReviewRejectsSecondReview(self, store):
+        assert store.addUniqueReview("Joker", movieReviews(**REVIEW), "Khushi") is not None
+        assert store.addUniqueReview("Joker", movieReviews(**REVIEW), "KHUSHI") is None
+        assert len(store["joker"]) == 1
+
+    def testDeleteAllowsReviewingAgain(self, store):
+        store.addReview("Joker", movieReviews(**REVIEW))
+        store.removeReview("Joker", 0)
+        assert not store.hasReviewed("Joker", "khushi")
+        assert store.reviewers == {}
+
+
+class TestReviewStats:
+    """Tests for the per-day review counters"""
+
+    def testReviewDayParsesDataSetAndIsoDates(self):
+        assert reviewDay("14 March 2021") == "2021-03-14"
+        assert reviewDay("3 Sep 2019") == "2019-09-03"
+        assert reviewDay("2024-05-01") == "2024-05-01"
+        assert reviewDay("2024-05-01T10:30:00") == "2024-05-01"
+        assert reviewDay("last Tuesday") == "unknown"
+
+    def testStatsSnapshotBucketsByDay(self, store):
+        store.addReview("Joker", movieReviews(**{**REVIEW, "dateOfReview": "14 March 2021"}))
+        store.addReview("Joker", movieReviews(**{**REVIEW, "dateOfReview": "2021-03-14"}))
+        newest = store.addReview("Heat", movieReviews(**{**REVIEW, "dateOfReview": "2 January 2022"}))
+        snapshot = store.statsSnapshot()
+        assert snapshot == {"total": 3, "byDay": {"2021-03-14": 2, "2022-01-02": 1}}
+        assert list(snapshot["byDay"]) == ["2021-03-14", "2022-01-02"]
+
+        store.removeReview("Heat", newest.reviewId)
+        assert store.statsSnapshot() == {"total": 2, "byDay": {"2021-03-14": 2}}
+        assert snapshot["byDay"] == {"2021-03-14": 2, "2022-01-02": 1}  # a copy, not the live counter
@@ -0,0 +1,270 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.users.sessionStore import (
+    SessionSweeper,
+    SessionTable,
+    SharedFileSessionBackend,
+    SqliteSessionBackend,
+    StripedSessionTable,
+)
+
+TIMEOUT = timedelta(hours=24)
+
+
+def testEvictExpiredRemovesOnlyDueSessions():
+    now = datetime.now()
+    table = SessionTable()
+    table["old"] = ("u1", now - timedelta(hours=25))
+    table["fresh"] = ("u2", now)
+    assert table.evictExpired(now, TIMEOUT) == 1
+    assert "old" not in table
+    assert "fresh" in table
+
+
+def testEvictExpiredStopsAtFirstLiveEntry():
+    now = datetime.now()
+    table = SessionTable()
+    for i in range(5):
+        table[f"t{i}"] = ("u", now - timedelta(minutes=i))
+    assert table.evictExpired(now, TIMEOUT) == 0
+    # nothing popped off the heap when nothing is due
+    assert len(table._heap) == 5
+
+
+def testReloginKeepsSessionAlive():
+    now = datetime.now()
+    table = SessionTable()
+    table["tok"] = ("u", now - timedelta(hours=25))
+    table["tok"] = ("u", now)  # stale heap entry must not evict the refreshed session
+    assert table.evictExpired(now, TIMEOUT) == 0
+    assert "tok" in table
+    assert not table._heap or table._heap[0][0] == now
+
+
+def testDeletedSessionIgnoredByHeap():
+    now = datetime.now()
+    table = SessionTable()
+    table["gone"] = ("u", now - timedelta(hours=25))
+    del table["gone"]
+    assert table.evictExpired(now, TIMEOUT) == 0
+    assert not table._heap
+
+
+def testClearEmptiesHeap():
+    table = SessionTable()
+    table["tok"] = ("u", datetime.now())
+    table.clear()
+    assert len(table) == 0
+    assert not table._heap
+
+
+def testCapEvictsLeastRecentlyUsed():
+    now = datetime.now()
+    table = SessionTable(maxSessions=2)
+    table["a"] = ("u", now)
+    table["b"] = ("u", now)
+    table.touch("a")
+    table["c"] = ("u", now)
+    assert "b" not in table
+    assert list(table) == ["a", "c"]
+
+
+def testHeapStaysBoundedUnderLruChurn():
+    now = datetime.now()
+    table = SessionTable(maxSessions=10)
+    for i in range(5000):
+        table[f"t{i}"] = ("u", now)
+    assert len(table) == 10
+    assert len(table._heap) <= 3 * len(table)
+    assert table.evictExpired(now + TIMEOUT + timedelta(seconds=1), TIMEOUT) == 10
+
+
+def testHeapRebuiltAfterLogouts():
+    now = datetime.now()
+    table = SessionTable()
+    for i in range(100):
+        table[f"t{i}"] = ("u", now)
+    for i in range(90):
+        del table[f"t{i}"]
+    assert sorted(token for _, token in table._heap) == sorted(table)
+
+
+def testSweeperRunsUntilStopped():
+    swept = threading.Event()
+    sweeper = SessionSweeper(swept.set, interval=0.01)
+    sweeper.start()
+    assert swept.wait(1)
+    sweeper.stop()
+    sweeper.join(1)
+    assert not sweeper.is_alive()
+
+
+class FakeUser:
+    def __init__(self, username):
+        self.username = username
+
+
+@pytest.fixture(params=["sqlite", "shm"])
+def openBackend(request, tmp_path):
+    opened = []
+
+    def _open():
+        if request.param == "sqlite":
+            backend = SqliteSessionBackend(tmp_path / "sessions.db")
+        else:
+            backend = SharedFileSessionBackend(tmp_path / "sessions.shm", capacity=64)
+        opened.append(backend)
+        return backend
+
+    yield _open
+    for backend in opened:
+        backend.close()
+
+
+class TestSharedBackends:
+    def testPutGetDelete(self, openBackend):
+        backend = openBackend()
+        loginTime = datetime.now()
+        backend.put("tok", "alice", loginTime)
+        username, storedTime = backend.get("tok")
+        assert username == "alice"
+        assert abs((storedTime - loginTime).total_seconds()) < 0.001
+        backend.delete("tok")
+        assert backend.get("tok") is None
+
+    def testVisibleToSecondHandleOnSameFile(self, openBackend):
+        # two handles on one file stand in for two uvicorn workers
+        first, second = openBackend(), openBackend()
+        first.put("tok", "alice", datetime.now())
+        assert second.get("tok")[0] == "alice"
+        second.delete("tok")
+        assert first.get("tok") is None
+
+    def testEvictExpired(self, openBackend):
+        backend = openBackend()
+        now = datetime.now()
+        backend.put("old", "alice", now - timedelta(hours=25))
+        backend.put("new", "bob", now)
+        assert backend.evictExpired(now - TIMEOUT) == 1
+        assert backend.get("old") is None
+        assert backend.get("new") is not None
+
+    def testCountSeesEveryWorkersSessions(self, openBackend):
+        first, second = openBackend(), openBackend()
+        now = datetime.now()
+        first.put("a", "alice", now)
+        second.put("b", "bob", now)
+        second.put("old", "carol", now - timedelta(hours=25))
+        assert first.count() == 3
+        # the table reports the shared count, not just what this worker has cached
+        assert StripedSessionTable(stripes=2, backend=second).countActive() == 3
+
+    def testCountFollowsEveryChange(self, openBackend):
+        backend = openBackend()
+        now = datetime.now()
+        backend.put("a", "alice", now)
+        backend.put("a", "alice", now + timedelta(minutes=1))
+        backend.put("old", "bob", now - timedelta(hours=25))
+        assert backend.count() == 2
+        backend.delete("a")
+        backend.delete("a")
+        assert backend.count() == 1
+        backend.evictExpired(now - TIMEOUT)
+        assert backend.count() == 0
+        backend.put("b", "carol", now)
+        backend.clear()
+        assert backend.count() == 0
+
+    def testTombstonesDoNotHideLaterKeys(self, openBackend):
+        backend = openBackend()
+        now = datetime.now()
+        for i in range(40):
+            backend.put(f"t{i}", f"user{i}", now)
+        for i in range(0, 40, 2):
+            backend.delete(f"t{i}")
+        for i in range(1, 40, 2):
+            assert backend.get(f"t{i}")[0] == f"user{i}"
+
+
+def testSharedFileChurnLeavesNoTombstones(tmp_path):
+    import random
+    backend = SharedFileSessionBackend(tmp_path / "sessions.shm", capacity=64)
+    rng = random.Random(7)
+    now = datetime.now()
+    live = {}
+    try:
+        for i in range(5000):
+            if live and (len(live) >= 48 or rng.random() < 0.5):
+                token = rng.choice(sorted(live))
+                backend.delete(token)
+                del live[token]
+            else:
+                token = f"t{i}"
+                live[token] = now - timedelta(hours=rng.choice([1, 30]))
+                backend.put(token, "u", live[token])
+        states = [backend._slot(index)[0] for index in range(backend.capacity)]
+        assert states.count(backend.DELETED) == 0
+        assert states.count(backend.EMPTY) == backend.capacity - len(live)
+        for token in live:
+            assert backend.get(token) is not None
+
+        expired = {token for token, loginTime in live.items() if now - loginTime > TIMEOUT}
+        assert backend.evictExpired(now - TIMEOUT) == len(expired)
+        for token in live:
+            assert (backend.get(token) is None) == (token in expired)
+        assert [backend._slot(index)[0] for index in range(backend.capacity)].count(backend.EMPTY) == \
+            backend.capacity - len(live) + len(expired)
+        assert backend.count() == len(live) - len(expired)
+    finally:
+        backend.close()
+
+
+def testSharedFileWithOldLayoutStartsEmpty(tmp_path):
+    path = tmp_path / "sessions.shm"
+    path.write_bytes(b"\x01" * 1024)
+    backend = SharedFileSessionBackend(path, capacity=64)
+    try:
+        assert backend.count() == 0
+        assert backend.get("anything") is None
+    finally:
+        backend.close()
+
+
+class TestReadThroughCache:
+    def testLoginOnOneWorkerSeenByAnother(self, openBackend):
+        users = {"alice": FakeUser("alice")}
+        workerA = SessionTable(backend=openBackend())
+        workerB = SessionTable(backend=openBackend())
+        workerA["tok"] = (users["alice"], datetime.now())
+        assert workerB.lookup("tok", users.get)[0] is users["alice"]
+        assert "tok" in workerB
+
+    def testLogoutElsewhereSeenAfterCacheExpires(self, openBackend):
+        users = {"alice": FakeUser("alice")}
+        workerA = SessionTable(backend=openBackend(), cacheSeconds=0)
+        workerB = SessionTable(backend=openBackend(), cacheSeconds=0)
+        workerA["tok"] = (users["alice"], datetime.now())
+        assert workerB.lookup("tok", users.get) is not None
+        del workerA["tok"]
+        assert workerB.lookup("tok", users.get) is None
+        assert "tok" not in workerB
+
+    def testLruEvictionKeepsStoredSession(self, openBackend):
+        users = {"alice": FakeUser("alice"), "bob": FakeUser("bob")}
+        table = SessionTable(maxSessions=1, backend=openBackend())
+        table["a"] = (users["alice"], datetime.now())
+        table["b"] = (users["bob"], datetime.now())
+        assert "a" not in table
+        assert table.lookup("a", users.get)[0] is users["alice"]
+
+    def testRepeatedLookupsDoNotGrowHeap(self, openBackend):
+        users = {"alice": FakeUser("alice")}
+        workerA = SessionTable(backend=openBackend())
+        workerB = SessionTable(backend=openBackend(), cacheSeconds=0)
+        workerA["tok"] = (users["alice"], datetime.now())
+        for _ in range(1000):
+            assert workerB.lookup("tok", users.get) is not None
+        assert len(workerB._heap) == 1
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from backend.users.sessionTokens import TokenSigner
+from backend.users.user import User
+
+
+@pytest.fixture
+def signer():
+    return TokenSigner({"k1": b"first-secret"}, "k1")
+
+
+class TestTokenSigner:
+    def testIssueAndVerify(self, signer):
+        token = signer.issue("alice", 1000, 2000)
+        assert signer.looksSigned(token)
+        assert signer.verify(token, now=1500) == ("alice", 1000.0)
+
+    def testExpired(self, signer):
+        token = signer.issue("alice", 1000, 2000)
+        assert signer.verify(token, now=2000) is None
+
+    def testTamperedPayloadRejected(self, signer):
+        token = signer.issue("alice", 1000, 2000)
+        forged = token.replace(".alice.", ".mallory.")
+        assert signer.verify(forged, now=1500) is None
+
+    def testMalformedRejected(self, signer):
+        assert signer.verify("not-a-token") is None
+        assert signer.verify("a.b.c.d.e") is None
+
+    def testNonAsciiSignatureRejected(self, signer):
+        assert signer.verify("k1.bob.0.9000000000.é") is None
+        assert signer.revoke("k1.bob.0.9000000000.é") is False
+
+    def testRotationKeepsOldTokensUntilRetired(self, signer):
+        old = signer.issue("alice", 1000, 2000)
+        signer.rotate("k2", b"second-secret")
+        new = signer.issue("bob", 1000, 2000)
+        assert new.startswith("k2.")
+        assert signer.verify(old, now=1500) is not None
+        signer.retire("k1")
+        assert signer.verify(old, now=1500) is None
+        assert signer.verify(new, now=1500) is not None
+
+    def testCannotRetireActiveKey(self, signer):
+        with pytest.raises(ValueError):
+            signer.retire("k1")
+
+    def testRevokeAndPrune(self, signer):
+        now = time.time()
+        token = signer.issue("alice", now, now + 60)
+        assert signer.revoke(token) is True
+        assert signer.verify(token) is None
+        assert signer.revoke(token) is False
+        assert signer.pruneRevocations(now=now + 30) == 0
+        assert signer.pruneRevocations(now=now + 61) == 1
+        assert not signer.revoked
+
+
+def testSignedLoginRoundTrip(monkeypatch, signer):
+    monkeypatch.setattr(User, "tokenSigner", signer)
+    user = User("signeduser", "signed@test.com", "password123", save=False)
+    user.isVerified = True
+    monkeypatch.setitem(User.usersDb, user.username, user)
+
+    token = User.login(user.username, "password123")
+    assert token not in User.activeSessions
+    assert User.getCurrentUser(User, token) is user
+    assert User.logout(User, token) is True
+    assert User.getCurrentUser(User, token) is None
+
+
+def testNonAsciiTokenIsNotLoggedIn(monkeypatch, signer):
+    monkeypatch.setattr(User, "tokenSigner", signer)
+    assert User.getCurrentUser(User, "k1.bob.0.9000000000.é") is None
+    assert User.logout(User, "k1.bob.0.9000000000.é") is False
@@ -0,0 +1,58 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from backend.users.sessionStore import StripedSessionTable
+from backend.users.stripedLock import StripedLock
+
+
+def testSameKeySameStripe():
+    locks = StripedLock(8)
+    assert locks.stripeOf("alice") == locks.stripeOf("alice")
+    assert 0 <= locks.stripeOf("bob") < 8
+
+
+def testHoldReleasesEveryStripe():
+    locks = StripedLock(4)
+    with locks.hold("a", "b", "c", "a"):
+        held = [lock.locked() for lock in locks.locks]
+    assert any(held)
+    assert not any(lock.locked() for lock in locks.locks)
+
+
+def testContentionIsRecorded():
+    locks = StripedLock(1)
+    entered = threading.Event()
+
+    def holder():
+        with locks.hold("key"):
+            entered.set()
+            time.sleep(0.05)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    entered.wait()
+    with locks.hold("other"):
+        pass
+    thread.join()
+
+    stats = locks.stats()[0]
+    assert stats["acquisitions"] == 2
+    assert stats["contended"] == 1
+    assert stats["maxWaitMs"] > 0
+
+
+def testStripedSessionTableActsAsOneMapping():
+    table = StripedSessionTable(stripes=4)
+    now = datetime.now()
+    for i in range(20):
+        table[f"tok{i}"] = ("user", now)
+    table["old"] = ("user", now - timedelta(hours=25))
+    assert len(table) == 21
+    assert "tok3" in table
+    assert table.evictExpired(now, timedelta(hours=24)) == 1
+    del table["tok3"]
+    assert "tok3" not in table
+    assert len(list(table)) == 19
+    table.clear()
+    assert len(table) == 0
@@ -0,0 +1,102 @@
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.repositories.usersRepo import UserRepository
+from backend.routers.adminRouter import router
+from backend.services.userImport import importUsers, main
+from backend.users.passwordHasher import PasswordHasher
+from backend.users.user import User
+
+app = FastAPI()
+app.include_router(router, prefix="/admin")
+client = TestClient(app)
+
+CSV = (
+    "username,email,password\n"
+    "alice,alice@test.com,password123\n"
+    "bob,not-an-email,password123\n"
+    "carol,carol@test.com,short\n"
+    "alice,alice2@test.com,password123\n"
+    "dave,ALICE@test.com,password123\n"
+    "erin,erin@test.com,password123\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    repo = UserRepository(tmp_path / "userList.json")
+    hasher = PasswordHasher(workers=2, useProcesses=False)
+    hasher.rounds = 4
+    monkeypatch.setattr("backend.services.userImport.userRepo", repo)
+    monkeypatch.setattr("backend.users.user.userRepo", repo)
+    monkeypatch.setattr("backend.services.userImport.passwordHasher", hasher)
+    User.usersDb.clear()
+    yield repo
+    User.usersDb.clear()
+    hasher.shutdown()
+
+
+def testCsvImportReportsEachBadRow(isolated):
+    report = importUsers(io.StringIO(CSV), "csv", batchSize=2)
+
+    assert report["total"] == 6
+    assert report["created"] == 2
+    assert [u["username"] for u in report["users"]] == ["alice", "erin"]
+    assert [(e["row"], e["error"]) for e in report["errors"]] == [
+        (2, "Invalid email address"),
+        (3, "Password must be at least 8 characters long"),
+        (4, "Duplicate username in import"),
+        (5, "Duplicate email in import"),
+    ]
+    assert User.usersDb["alice"].verifyPassword("password123") is True
+    # one journal append for the whole import
+    assert len(isolated.journalPath.read_text().splitlines()) == 2
+
+
+def testNdjsonImportAndExistingUsers(isolated):
+    existing = User("taken", "taken@test.com", "", save=False, passwordHash=b"x")
+    User.usersDb[existing.username] = existing
+    body = "\n".join([
+        json.dumps({"username": "taken", "email": "new@test.com", "password": "password123"}),
+        "{not json",
+        "",
+        json.dumps({"username": "fresh", "email": "TAKEN@test.com", "password": "password123"}),
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"username": "newbie", "email": "newbie@test.com", "password": "password123"}),
+    ])
+    report = importUsers(io.StringIO(body), "ndjson")
+
+    assert report["created"] == 1
+    assert isolated.get("newbie")["email"] == "newbie@test.com"
+    assert [(e["row"], e["error"].split(":")[0]) for e in report["errors"]] == [
+        (1, "Username already exists"),
+        (2, "Invalid JSON"),
+        (4, "Email already registered"),
+        (5, "Row must be a JSON object"),
+    ]
+
+
+def testImportEndpoint():
+    response = client.post("/admin/users/import", params={"format": "csv"}, content=CSV)
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+
+
+def testImportEndpointRejectsUnknownFormat():
+    response = client.post("/admin/users/import", params={"format": "xml"}, content="<users/>")
+    assert response.status_code == 400
+
+
+def testCli(isolated, tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr("backend.services.userImport.passwordHasher.shutdown", lambda: None)
+    path = tmp_path / "users.ndjson"
+    path.write_text(json.dumps({"username": "cliuser", "email": "cli@test.com", "password": "password123"}) + "\n")
+
+    assert main([str(path)]) == 0
+    assert json.loads(capsys.readouterr().out)["created"] == 1
+    # closing the repository compacts the import into userList.json
+    assert "cliuser" in json.loads(isolated.path.read_text())
@@ -31,9 +31,12 @@ class TestRegisterUser:
                 self.email = "k@gmail.com"
                 self.verificationToken = "abc123"
 
+        async def fake_create(*args, **kwargs):
+            return FakeUser()
+
         monkeypatch.setattr(
-            "backend.routers.userRouter.User.createAccount",
-            lambda *args, **kwargs: FakeUser()
+            "backend.routers.userRouter.User.createAccountAsync",
+            fake_create
         )
 
         response = client.post("/register", params={
@@ -53,11 +56,11 @@ class TestRegisterUser:
     def test_register_user_already_exists(self, monkeypatch):
         """If createAccount raises ValueError -> 400"""
 
-        def fail(*a, **k):
+        async def fail(*a, **k):
             raise ValueError("User already exists")
 
         monkeypatch.setattr(
-            "backend.routers.userRouter.User.createAccount",
+            "backend.routers.userRouter.User.createAccountAsync",
             fail
         )
 
@@ -73,11 +76,11 @@ class TestRegisterUser:
     def test_register_invalid_email(self, monkeypatch):
         """If createAccount raises invalid email error -> 400"""
 
-        def fail(*a, **k):
+        async def fail(*a, **k):
             raise ValueError("Invalid email format")
 
         monkeypatch.setattr(
-            "backend.routers.userRouter.User.createAccount",
+            "backend.routers.userRouter.User.createAccountAsync",
             fail
         )
 
@@ -90,6 +93,57 @@ class TestRegisterUser:
         assert response.status_code == 400
         assert response.json()["detail"] == "Invalid email format"
 
+class TestRegisterAndLoginEndToEnd:
+    """Register + verify + login through the real hashing service"""
+
+    def test_register_verify_login(self, monkeypatch, tmp_path):
+        from backend.repositories.usersRepo import UserRepository
+        repo = UserRepository(tmp_path / "userList.json")
+        monkeypatch.setattr("backend.users.user.userRepo", repo)
+
+        response = client.post("/register", params={
+            "username": "endtoend",
+            "email": "endtoend@test.com",
+            "password": "password123",
+        })
+        assert response.status_code == 200
+        token = response.json()["verificationToken"]
+
+        assert client.post("/verify", params={"username": "endtoend", "token": token}).status_code == 200
+
+        response = client.post("/login", params={"username": "endtoend", "password": "password123"})
+        assert response.status_code == 200
+        assert response.json()["sessionToken"] in User.activeSessions
+
+        response = client.post("/login", params={"username": "endtoend", "password": "wrongpass1"})
+        assert response.status_code == 400
+        assert repo.get("endtoend")["isVerified"] is True
+
+    def test_register_short_password_rejected_before_hashing(self, monkeypatch):
+        from backend.users.passwordHasher import passwordHasher
+        before = passwordHasher.stats()["operations"]["hash"]["count"]
+
+        response = client.post("/register", params={
+            "username": "shortpw",
+            "email": "shortpw@test.com",
+            "password": "short",
+        })
+
+        assert response.status_code == 400
+        assert passwordHasher.stats()["operations"]["hash"]["count"] == before
+
+    def test_hashing_busy_returns_503(self, monkeypatch):
+        from backend.users.passwordHasher import HasherBusyError
+
+        async def busy(*a, **k):
+            raise HasherBusyError("Password hashing is busy, try again shortly")
+
+        monkeypatch.setattr("backend.routers.userRouter.User.loginAsync", busy)
+        response = client.post("/login", params={"username": "x", "password": "y"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+
 class TestVerifyEmail:
     """Tests for POST /verify"""
 
@@ -162,12 +216,12 @@ class TestLoginUser:
         dummy = DummyUser()
         User.usersDb["khushi"] = dummy
 
-        def fake_login(username, password):
+        async def fake_login(username, password):
             if username != "khushi" or password != "pass123":
                 raise ValueError("Invalid credentials")
             return "session-123"
 
-        self.login_patch = patch("backend.users.user.User.login", fake_login)
+        self.login_patch = patch("backend.users.user.User.loginAsync", fake_login)
         self.login_patch.start()
 
         yield
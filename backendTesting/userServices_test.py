@@ -2,7 +2,8 @@ import pytest
 import sys
 from pathlib import Path
 import json
-from backend.services.userServices import saveUserToDB,findUserInDB,changeUserStatus
+from backend.services.userServices import findUserInDB, readAllUsers
+from backend.repositories.usersRepo import UserRepository
 from backend.users import user
 from unittest import TestCase
 from unittest.mock import Mock, patch, MagicMock, mock_open
@@ -21,53 +22,22 @@ email = "email@email.com"
 pswd = "password"
 testUser = user.User(name, email, pswd, save = False)
 
-def test_saveUserToDB(mockBaseDir):
-    #If we call this function, we should be able to find the specific user created
-    mockBaseDir.mkdir(parents=True, exist_ok=True)
-    path = mockBaseDir/"userList.json"
-    saveUserToDB(testUser.username,testUser.email,testUser.passwordHash,path)
-    with open(path,'r') as jsonFile:
-        try:
-            data = json.load(jsonFile) 
-        except json.JSONDecodeError:
-            data = {}
-        
-    assert name in data
-    assert email == data[name]["email"]
-    assert testUser.passwordHash.decode('utf-8') == data[name]["password"]
-
-    #clean up
-    with open(path,'w') as jsonFile:
-        jsonFile.truncate(0)
-
-def test_ChangeUser(mockBaseDir):
-    #If we call this function, we should be able to find the specific user created
-    mockBaseDir.mkdir(parents=True, exist_ok=True)
-    path = mockBaseDir/"userList.json"
-    saveUserToDB(testUser.username,testUser.email,testUser.passwordHash,path)
-    changeUserStatus(testUser.username,True, path)
-    with open(path,'r') as jsonFile:
-        try:
-            data = json.load(jsonFile) 
-        except json.JSONDecodeError:
-            data = {}
-        
-    assert data[testUser.username]["isVerified"] 
-
-    #clean up
-    with open(path,'w') as jsonFile:
-        jsonFile.truncate(0)
-
-        
-
-
 def testFindUserInDB(mockBaseDir):
     mockBaseDir.mkdir(parents=True, exist_ok=True)
     path = mockBaseDir/"userList.json"
-    saveUserToDB(testUser.username,testUser.email,testUser.passwordHash,path)
-    saveUserToDB("testUser.username",testUser.email,testUser.passwordHash,path)
-    saveUserToDB("tester",testUser.email,testUser.passwordHash,path)
+    record = {"email":testUser.email,"password":testUser.passwordHash.decode('utf-8'),"isVerified": False}
+    path.write_text(json.dumps({testUser.username: record, "testUser.username": record, "tester": record}))
 
     assert findUserInDB(testUser.username,path) == {"email":testUser.email,"password":testUser.passwordHash.decode('utf-8'),"isVerified": False}
     with pytest.raises(ValueError):
         findUserInDB("notTester",path)
+
+def testJournalOnlyUsersAreFound(mockBaseDir):
+    path = mockBaseDir/"userList.json"
+    repo = UserRepository(path)
+    repo.add("journalled", "journalled@test.com", testUser.passwordHash)
+    repo.flush()  # appended to the journal, not yet compacted into userList.json
+    assert not path.exists()
+
+    assert findUserInDB("journalled", path)["email"] == "journalled@test.com"
+    assert list(readAllUsers(path)) == ["journalled"]
@@ -285,6 +285,91 @@ def testLoginSuccess():
     assert user.lastLogin is not None
 
 
+def testLoginHashesOutsideLock(monkeypatch):
+    user = User("locktest", "lock@test.com", "password123", save=False)
+    user.isVerified = True
+    User.usersDb[user.username] = user
+    lockHeld = []
+
+    def fakeVerify(password):
+        # neither a session stripe (which the new session is stored under) nor a username/email stripe
+        lockHeld.append([lock.locked() for lock in User.activeSessions.locks.locks + User._userLocks.locks])
+        return True
+
+    monkeypatch.setattr(user, "verifyPassword", fakeVerify)
+    assert User.login(user.username, "password123") is not None
+    assert len(lockHeld) == 1 and not any(lockHeld[0])
+
+
+def testLoginAsyncFinishesOffEventLoop(monkeypatch):
+    import asyncio
+    user = User("asynctest", "async@test.com", "password123", save=False)
+    user.isVerified = True
+    User.usersDb[user.username] = user
+    threads = []
+    beginLogin, finishLogin = User._beginLogin, User._finishLogin
+
+    def recordBegin(username):
+        threads.append(threading.current_thread())
+        return beginLogin(username)
+
+    def recordFinish(user, passwordOk):
+        threads.append(threading.current_thread())
+        return finishLogin(user, passwordOk)
+
+    monkeypatch.setattr(User, "_beginLogin", recordBegin)
+    monkeypatch.setattr(User, "_finishLogin", recordFinish)
+
+    async def run():
+        return threading.current_thread(), await User.loginAsync(user.username, "password123")
+
+    loopThread, token = asyncio.run(run())
+    assert token in User.activeSessions
+    assert len(threads) == 2 and loopThread not in threads
+
+
+def testCreateAccountAsyncPrechecksOffEventLoop(monkeypatch, tmp_path):
+    import asyncio
+    from backend.repositories.usersRepo import UserRepository
+    monkeypatch.setattr("backend.users.user.userRepo", UserRepository(tmp_path / "userList.json"))
+    threads = []
+    precheck = User._precheckAccount
+
+    def recordPrecheck(username, email, password):
+        threads.append(threading.current_thread())
+        return precheck(username, email, password)
+
+    monkeypatch.setattr(User, "_precheckAccount", recordPrecheck)
+
+    async def run():
+        return threading.current_thread(), await User.createAccountAsync("asyncnew", "asyncnew@test.com", "password123")
+
+    loopThread, user = asyncio.run(run())
+    assert User.usersDb["asyncnew"] is user
+    assert threads and loopThread not in threads
+
+
+def testLoginRehashesAtNewCost(monkeypatch):
+    from backend.users.passwordHasher import passwordHasher, hashRounds
+    monkeypatch.setattr(passwordHasher, "rounds", 4)
+    user = User("rehashtest", "rehash@test.com", "password123", save=False)
+    user.isVerified = True
+    User.usersDb[user.username] = user
+    saved = []
+    monkeypatch.setattr("backend.users.user.userRepo.setPasswordHash", lambda *args: saved.append(args))
+    passwordHasher.rounds = 5
+
+    User.login(user.username, "password123")
+
+    assert hashRounds(user.passwordHash) == 5
+    assert user.verifyPassword("password123") is True
+    assert saved == [(user.username, user.passwordHash)]
+
+    # already at the target cost: nothing more to write
+    User.login(user.username, "password123")
+    assert len(saved) == 1
+
+
 def testLogoutSuccess():
     user = User("logouttest", "logout@test.com", "password123", save=False)
     user.isVerified = True
@@ -398,3 +483,89 @@ def testVerificationTokenIsUnique():
     user2 = User("unique2", "unique2@test.com", "password123", save=False)
     assert user1.verificationToken != user2.verificationToken
     assert user1.id != user2.id
+
+
+def testLoadStoredUsers(monkeypatch, tmp_path):
+    from backend.repositories.usersRepo import UserRepository
+    repo = UserRepository(tmp_path / "userList.json")
+    repo.add("storeduser", "stored@test.com", testUser.passwordHash)
+    repo.setVerified("storeduser", True)
+    monkeypatch.setattr("backend.users.user.userRepo", repo)
+
+    assert User.loadStoredUsers() == 1
+    stored = User.usersDb["storeduser"]
+    assert stored.isVerified is True
+    assert stored.verifyPassword(pswd) is True
+
+
+def testCreateAccountDuplicateEmailIgnoresCase():
+    user1 = User("caseuser1", "Case@Example.com", "password1234", save=False)
+    User.usersDb[user1.username] = user1
+    with pytest.raises(ValueError, match="(?i)email already registered"):
+        User.createAccount("caseuser2", "case@example.COM", "password1234")
+
+
+def testEmailIndexFollowsUsersDb():
+    user1 = User("indexuser", "index@test.com", "password1234", save=False)
+    User.usersDb[user1.username] = user1
+    assert User._emailOwner("INDEX@test.com") == "indexuser"
+    del User.usersDb[user1.username]
+    assert User._emailOwner("index@test.com") is None
+
+
+def testDeleteAccountFreesEmail(monkeypatch, tmp_path):
+    from backend.repositories.usersRepo import UserRepository
+    monkeypatch.setattr("backend.users.user.userRepo", UserRepository(tmp_path / "userList.json"))
+    user = User.createAccount("deleteme", "deleteme@test.com", "password1234")
+    user.isVerified = True
+    token = User.login("deleteme", "password1234")
+
+    assert User.deleteAccount("deleteme") is True
+    assert token not in User.activeSessions
+    assert User.deleteAccount("deleteme") is False
+    assert User.createAccount("deleteme2", "deleteme@test.com", "password1234").username == "deleteme2"
+
+
+@pytest.fixture
+def sharedRepos(monkeypatch, tmp_path):
+    """This worker's repository, wired to usersDb, and a second one on the same files standing in for another worker"""
+    from backend.repositories.usersRepo import UserRepository
+    repo = UserRepository(tmp_path / "userList.json")
+    repo.listeners.append(User._storedUserChanged)
+    monkeypatch.setattr("backend.users.user.userRepo", repo)
+    repo.load()
+    return repo, UserRepository(tmp_path / "userList.json")
+
+
+def testLoginSeesUserRegisteredOnAnotherWorker(sharedRepos):
+    _, otherWorker = sharedRepos
+    otherWorker.add("elsewhere", "elsewhere@test.com", testUser.passwordHash, "token123")
+    otherWorker.setVerified("elsewhere", True)
+    otherWorker.flush()
+
+    assert User.login("elsewhere", pswd) is not None
+    assert User.usersDb["elsewhere"].isVerified is True
+
+
+def testVerificationOnAnotherWorkerPropagates(sharedRepos):
+    repo, otherWorker = sharedRepos
+    user = User.createAccount("verifyelse", "verifyelse@test.com", "password1234")
+    repo.flush()
+
+    # the other worker learns the account from the journal and checks the stored token
+    otherWorker.refresh()
+    assert otherWorker.get("verifyelse")["verificationToken"] == user.verificationToken
+    otherWorker.setVerified("verifyelse", True)
+    otherWorker.flush()
+
+    assert User.login("verifyelse", "password1234") is not None
+
+
+def testResolveUserReadsThroughToRepository(sharedRepos):
+    repo, _ = sharedRepos
+    repo.add("stored", "stored2@test.com", testUser.passwordHash, "token456")
+    assert "stored" not in User.usersDb
+    user = User.resolveUser("stored")
+    assert user is User.usersDb["stored"]
+    assert user.verifyEmail("token456") is True
+    assert User.resolveUser("nobody") is None
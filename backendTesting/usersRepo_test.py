@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from backend.repositories.usersRepo import UserRepository
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "userList.json"
+
+
+@pytest.fixture
+def repo(path):
+    return UserRepository(path, compactEvery=100)
+
+
+def testLoadsExistingSnapshot(path):
+    path.write_text(json.dumps({"alice": {"email": "Alice@Test.com", "password": "h", "isVerified": True}}))
+    repo = UserRepository(path)
+    assert repo.exists("alice")
+    assert repo.usernameForEmail("alice@test.com") == "alice"
+
+
+def testChangesStayInMemoryUntilFlushed(repo, path):
+    repo.add("bob", "bob@test.com", b"hash")
+    assert repo.get("bob") == {"email": "bob@test.com", "password": "hash", "isVerified": False}
+    assert not repo.journalPath.exists()
+    repo.flush()
+    assert len(repo.journalPath.read_text().splitlines()) == 1
+    assert not path.exists()
+
+
+def testReloadReplaysJournal(repo, path):
+    repo.add("bob", "bob@test.com", b"hash")
+    repo.setVerified("bob", True)
+    repo.setPasswordHash("bob", b"newhash")
+    repo.add("carol", "carol@test.com", b"hash")
+    repo.remove("carol")
+    repo.flush()
+
+    reloaded = UserRepository(path)
+    assert reloaded.get("bob") == {"email": "bob@test.com", "password": "newhash", "isVerified": True}
+    assert not reloaded.exists("carol")
+    assert reloaded.usernameForEmail("carol@test.com") is None
+
+
+def testCompactionRewritesSnapshot(path):
+    repo = UserRepository(path, compactEvery=3)
+    for name in ("user1", "user2", "user3"):
+        repo.add(name, f"{name}@test.com", b"hash")
+    repo.flush()
+    assert not repo.journalPath.exists()
+    assert set(json.loads(path.read_text())) == {"user1", "user2", "user3"}
+
+
+def testCloseLeavesCompactedSnapshot(repo, path):
+    repo.startWriter(interval=60)
+    repo.add("bob", "bob@test.com", b"hash")
+    repo.close()
+    assert json.loads(path.read_text())["bob"]["email"] == "bob@test.com"
+    assert not repo.journalPath.exists()
+
+
+def testUnknownUserUpdatesIgnored(repo):
+    repo.setVerified("ghost", True)
+    repo.setPasswordHash("ghost", b"hash")
+    repo.remove("ghost")
+    assert repo.pending == []
+
+
+def testWorkersSharingFilesDoNotLoseUsers(path):
+    # two repositories on one path stand in for two uvicorn workers
+    workerA, workerB = UserRepository(path, compactEvery=2), UserRepository(path, compactEvery=2)
+    workerA.add("alice", "alice@test.com", b"hash")
+    workerB.add("bob", "bob@test.com", b"hash")
+    workerA.flush()
+    workerB.flush()  # reaches compactEvery: the snapshot must include alice's line
+    workerA.add("carol", "carol@test.com", b"hash")
+    workerA.close()
+    workerB.close()
+    assert set(json.loads(path.read_text())) == {"alice", "bob", "carol"}
+    assert not UserRepository(path).journalPath.exists()
+
+
+def testRefreshReplaysOtherWorkersChanges(path):
+    workerA, workerB = UserRepository(path), UserRepository(path)
+    workerB.load()
+    seen = []
+    workerB.listeners.append(lambda username, record: seen.append((username, record and record["isVerified"])))
+    workerA.add("alice", "alice@test.com", b"hash")
+    workerA.setVerified("alice", True)
+    workerA.flush()
+    workerB.refresh()
+    assert workerB.get("alice")["isVerified"] is True
+    assert workerB.usernameForEmail("ALICE@test.com") == "alice"
+    assert seen == [("alice", True)]
+
+    workerA.remove("alice")
+    workerA.compact()
+    workerB.refresh()
+    assert not workerB.exists("alice")
+    assert workerB.usernameForEmail("alice@test.com") is None
+    assert seen[-1] == ("alice", None)
+
+
+def testRefreshKeepsQueuedChanges(path):
+    workerA, workerB = UserRepository(path), UserRepository(path)
+    workerB.add("bob", "bob@test.com", b"hash")
+    workerA.add("alice", "alice@test.com", b"hash")
+    workerA.compact()
+    workerB.refresh()
+    assert workerB.exists("alice") and workerB.exists("bob")
+    workerB.flush()
+    assert UserRepository(path).exists("alice") and UserRepository(path).exists("bob")
+
+
+def testTornJournalLineLeftForLater(repo):
+    repo.add("bob", "bob@test.com", b"hash")
+    repo.flush()
+    with open(repo.journalPath, "a") as journal:
+        journal.write('{"op": "delete", "userna')
+    reader = UserRepository(repo.path)
+    assert reader.exists("bob")
+    with open(repo.journalPath, "a") as journal:
+        journal.write('me": "bob"}\n')
+    reader.refresh()
+    assert not reader.exists("bob")